@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# bench_batch.py
+#
+# Benchmark of pptx.batch.render() throughput. Renders the same records
+# with an increasing number of worker processes, up to one per CPU, and
+# reports decks per second and speedup over one worker. Run from the
+# repository root, e.g.:
+#
+#     python benchmarks/bench_batch.py --records 200
+#     python benchmarks/bench_batch.py --records 200 --workers 1 2 4
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+
+from timeit import default_timer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pptx.batch import render
+from pptx.constants import XL_CHART_TYPE as XL
+from pptx.util import Inches
+
+
+BLANK_LAYOUT_IDX = 6
+
+
+def build(prs, record):
+    """Add a slide with a text box, a table and a chart for *record*."""
+    slide = prs.slides.add_slide(prs.slidelayouts[BLANK_LAYOUT_IDX])
+    shapes = slide.shapes
+    textbox = shapes.add_textbox(Inches(0.5), Inches(0.5), Inches(4),
+                                 Inches(0.5))
+    textbox.textframe.text = 'Record %d' % record
+    table = shapes.add_table(5, 4, Inches(0.5), Inches(1.5), Inches(4),
+                             Inches(2))
+    table.cell(0, 0).text = 'Record %d' % record
+    categories = ['Item %d' % (idx+1) for idx in range(12)]
+    values = [float(record + idx) for idx in range(12)]
+    shapes.add_chart(Inches(5), Inches(1.5), Inches(4), Inches(3),
+                     [categories, values], ['Category', 'Series 1'],
+                     XL.LINE)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description='Time pptx.batch.render() by worker count.')
+    arg = parser.add_argument
+    arg('--records', type=int, default=100, help='decks to render')
+    arg('--workers', type=int, nargs='+',
+        help='worker counts to time, by default powers of 2 up to CPUs')
+    arg('--template', help='template .pptx, by default the built-in one')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    worker_counts = options.workers
+    if not worker_counts:
+        cpus = multiprocessing.cpu_count()
+        worker_counts = [1]
+        while worker_counts[-1] * 2 < cpus:
+            worker_counts.append(worker_counts[-1] * 2)
+        if worker_counts[-1] != cpus:
+            worker_counts.append(cpus)
+
+    records = range(options.records)
+    base_rate = None
+    print 'workers | decks/sec | speedup | failed'
+    for workers in worker_counts:
+        out_dir = tempfile.mkdtemp()
+        try:
+            start = default_timer()
+            results = render(options.template, records, build, out_dir,
+                             workers=workers, compact=True)
+            elapsed = default_timer() - start
+        finally:
+            shutil.rmtree(out_dir)
+        rate = len(records) / elapsed
+        if base_rate is None:
+            base_rate = rate
+        failed = len([result for result in results if not result.ok])
+        print '%7d | %9.1f | %6.2fx | %d' % (
+            workers, rate, rate / base_rate, failed)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
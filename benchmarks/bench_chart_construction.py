@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# bench_chart_construction.py
+#
+# Microbenchmark of chart construction for decks holding many small charts:
+# building the <c:chartSpace> skeleton of a chart by parsing its template
+# versus cloning the cached parsed skeleton, and building complete line and
+# clustered bar charts of 3 series of 12 points each. Run from the
+# repository root, e.g.:
+#
+#     python benchmarks/bench_chart_construction.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pptx.constants import XL_CHART_TYPE as XL
+from pptx.oxml import CT_Chart_Container, oxml_fromstring
+
+
+CHART_COUNT = 2000
+SERIES_COUNT = 3
+POINT_COUNT = 12
+
+
+def parse_skeletons(count):
+    for idx in xrange(count):
+        oxml_fromstring(CT_Chart_Container._chart_tmpl % 'rId1')
+
+
+def clone_skeletons(count):
+    for idx in xrange(count):
+        CT_Chart_Container.new_chart_wrapper('rId1')
+
+
+def build_charts(count, data, headings, chart_type):
+    for idx in xrange(count):
+        CT_Chart_Container.new_chart(data, headings, 'rId1', chart_type)
+
+
+def timed(func, *args):
+    start = time.time()
+    func(*args)
+    return time.time() - start
+
+
+def main():
+    categories = ['Month %d' % (idx+1) for idx in range(POINT_COUNT)]
+    data = [categories] + [[float(idx * series_idx) for idx in
+                            range(POINT_COUNT)]
+                           for series_idx in range(SERIES_COUNT)]
+    headings = ['Category'] + ['Series %d' % (idx+1)
+                               for idx in range(SERIES_COUNT)]
+    # warm up template caches
+    build_charts(1, data, headings, XL.LINE)
+    build_charts(1, data, headings, XL.BAR_CLUSTERED)
+
+    parse_secs = timed(parse_skeletons, CHART_COUNT)
+    clone_secs = timed(clone_skeletons, CHART_COUNT)
+    line_secs = timed(build_charts, CHART_COUNT, data, headings, XL.LINE)
+    bar_secs = timed(
+        build_charts, CHART_COUNT, data, headings, XL.BAR_CLUSTERED)
+
+    def usec(secs):
+        return secs / CHART_COUNT * 1e6
+
+    print '%d charts of %d x %d points' % (
+        CHART_COUNT, SERIES_COUNT, POINT_COUNT)
+    print 'skeleton, parsed:      %8.1f usec/chart' % usec(parse_secs)
+    print 'skeleton, cloned:      %8.1f usec/chart' % usec(clone_secs)
+    print 'line chart:            %8.1f usec/chart' % usec(line_secs)
+    print 'clustered bar chart:   %8.1f usec/chart' % usec(bar_secs)
+
+
+if __name__ == '__main__':
+    main()
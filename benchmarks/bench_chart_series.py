@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# bench_chart_series.py
+#
+# Microbenchmark of chart series ingestion: generation of the <c:numCache>
+# for a single 1,000,000-point series, and of a complete line chart with 10
+# series of 5,000 points each. NumPy arrays are used when NumPy is installed,
+# array.array otherwise. Run from the repository root, e.g.:
+#
+#     python benchmarks/bench_chart_series.py
+
+import os
+import sys
+import time
+
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pptx.oxml import CT_Chart_Container, CT_ChartCell
+
+
+POINT_COUNT = 1000000
+SERIES_COUNT = 10
+SERIES_POINT_COUNT = 5000
+
+
+def series(point_count):
+    """Return a float series of *point_count* values"""
+    if numpy is not None:
+        return numpy.linspace(0.0, 1000.0, point_count)
+    step = 1000.0 / (point_count - 1)
+    return array('d', [idx * step for idx in xrange(point_count)])
+
+
+def build_numRef(values):
+    CT_ChartCell.numRef_node(values, 'Sheet1!$B$2:$B$%d' % (len(values)+1))
+
+
+def build_chart(data, headings):
+    CT_Chart_Container.new_chart(data, headings, 'rId1')
+
+
+def timed(func, *args):
+    start = time.time()
+    func(*args)
+    return time.time() - start
+
+
+def main():
+    values = series(POINT_COUNT)
+    numRef_secs = timed(build_numRef, values)
+
+    categories = ['%d' % idx for idx in range(SERIES_POINT_COUNT)]
+    data = [categories] + [series(SERIES_POINT_COUNT)
+                           for idx in range(SERIES_COUNT)]
+    headings = ['Category'] + ['Series %d' % (idx+1)
+                               for idx in range(SERIES_COUNT)]
+    chart_secs = timed(build_chart, data, headings)
+
+    print 'series type: %s' % type(values).__name__
+    print '%d-point numCache:      %.3f sec (%.2f usec/point)' % (
+        POINT_COUNT, numRef_secs, numRef_secs / POINT_COUNT * 1e6)
+    print '%d x %d-point chart:   %.3f sec' % (
+        SERIES_COUNT, SERIES_POINT_COUNT, chart_secs)
+
+
+if __name__ == '__main__':
+    main()
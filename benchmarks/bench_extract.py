@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# bench_extract.py
+#
+# Benchmark of text extraction with pptx.extract.iter_text() against
+# opening the presentation with Presentation(file) and walking its shapes.
+# Extracts from the given .pptx files, or from a synthesized deck of
+# --slides slides with text, a table and a picture on each. Run from the
+# repository root, e.g.:
+#
+#     python benchmarks/bench_extract.py --slides 200
+#     python benchmarks/bench_extract.py archive/*.pptx
+
+import argparse
+import os
+import sys
+
+from io import BytesIO
+from timeit import default_timer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pptx import Presentation
+from pptx.extract import iter_text
+from pptx.util import Inches
+
+
+image_path = os.path.join(
+    os.path.dirname(__file__), '..', 'test', 'test_files',
+    'python-icon.jpeg')
+
+BLANK_LAYOUT_IDX = 6
+
+
+def synthesize(slide_count):
+    """Return the bytes of a deck having *slide_count* slides of text."""
+    prs = Presentation()
+    layout = prs.slidelayouts[BLANK_LAYOUT_IDX]
+    for slide_idx in range(slide_count):
+        shapes = prs.slides.add_slide(layout).shapes
+        for idx in range(8):
+            textbox = shapes.add_textbox(
+                Inches(0.5), Inches(0.5 + idx * 0.4), Inches(4), Inches(0.4))
+            textbox.textframe.text = 'Slide %d shape %d' % (slide_idx, idx)
+        table = shapes.add_table(5, 4, Inches(5), Inches(0.5), Inches(4),
+                                 Inches(2))
+        table.cell(0, 0).text = 'Slide %d' % slide_idx
+        shapes.add_picture(image_path, Inches(5), Inches(3))
+    stream = BytesIO()
+    prs.save(stream)
+    return stream.getvalue()
+
+
+def model_text(file):
+    """Return the count of text runs found by walking the object model."""
+    count = 0
+    for slide in Presentation(file).slides:
+        for shape in slide.shapes:
+            if not shape.has_textframe:
+                continue
+            for para in shape.textframe.paragraphs:
+                count += len(para.runs)
+    return count
+
+
+def extract_text(file):
+    """Return the count of paragraphs generated by iter_text()."""
+    return len(list(iter_text(file)))
+
+
+def best_time(func, blob, repeat):
+    """Return best time of *repeat* calls of *func* on package *blob*."""
+    secs = []
+    for idx in range(repeat):
+        start = default_timer()
+        func(BytesIO(blob))
+        secs.append(default_timer() - start)
+    return min(secs)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description='Time iter_text() against Presentation(file).')
+    arg = parser.add_argument
+    arg('files', nargs='*', help='.pptx files, by default a synthetic deck')
+    arg('--slides', type=int, default=100, help='slides in synthetic deck')
+    arg('--repeat', type=int, default=5, help='runs of each extraction')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    if options.files:
+        decks = []
+        for path in options.files:
+            with open(path, 'rb') as f:
+                decks.append((os.path.basename(path), f.read()))
+    else:
+        decks = [('synthetic-%d' % options.slides,
+                  synthesize(options.slides))]
+
+    print 'deck | model [ms] | iter_text [ms] | speedup'
+    for name, blob in decks:
+        model_secs = best_time(model_text, blob, options.repeat)
+        extract_secs = best_time(extract_text, blob, options.repeat)
+        print '%s | %10.1f | %14.1f | %6.1fx' % (
+            name, model_secs * 1e3, extract_secs * 1e3,
+            model_secs / extract_secs)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
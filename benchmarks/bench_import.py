@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# bench_import.py
+#
+# Benchmark of the cold import time of the pptx package. Each sample
+# imports pptx in a fresh interpreter; the best time is reported, along
+# with any of the slow-to-import optional modules (PIL, xlsxwriter and
+# NumPy) that a plain "import pptx" loaded, which it should not. Run from
+# the repository root, e.g.:
+#
+#     python benchmarks/bench_import.py
+#     python benchmarks/bench_import.py --max-ms 150
+#     python benchmarks/bench_import.py --profile
+#
+# With --max-ms, the exit status is 1 when the best import time exceeds
+# the limit or a deferred module was imported, so CI can keep import time
+# down. --profile prints the self and cumulative time of each module
+# imported, like "python -X importtime" on Python 3.7+, which Python 2
+# lacks.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+repo_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# modules "import pptx" must leave to be imported on first use
+DEFERRED_MODULES = ('PIL', 'xlsxwriter', 'numpy')
+
+_sample_script = r'''
+import json, sys, time
+start = time.time()
+import pptx
+elapsed = time.time() - start
+deferred = %r
+json.dump({'secs': elapsed,
+           'loaded': [name for name in deferred if name in sys.modules]},
+          sys.stdout)
+''' % (DEFERRED_MODULES,)
+
+_profile_script = r'''
+import sys, time, __builtin__
+builtin_import = __builtin__.__import__
+stack, rows = [], []
+
+def timed_import(name, *args, **kwargs):
+    before = len(sys.modules)
+    stack.append(0.0)
+    start = time.time()
+    try:
+        return builtin_import(name, *args, **kwargs)
+    finally:
+        elapsed = time.time() - start
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        if len(sys.modules) > before:
+            rows.append((elapsed - children, elapsed, len(stack), name))
+
+__builtin__.__import__ = timed_import
+import pptx
+__builtin__.__import__ = builtin_import
+print 'self [us] | cumulative | imported package'
+for self_secs, secs, depth, name in rows:
+    print '%9d | %10d | %s%s' % (
+        self_secs * 1e6, secs * 1e6, '  ' * depth, name)
+'''
+
+
+def sample():
+    """
+    Return a dict holding the time taken by ``import pptx`` in a fresh
+    interpreter and the deferred modules it loaded.
+    """
+    output = subprocess.check_output(
+        [sys.executable, '-c', _sample_script], cwd=repo_dir)
+    return json.loads(output)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description='Time a cold "import pptx".')
+    arg = parser.add_argument
+    arg('--repeat', type=int, default=10, help='imports to sample')
+    arg('--max-ms', type=float,
+        help='exit with status 1 if best import takes longer than this')
+    arg('--json', action='store_true', help='write results as JSON')
+    arg('--profile', action='store_true',
+        help='print per-module import times instead')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    if options.profile:
+        return subprocess.call(
+            [sys.executable, '-c', _profile_script], cwd=repo_dir)
+
+    samples = [sample() for idx in range(options.repeat)]
+    best_ms = min([s['secs'] for s in samples]) * 1e3
+    loaded = sorted(set([name for s in samples for name in s['loaded']]))
+    if options.json:
+        print json.dumps({'best_ms': best_ms, 'deferred_loaded': loaded,
+                          'repeat': options.repeat}, indent=2)
+    else:
+        print 'import pptx: %.1f ms (best of %d)' % (best_ms, options.repeat)
+        if loaded:
+            print 'deferred modules imported: %s' % ', '.join(loaded)
+
+    failed = bool(loaded)
+    if options.max_ms is not None and best_ms > options.max_ms:
+        sys.stderr.write('import time %.1f ms exceeds limit of %.1f ms\n' %
+                         (best_ms, options.max_ms))
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
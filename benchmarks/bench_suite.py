@@ -0,0 +1,315 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# bench_suite.py
+#
+# Reproducible benchmark suite for load, edit and save. Synthesizes a deck
+# of parametrized size from the default template: N slides, each having M
+# text boxes and a number of pictures, tables and charts; times each step
+# of building it, saving it and opening it again; measures the memory the
+# reopened deck holds; and times opening each of the decks in
+# test/test_files. Results, including peak RSS, are written as JSON so runs
+# can be compared mechanically. Run from the repository
+# root, e.g.:
+#
+#     python benchmarks/bench_suite.py --slides 50 --output results.json
+#     python benchmarks/bench_suite.py --compare baseline.json
+#
+# With --compare, the exit status is 1 when the best time of any phase is
+# more than --tolerance (a fraction, 0.25 by default) slower than in the
+# baseline results, so the suite can gate an upgrade.
+
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+
+from io import BytesIO
+from timeit import default_timer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from lxml import etree
+
+import pptx
+
+from pptx import Presentation
+from pptx.constants import XL_CHART_TYPE as XL
+from pptx.exc import CorruptedPackageError
+from pptx.oxml import OXML_BACKEND
+from pptx.presentation import _Package
+from pptx.util import Inches
+
+
+test_files_dir = os.path.join(
+    os.path.dirname(__file__), '..', 'test', 'test_files')
+image_path = os.path.join(test_files_dir, 'python-icon.jpeg')
+
+BLANK_LAYOUT_IDX = 6
+
+repo_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# prints the growth in resident set size, in kilobytes, from opening the
+# deck at argv[1], or null where /proc isn't available to read it from
+_open_rss_script = r'''
+import json, resource, sys
+
+def rss_kb():
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (IOError, IndexError, ValueError):
+        return None
+    return pages * resource.getpagesize() // 1024
+
+from pptx import Presentation
+before = rss_kb()
+prs = Presentation(sys.argv[1])
+after = rss_kb()
+json.dump(None if before is None else after - before, sys.stdout)
+'''
+
+
+class PhaseTimer(object):
+    """
+    Accumulates the elapsed time and operation count of each named phase of
+    one benchmark run.
+    """
+    def __init__(self):
+        super(PhaseTimer, self).__init__()
+        self.phases = {}
+
+    def time(self, phase, func, *args):
+        """Call *func* with *args*, adding the time it took to *phase*."""
+        start = default_timer()
+        retval = func(*args)
+        elapsed = default_timer() - start
+        secs, count = self.phases.get(phase, (0.0, 0))
+        self.phases[phase] = (secs + elapsed, count + 1)
+        return retval
+
+
+def build_deck(timer, options):
+    """
+    Return a new presentation built to the size in *options*, timing each
+    kind of edit in *timer*.
+    """
+    prs = timer.time('open_default', Presentation)
+    layout = prs.slidelayouts[BLANK_LAYOUT_IDX]
+    categories = ['Item %d' % (idx+1) for idx in range(options.chart_points)]
+    headings = ['Category', 'Series 1', 'Series 2']
+    for slide_idx in range(options.slides):
+        slide = timer.time('add_slide', prs.slides.add_slide, layout)
+        shapes = slide.shapes
+        for idx in range(options.shapes):
+            textbox = timer.time(
+                'add_textbox', shapes.add_textbox, Inches(0.5),
+                Inches(0.5 + idx * 0.2), Inches(4), Inches(0.2))
+            textbox.textframe.text = 'Slide %d shape %d' % (slide_idx, idx)
+        for idx in range(options.pictures):
+            timer.time('add_picture', shapes.add_picture, image_path,
+                       Inches(5 + idx * 0.5), Inches(0.5))
+        for idx in range(options.tables):
+            table = timer.time(
+                'add_table', shapes.add_table, options.table_rows, 4,
+                Inches(0.5), Inches(3), Inches(6), Inches(2))
+            table.cell(0, 0).text = 'Slide %d' % slide_idx
+        for idx in range(options.charts):
+            values = [float(slide_idx + idx + point) for point in
+                      range(options.chart_points)]
+            data = [categories, values, values[::-1]]
+            timer.time('add_chart', shapes.add_chart, Inches(5),
+                       Inches(3), Inches(4), Inches(3), data, headings,
+                       XL.LINE)
+    return prs
+
+
+def run_synthetic(options):
+    """
+    Return a ``(phases, saved_bytes)`` pair, where *phases* is a dict mapping
+    each phase of building, saving and reopening a synthesized deck to its
+    timing statistics over ``options.repeat`` runs and *saved_bytes* is the
+    size of the saved deck.
+    """
+    runs = []
+    for run_idx in range(options.repeat):
+        timer = PhaseTimer()
+        prs = build_deck(timer, options)
+        stream = BytesIO()
+        timer.time('save', prs.save, stream)
+        stream.seek(0)
+        timer.time('open_saved', Presentation, stream)
+        runs.append(timer.phases)
+    results = {}
+    for phase in runs[0]:
+        secs = sorted([phases[phase][0] for phases in runs])
+        count = runs[0][phase][1]
+        results[phase] = {
+            'count':       count,
+            'best_secs':   secs[0],
+            'median_secs': secs[len(secs) // 2],
+            'usec_per_op': secs[0] / count * 1e6,
+        }
+    return results, len(stream.getvalue())
+
+
+def run_memory(options):
+    """
+    Return a dict describing the memory held by the synthesized deck once
+    saved and reopened: the growth in resident set size opening it in a
+    fresh interpreter, the totals of its memory report and the number of
+    packages still alive after it's dropped, which should be zero. Python 2
+    has no tracemalloc, so resident set size stands in for allocation
+    tracing.
+    """
+    fd, path = tempfile.mkstemp(suffix='.pptx')
+    os.close(fd)
+    try:
+        build_deck(PhaseTimer(), options).save(path)
+        output = subprocess.check_output(
+            [sys.executable, '-c', _open_rss_script, path], cwd=repo_dir)
+        prs = Presentation(path)
+        report = prs.memory_report()
+        del prs
+        gc.collect()
+    finally:
+        os.remove(path)
+    return {
+        'open_rss_growth_kb': json.loads(output),
+        'report_totals':      report['totals'],
+        'proxies':            sum(report['proxies'].values()),
+        'retained_packages':  len(_Package.instances()),
+    }
+
+
+def run_open_files(options):
+    """
+    Return a dict mapping the name of each deck in test/test_files to the
+    best time of ``options.repeat`` opens of it, or to the error message if
+    it can't be opened.
+    """
+    results = {}
+    for path in sorted(glob.glob(os.path.join(test_files_dir, '*.pptx'))):
+        name = os.path.basename(path)
+        secs = []
+        try:
+            for run_idx in range(options.repeat):
+                start = default_timer()
+                Presentation(path)
+                secs.append(default_timer() - start)
+        except CorruptedPackageError as e:
+            results[name] = {'error': str(e)}
+            continue
+        results[name] = {'best_secs': min(secs)}
+    return results
+
+
+def peak_rss_kb():
+    """
+    Return the peak resident set size of this process in kilobytes.
+    ``ru_maxrss`` is in kilobytes on Linux but in bytes on Mac OS X.
+    """
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        maxrss //= 1024
+    return maxrss
+
+
+def environment():
+    """Return a dict describing the software the suite was run with."""
+    return {
+        'python':       platform.python_version(),
+        'platform':     platform.platform(),
+        'pptx':         pptx.__version__,
+        'lxml':         '.'.join([str(n) for n in etree.LXML_VERSION]),
+        'oxml_backend': OXML_BACKEND,
+        'numpy':        numpy.__version__ if numpy is not None else None,
+    }
+
+
+def regressions(results, baseline, tolerance):
+    """
+    Return a list of messages describing each synthetic-deck phase whose
+    best time in *results* is more than *tolerance* slower than in
+    *baseline*.
+    """
+    if results['parameters'] != baseline['parameters']:
+        return ['deck parameters differ from baseline, not comparable']
+    messages = []
+    phases = results['synthetic']
+    for phase, base in sorted(baseline['synthetic'].items()):
+        if phase not in phases:
+            continue
+        limit = base['best_secs'] * (1 + tolerance)
+        if phases[phase]['best_secs'] > limit:
+            messages.append('%s: %.4f sec, baseline %.4f sec' % (
+                phase, phases[phase]['best_secs'], base['best_secs']))
+    return messages
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description='Time load, edit and save of synthesized decks.')
+    arg = parser.add_argument
+    arg('--slides', type=int, default=20, help='slides in deck')
+    arg('--shapes', type=int, default=10, help='text boxes per slide')
+    arg('--pictures', type=int, default=1, help='pictures per slide')
+    arg('--tables', type=int, default=1, help='tables per slide')
+    arg('--table-rows', type=int, default=5, help='rows per table')
+    arg('--charts', type=int, default=1, help='charts per slide')
+    arg('--chart-points', type=int, default=12, help='points per series')
+    arg('--repeat', type=int, default=3, help='runs of each benchmark')
+    arg('--output', help='write JSON results to this file, not stdout')
+    arg('--compare', metavar='BASELINE',
+        help='exit with status 1 on regression against these results')
+    arg('--tolerance', type=float, default=0.25,
+        help='allowed slowdown against baseline, as a fraction')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    parameters = dict(
+        (name, getattr(options, name)) for name in
+        ('slides', 'shapes', 'pictures', 'tables', 'table_rows', 'charts',
+         'chart_points', 'repeat'))
+    synthetic, saved_bytes = run_synthetic(options)
+    results = {
+        'environment': environment(),
+        'parameters':  parameters,
+        'synthetic':   synthetic,
+        'saved_bytes': saved_bytes,
+        'memory':      run_memory(options),
+        'open_files':  run_open_files(options),
+        'peak_rss_kb': peak_rss_kb(),
+    }
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if options.output:
+        with open(options.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print output
+
+    if options.compare:
+        with open(options.compare) as f:
+            baseline = json.load(f)
+        messages = regressions(results, baseline, options.tolerance)
+        for message in messages:
+            sys.stderr.write('regression: %s\n' % message)
+        return 1 if messages else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
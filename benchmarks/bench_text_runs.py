@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# bench_text_runs.py
+#
+# Microbenchmark of the text access hot path: 100,000 text-run edits, each
+# reaching its run through _TextFrame.paragraphs and _Paragraph.runs, plus
+# table row access through _Table.rows. Run from the repository root, e.g.:
+#
+#     python benchmarks/bench_text_runs.py
+#     PPTX_OXML_BACKEND=etree python benchmarks/bench_text_runs.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pptx import Presentation
+from pptx.oxml import OXML_BACKEND
+from pptx.util import Inches
+
+
+EDIT_COUNT = 100000
+PARAGRAPH_COUNT = 10
+RUN_COUNT = 10
+ROW_COUNT = 10
+
+
+def build_textframe():
+    """
+    Return a text frame containing PARAGRAPH_COUNT paragraphs, each having
+    RUN_COUNT runs.
+    """
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slidelayouts[6])
+    textbox = slide.shapes.add_textbox(0, 0, Inches(4), Inches(4))
+    textframe = textbox.textframe
+    for idx in range(PARAGRAPH_COUNT):
+        p = textframe.paragraphs[0] if idx == 0 else textframe.add_paragraph()
+        for jdx in range(RUN_COUNT):
+            p.add_run().text = 'run %d.%d' % (idx, jdx)
+    table = slide.shapes.add_table(ROW_COUNT, 2, 0, 0, Inches(4), Inches(4))
+    return textframe, table
+
+
+def edit_runs(textframe, edit_count):
+    """Perform *edit_count* text-run edits on runs in *textframe*"""
+    runs_per_frame = PARAGRAPH_COUNT * RUN_COUNT
+    for idx in range(edit_count):
+        run_idx = idx % runs_per_frame
+        p = textframe.paragraphs[run_idx // RUN_COUNT]
+        r = p.runs[run_idx % RUN_COUNT]
+        r.text = 'edit %d' % idx
+
+
+def access_rows(table, access_count):
+    """Access a table row *access_count* times"""
+    for idx in range(access_count):
+        table.rows[idx % ROW_COUNT].height
+
+
+def timed(func, *args):
+    start = time.time()
+    func(*args)
+    return time.time() - start
+
+
+def main():
+    textframe, table = build_textframe()
+    run_secs = timed(edit_runs, textframe, EDIT_COUNT)
+    row_secs = timed(access_rows, table, EDIT_COUNT)
+    print 'oxml backend: %s' % OXML_BACKEND
+    print '%d run edits:     %.3f sec (%.1f usec/edit)' % (
+        EDIT_COUNT, run_secs, run_secs / EDIT_COUNT * 1e6)
+    print '%d row accesses:  %.3f sec (%.1f usec/access)' % (
+        EDIT_COUNT, row_secs, row_secs / EDIT_COUNT * 1e6)
+
+
+if __name__ == '__main__':
+    main()
@@ -13,15 +13,9 @@ from pptx.api import Presentation  # flake8: noqa
 
 __version__ = '0.2.6'
 
+# the application decides where log records go and at what level; the
+# library only keeps "No handlers could be found" from being reported
 import logging
-log = logging.getLogger('pptx')
-log.setLevel(logging.DEBUG)
-ch = logging.StreamHandler()
-ch.setLevel(logging.DEBUG)
-formatter = logging.Formatter(
-    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-ch.setFormatter(formatter)
-log.addHandler(ch)
+logging.getLogger('pptx').addHandler(logging.NullHandler())
 
 del sys
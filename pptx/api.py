@@ -14,9 +14,15 @@ provides some insulation so not so many classes in the other modules need to
 be named as internal (leading underscore).
 """
 
+from io import BytesIO
+
 from pptx.presentation import _Package
 
 
+# size of the writes save_async() makes to a file-like object
+SAVE_CHUNK_SIZE = 64 * 1024
+
+
 class Presentation(object):
     """
     Return a |Presentation| instance loaded from *file*, where *file* can be
@@ -29,6 +35,39 @@ class Presentation(object):
         self.__package = _Package(file)
         self.__presentation = self.__package.presentation
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        """
+        Release the memory held by this presentation without waiting for
+        garbage collection: parsed XML, image and workbook content, and the
+        references between parts are dropped. The presentation can't be
+        used afterward. Also called on leaving a ``with`` block, e.g.::
+
+            with Presentation('template.pptx') as prs:
+                build(prs)
+                prs.save('deck.pptx')
+        """
+        self.__package.close()
+        self.__presentation = None
+
+    @classmethod
+    def open_async(cls, file, executor):
+        """
+        Return the future *executor* returns for loading the |Presentation|
+        in *file*, |None| for the default template, so the reading, parsing
+        and model building run on the executor rather than the calling
+        thread. *executor* is any object having a ``submit(fn, *args)``
+        method returning a future, such as a
+        ``concurrent.futures.ThreadPoolExecutor``.
+        """
+        return executor.submit(cls, file)
+
     @property
     def core_properties(self):
         """
@@ -37,6 +76,16 @@ class Presentation(object):
         """
         return self.__package.core_properties
 
+    def memory_report(self):
+        """
+        Return a dict describing the memory held by this presentation: the
+        size of each part's content and parsed XML tree, its relationships
+        and observers, and a count of each kind of object held. See
+        :func:`pptx.memory.memory_report` for its contents.
+        """
+        from pptx.memory import memory_report
+        return memory_report(self.__package)
+
     @property
     def slidelayouts(self):
         """
@@ -70,22 +119,64 @@ class Presentation(object):
     @property
     def charts(self):
         """
-        |_SlideCollection| object containing the slides in this
-        presentation.
+        |_ChartCollection| object containing the chart parts in this
+        presentation, including those loaded from its file.
         """
-        return self.__presentation.charts
+        return self.__package._charts
     
     @property
     def xlsx(self):
         """
-        |_SlideCollection| object containing the slides in this
-        presentation.
+        |_xlsxCollection| object containing the Excel workbooks embedded in
+        this presentation for its charts.
         """
-        return self.__presentation.xlsx
+        return self.__package._xlsx
 
-    def save(self, file):
+    def save(self, file, compact=False):
         """
         Save this presentation to *file*, where *file* can be either a path to
-        a file (a string) or a file-like object.
+        a file (a string) or a file-like object. Pass ``compact=True`` to
+        write XML parts without indentation, which is smaller and faster to
+        save but harder to read when the package is unzipped.
         """
-        return self.__package.save(file)
+        return self.__package.save(file, compact)
+
+    def save_async(self, file, executor, compact=False):
+        """
+        Return the future *executor* returns for saving this presentation
+        to *file*, so serialization and compression run on the executor as
+        described for :meth:`open_async`. The presentation must not be
+        changed until the future is done. A path or a seekable file-like
+        object is written directly. A file-like object that can't report
+        its position, such as a pipe or socket, can't be written by
+        ``zipfile``, so the whole package is built in memory first and then
+        written in chunks of :attr:`SAVE_CHUNK_SIZE` bytes, which needs
+        memory for a second copy of the saved package.
+        """
+        return executor.submit(self.__save_chunked, file, compact)
+
+    def __save_chunked(self, file, compact):
+        """
+        Save this presentation to *file*, writing a file-like object that
+        can't report its position in chunks.
+        """
+        if isinstance(file, basestring) or _is_seekable(file):
+            return self.save(file, compact)
+        stream = BytesIO()
+        self.save(stream, compact)
+        blob = stream.getvalue()
+        stream.close()
+        for offset in xrange(0, len(blob), SAVE_CHUNK_SIZE):
+            file.write(blob[offset:offset+SAVE_CHUNK_SIZE])
+
+
+def _is_seekable(file):
+    """
+    Return True if file-like object *file* can report and change its
+    position, as ``zipfile`` needs of a file it writes.
+    """
+    try:
+        file.seek(file.tell())
+    except (AttributeError, IOError):
+        return False
+    return True
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+#
+# batch.py
+#
+# This module is part of python-pptx and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+Rendering of many presentations from one template, one per data record,
+spread across a pool of worker processes, e.g.::
+
+    def build(prs, record):
+        slide = prs.slides.add_slide(prs.slidelayouts[1])
+        slide.shapes.title.text = record['title']
+
+    results = render('template.pptx', records, build, 'out')
+    failed = [result for result in results if not result.ok]
+
+*build_fn* is called with a fresh |Presentation| loaded from the template
+and the record; the presentation is then saved to its own file in
+*out_dir*. Each worker reads the template once and keeps it in memory, so
+per-record work is parsing, building and saving only.
+"""
+
+import multiprocessing
+import os
+import traceback
+
+from io import BytesIO
+from timeit import default_timer
+
+from pptx.api import Presentation
+
+
+# state of the current worker process, set by _init_worker()
+_worker = {}
+
+
+class JobResult(object):
+    """
+    Outcome of rendering one record, returned by :func:`render`.
+
+    .. attribute:: index
+
+       Position of the record in the records passed to :func:`render`.
+
+    .. attribute:: path
+
+       Path of the presentation file written for the record; the file is
+       removed if rendering failed.
+
+    .. attribute:: build_secs
+
+       Seconds taken to load the template and call the build function.
+
+    .. attribute:: save_secs
+
+       Seconds taken to save the presentation, 0.0 if it wasn't saved.
+
+    .. attribute:: error
+
+       ``repr()`` of the exception that stopped the record being rendered,
+       or |None| on success.
+
+    .. attribute:: traceback
+
+       Formatted traceback of :attr:`error`, or |None| on success.
+    """
+    def __init__(self, index, path, build_secs=0.0, save_secs=0.0,
+                 error=None, traceback=None):
+        super(JobResult, self).__init__()
+        self.index = index
+        self.path = path
+        self.build_secs = build_secs
+        self.save_secs = save_secs
+        self.error = error
+        self.traceback = traceback
+
+    def __repr__(self):
+        status = 'ok' if self.ok else self.error
+        return '<JobResult %d %s %.3fs %s>' % (
+            self.index, self.path, self.elapsed, status)
+
+    @property
+    def elapsed(self):
+        """Total seconds taken to render the record."""
+        return self.build_secs + self.save_secs
+
+    @property
+    def ok(self):
+        """True if the record was rendered and saved without error."""
+        return self.error is None
+
+
+def render(template_path, records, build_fn, out_dir, workers=None,
+           filename_fn=None, compact=False, callback=None):
+    """
+    Render a presentation for each item in *records* and return a list of
+    |JobResult|, one per record and in the same order. *template_path* is
+    the path of the ``.pptx`` file each presentation starts from, |None|
+    for the built-in default template.
+
+    *build_fn* is called with the presentation and the record and must be
+    a module-level function so it can be sent to the worker processes; the
+    records must likewise be picklable. Its return value is ignored. An
+    exception it raises is reported in the record's result and doesn't stop
+    the other records being rendered.
+
+    Files are written to *out_dir*, created if necessary, and named by
+    *filename_fn*, called in this process with the record's index and the
+    record. By default they're named by index, e.g. ``'000042.pptx'``.
+    *compact* is passed to :meth:`Presentation.save`.
+
+    *workers* is the number of processes to use, by default one per CPU.
+    With ``workers=1`` records are rendered in this process, which is
+    handy for debugging a build function. If *callback* is given, it's
+    called in this process with each |JobResult| as the job finishes, in
+    order of completion, e.g. to report progress.
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if filename_fn is None:
+        filename_fn = _default_filename
+    if not os.path.isdir(out_dir):
+        os.makedirs(out_dir)
+
+    jobs = [(idx, record, os.path.join(out_dir, filename_fn(idx, record)))
+            for idx, record in enumerate(records)]
+    results = [None] * len(jobs)
+    initargs = (template_path, build_fn, compact)
+
+    if workers == 1 or len(jobs) < 2:
+        _init_worker(*initargs)
+        job_results = (_run_job(job) for job in jobs)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(
+            min(workers, len(jobs)), _init_worker, initargs)
+        chunksize = max(1, min(16, len(jobs) // (workers * 4)))
+        job_results = pool.imap_unordered(_run_job, jobs, chunksize)
+
+    try:
+        for result in job_results:
+            results[result.index] = result
+            if callback is not None:
+                callback(result)
+    finally:
+        if pool is None:
+            _worker.clear()
+        else:
+            pool.terminate()
+            pool.join()
+    return results
+
+
+def _default_filename(idx, record):
+    """Return the default filename of the record at *idx*."""
+    return '%06d.pptx' % idx
+
+
+def _init_worker(template_path, build_fn, compact):
+    """
+    Prepare the current process for rendering jobs, reading the template
+    into memory once so each job can load it without touching the disk.
+    """
+    template_blob = None
+    if template_path is not None:
+        with open(template_path, 'rb') as f:
+            template_blob = f.read()
+    _worker.update(template_blob=template_blob, build_fn=build_fn,
+                   compact=compact)
+
+
+def _run_job(job):
+    """
+    Render the presentation for *job*, an ``(index, record, path)`` tuple,
+    in the current worker, returning its |JobResult|.
+    """
+    idx, record, path = job
+    result = JobResult(idx, path)
+    prs = None
+    saving = False
+    start = default_timer()
+    try:
+        template_blob = _worker['template_blob']
+        if template_blob is None:
+            prs = Presentation()
+        else:
+            prs = Presentation(BytesIO(template_blob))
+        _worker['build_fn'](prs, record)
+        result.build_secs = default_timer() - start
+        saving = True
+        start = default_timer()
+        prs.save(path, _worker['compact'])
+        result.save_secs = default_timer() - start
+    except Exception as e:
+        elapsed = default_timer() - start
+        if saving:
+            result.save_secs = elapsed
+        else:
+            result.build_secs = elapsed
+        result.error = repr(e)
+        result.traceback = traceback.format_exc()
+        if os.path.exists(path):
+            os.remove(path)
+    # free the presentation now rather than at the worker's next garbage
+    # collection, so worker memory doesn't grow between collections
+    if prs is not None:
+        prs.close()
+    return result
@@ -289,6 +289,23 @@ class PP(object):
     ALIGN_THAI_DISTRIBUTE = 6
 
 
+class XL_CHART_TYPE(object):
+    """
+    Constants corresponding to the xlChartType enumeration in the MS API.
+    Standard abbreviation is 'XL', e.g.:
+
+        from pptx.constants import XL_CHART_TYPE as XL
+
+    """
+    # xlChartType ----------------------
+    AREA = 1
+    BAR_CLUSTERED = 57
+    COLUMN_CLUSTERED = 51
+    LINE = 4
+    PIE = 5
+    XY_SCATTER = -4169
+
+
 class TEXT_ALIGN_TYPE(object):
     """
     Constants containing the valid values of ST_TextAlignType in Open XML.
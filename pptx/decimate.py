@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+#
+# decimate.py
+#
+# This module is part of python-pptx and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+Downsampling of chart data too long to be usefully plotted, to a target
+number of points. Computation is vectorized with NumPy when it's installed;
+plain Python sequences are handled without it.
+"""
+
+import math
+
+from datetime import date
+from numbers import Number
+from operator import itemgetter
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pptx.oxml import _excel_serials, _series_values
+
+
+#: names of the supported decimation methods, see :func:`decimate`
+DECIMATION_METHODS = ('lttb', 'minmax', 'stride')
+
+
+def decimate(data, max_points, method='lttb'):
+    """
+    Return a list holding a copy of each sequence in *data* reduced to the
+    same subset of at most *max_points* points, or *data* itself if it has
+    no more points than that. The first sequence in *data* holds the
+    categories (or x values), the rest the values of each series, as passed
+    to :meth:`_ShapeCollection.add_chart`. The first and last points are
+    always kept. *method* is one of:
+
+    ``'lttb'``
+        Largest-Triangle-Three-Buckets, which keeps the points that most
+        preserve the visual shape of each series.
+    ``'minmax'``
+        The minimum and maximum of each series in each of a set of buckets,
+        which preserves peaks and troughs.
+    ``'stride'``
+        Evenly spaced points, the fastest but most lossy method.
+
+    With more than one series, *max_points* is shared between them and the
+    points chosen for any series are kept in all of them, thinned evenly
+    if together they come to more than *max_points*. |None| and NaN values
+    are never chosen over a number but are kept if a bucket holds nothing
+    else. Raises
+    |ValueError| if *method* isn't one of ``DECIMATION_METHODS`` or
+    *max_points* is less than 3.
+    """
+    if method not in DECIMATION_METHODS:
+        tmpl = "decimation method must be one of %s, got '%s'"
+        raise ValueError(tmpl % (', '.join(DECIMATION_METHODS), method))
+    if max_points < 3:
+        raise ValueError("max_points must be 3 or more, got %d" % max_points)
+    point_count = len(data[0])
+    if point_count <= max_points:
+        return data
+
+    value_series = data[1:]
+    if method == 'stride' or not value_series:
+        indices = _stride_indices(point_count, max_points)
+    else:
+        x = _x_values(data[0])
+        budget = max(max_points // len(value_series), 3)
+        indices_fn = _lttb_indices if method == 'lttb' else _minmax_indices
+        indices = set()
+        for series in value_series:
+            y = _y_values(series)
+            indices.update(indices_fn(x, y, budget))
+        indices = sorted(indices)
+        # the per-series budgets can add up to more than max_points
+        if len(indices) > max_points:
+            keep = _stride_indices(len(indices), max_points)
+            indices = [indices[idx] for idx in keep]
+    return [_take(series, indices) for series in data]
+
+
+def _lttb_indices(x, y, target):
+    """
+    Return the indices of the *target* points of *x* and *y* chosen by the
+    Largest-Triangle-Three-Buckets algorithm. Buckets are visited in order,
+    as the choice in each depends on the one before, but the triangle areas
+    within a bucket are computed in a single vectorized step with NumPy.
+    """
+    point_count = len(y)
+    if point_count <= target:
+        return range(point_count)
+    bucket_edges = _bucket_edges(point_count, target)
+    indices = [0]
+    a = 0
+    for idx in range(target - 2):
+        start, end = bucket_edges[idx], bucket_edges[idx+1]
+        next_start = end
+        next_end = (bucket_edges[idx+2] if idx + 2 < len(bucket_edges)
+                    else point_count)
+        avg_x = _mean(x[next_start:next_end])
+        avg_y = _mean(y[next_start:next_end])
+        ax, ay = x[a], y[a]
+        if numpy is not None:
+            areas = numpy.abs((ax - avg_x) * (y[start:end] - ay) -
+                              (ax - x[start:end]) * (avg_y - ay))
+            if numpy.isnan(areas).all():
+                a = start
+            else:
+                a = start + int(numpy.nanargmax(areas))
+        else:
+            areas = [(abs((ax - avg_x) * (y[i] - ay) - (ax - x[i]) *
+                          (avg_y - ay)), i) for i in xrange(start, end)]
+            areas = [(area, i) for area, i in areas if not math.isnan(area)]
+            a = max(areas, key=itemgetter(0))[1] if areas else start
+        indices.append(a)
+    indices.append(point_count - 1)
+    return indices
+
+
+def _minmax_indices(x, y, target):
+    """
+    Return the indices of the first and last points of *y* and of the
+    minimum and maximum of each of ``(target - 2) // 2`` buckets between
+    them. With NumPy, the buckets are the rows of a reshaped array and are
+    reduced in a single step. *x* is not used.
+    """
+    point_count = len(y)
+    if point_count <= target:
+        return range(point_count)
+    bucket_count = max((target - 2) // 2, 1)
+    if numpy is not None:
+        inner = y[1:-1]
+        size = -(-len(inner) // bucket_count)  # ceiling division
+        bucket_count = -(-len(inner) // size)
+        padded = numpy.full(bucket_count * size, numpy.nan)
+        padded[:len(inner)] = inner
+        rows = padded.reshape(bucket_count, size)
+        nan = numpy.isnan(rows)
+        offsets = numpy.arange(bucket_count) * size + 1
+        mins = numpy.where(nan, numpy.inf, rows).argmin(axis=1) + offsets
+        maxs = numpy.where(nan, -numpy.inf, rows).argmax(axis=1) + offsets
+        indices = numpy.concatenate(([0], mins, maxs, [point_count - 1]))
+        return indices.tolist()
+    bucket_edges = _bucket_edges(point_count, bucket_count + 2)
+    indices = [0, point_count - 1]
+    for start, end in zip(bucket_edges[:-1], bucket_edges[1:]):
+        bucket = [(y[i], i) for i in xrange(start, end)
+                  if not math.isnan(y[i])]
+        if not bucket:
+            indices.append(start)
+            continue
+        indices.append(min(bucket, key=itemgetter(0))[1])
+        indices.append(max(bucket, key=itemgetter(0))[1])
+    return indices
+
+
+def _stride_indices(point_count, target):
+    """
+    Return the indices of *target* evenly spaced points of *point_count*,
+    including the first and last.
+    """
+    step = (point_count - 1) / float(target - 1)
+    return sorted(set([int(round(idx * step)) for idx in range(target)]))
+
+
+def _bucket_edges(point_count, target):
+    """
+    Return the ``target - 1`` edges of the ``target - 2`` buckets the points
+    between the first and last of *point_count* points are divided into.
+    """
+    step = (point_count - 2) / float(target - 2)
+    return [1 + int(idx * step) for idx in range(target - 1)]
+
+
+def _mean(values):
+    """
+    Return the mean of the values in *values*, a NumPy array or a list,
+    that aren't NaN, or NaN if there are none.
+    """
+    if numpy is not None:
+        values = values[~numpy.isnan(values)]
+        return values.mean() if len(values) else numpy.nan
+    values = [value for value in values if not math.isnan(value)]
+    return sum(values) / float(len(values)) if values else float('nan')
+
+
+def _take(series, indices):
+    """
+    Return the values of *series* at *indices*. A NumPy array is indexed in
+    a single step, giving a NumPy array.
+    """
+    if numpy is not None and isinstance(series, numpy.ndarray):
+        return series[indices]
+    return [series[idx] for idx in indices]
+
+
+def _x_values(categories):
+    """
+    Return the positions of *categories* along the x axis, as a NumPy array
+    of floats if NumPy is installed and a list otherwise. Numbers and dates
+    are positioned by value, other categories evenly by index.
+    """
+    dtype = getattr(categories, 'dtype', None)
+    if numpy is not None and dtype is not None and dtype.kind in 'fiu':
+        return numpy.asarray(categories, dtype=float)
+    values = _series_values(categories)
+    if values and isinstance(values[0], date):
+        values = _excel_serials(values)
+    elif not all([isinstance(value, Number) for value in values]):
+        values = range(len(values))
+    if numpy is not None:
+        return numpy.asarray(values, dtype=float)
+    return [float(value) for value in values]
+
+
+def _y_values(series):
+    """
+    Return the values of *series* as a NumPy array of floats if NumPy is
+    installed and a list otherwise, with |None| values as NaN.
+    """
+    dtype = getattr(series, 'dtype', None)
+    if numpy is not None and dtype is not None and dtype.kind in 'fiu':
+        return numpy.asarray(series, dtype=float)
+    values = [float('nan') if value is None else float(value)
+              for value in _series_values(series)]
+    if numpy is not None:
+        return numpy.asarray(values, dtype=float)
+    return values
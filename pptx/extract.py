@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# extract.py
+#
+# This module is part of python-pptx and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+Read-only extraction of the text in a presentation, for indexing and the
+like, e.g.::
+
+    for slide_no, shape_name, text in iter_text('deck.pptx'):
+        index.add(slide_no, text)
+
+Unlike ``Presentation(file)``, no object model is built: slide parts are
+read out of the zip package one at a time in presentation order, parsed
+into a plain ``lxml.etree`` tree and dropped once their text is
+generated, so memory use is bounded by the largest slide rather than
+growing with the size of the presentation. Other parts, such as images,
+are never read.
+"""
+
+import posixpath
+import zipfile
+
+from lxml import etree
+
+from pptx.spec import qtag, RT_OFFICE_DOCUMENT, RT_SLIDE
+
+
+# elements that are a shape, whose cNvPr carries the shape's name
+_shape_tags = frozenset([qtag('p:sp'), qtag('p:grpSp'), qtag('p:pic'),
+                         qtag('p:graphicFrame'), qtag('p:cxnSp')])
+
+_a_br = qtag('a:br')
+_a_p = qtag('a:p')
+_a_t = qtag('a:t')
+_p_sldId = qtag('p:sldId')
+_pr_Relationship = qtag('pr:Relationship')
+_r_id = qtag('r:id')
+
+
+def iter_text(file):
+    """
+    Generate a ``(slide_no, shape_name, text)`` tuple for each paragraph of
+    text on the slides of the presentation in *file*, a path or a file-like
+    object. Slides are numbered from 1 in presentation order; *shape_name*
+    is the name of the innermost shape holding the paragraph, e.g.
+    ``'Title 1'``, and *text* is the unicode text of its runs, with line
+    breaks as ``'\\n'``. Empty paragraphs are skipped. Table cell paragraphs
+    are generated with the name of the table's graphic frame.
+    """
+    pkg = zipfile.ZipFile(file)
+    try:
+        for slide_no, membername in enumerate(_slide_membernames(pkg), 1):
+            slide = pkg.open(membername)
+            try:
+                for shape_name, text in _iter_slide_text(slide):
+                    yield slide_no, shape_name, text
+            finally:
+                slide.close()
+    finally:
+        pkg.close()
+
+
+def _iter_slide_text(slide):
+    """
+    Generate a ``(shape_name, text)`` pair for each non-empty paragraph in
+    the slide XML read from file-like *slide*.
+    """
+    root = etree.parse(slide).getroot()
+    for p in root.iter(_a_p):
+        text = u''.join([u'\n' if elm.tag == _a_br else (elm.text or u'')
+                         for elm in p.iter(_a_t, _a_br)])
+        if not text:
+            continue
+        shape = p.getparent()
+        while shape is not None and shape.tag not in _shape_tags:
+            shape = shape.getparent()
+        # cNvPr is the first child of the shape's first child, e.g.
+        # p:sp/p:nvSpPr/p:cNvPr
+        shape_name = None if shape is None else shape[0][0].get('name')
+        yield shape_name, text
+
+
+def _slide_membernames(pkg):
+    """
+    Return the zip member names of the slide parts in *pkg*, in the order
+    their ``<p:sldId>`` elements appear in the presentation part.
+    """
+    pres_partname = _rel_targets(pkg, '/', RT_OFFICE_DOCUMENT)[0][1]
+    slide_partnames = dict(_rel_targets(pkg, pres_partname, RT_SLIDE))
+    pres_xml = pkg.open(pres_partname[1:])
+    try:
+        rIds = [elm.get(_r_id) for event, elm in
+                etree.iterparse(pres_xml, tag=_p_sldId)]
+    finally:
+        pres_xml.close()
+    return [slide_partnames[rId][1:] for rId in rIds]
+
+
+def _rel_targets(pkg, source_partname, reltype):
+    """
+    Return a list of ``(rId, partname)`` pairs, one for each relationship of
+    *reltype* from the part named *source_partname* (``'/'`` for the
+    package itself) to a part within *pkg*.
+    """
+    source_dir, source_name = posixpath.split(source_partname)
+    rels_membername = posixpath.join(
+        source_dir, '_rels', source_name + '.rels')[1:]
+    rels_xml = pkg.read(rels_membername)
+    targets = []
+    for rel in etree.fromstring(rels_xml).iterchildren(_pr_Relationship):
+        if rel.get('Type') != reltype or rel.get('TargetMode') == 'External':
+            continue
+        target = rel.get('Target')
+        if not target.startswith('/'):
+            target = posixpath.normpath(posixpath.join(source_dir, target))
+        targets.append((rel.get('Id'), target))
+    return targets
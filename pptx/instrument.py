@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+#
+# instrument.py
+#
+# This module is part of python-pptx and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+Opt-in instrumentation of the phases of opening and saving a presentation.
+A listener is any callable taking an |Event|; while at least one is
+registered, each instrumented phase reports its elapsed time to every
+listener, e.g.::
+
+    stats = PhaseStats()
+    with listening(stats):
+        prs.save('deck.pptx')
+    stats.summary['save.compress']  # {'count': 31, 'total': 0.012, ...}
+
+The phases, which nest as shown, are:
+
+``open``
+    Opening a presentation, ``Presentation(file)``.
+``open.zip_read``
+    Reading one part out of the package, once per part.
+``open.xml_parse``
+    Parsing one XML item, either a package-level item such as a rels item
+    or the content types item, or a part's XML as the model is built.
+``open.model_build``
+    Building the presentation object model from the parts read.
+``save``
+    Saving a presentation, ``Presentation.save(file)``.
+``save.marshal``
+    Serializing every part of the model ready to be written.
+``save.serialize``
+    Serializing one part, once per part.
+``save.content_types``
+    Composing the ``[Content_Types].xml`` item.
+``save.compress``
+    Compressing one item into the zip package, once per item.
+
+Per-item events carry the item's ``partname`` and, once known, its size in
+``bytes`` in :attr:`Event.detail`. With no listener registered a phase costs
+a function call, so instrumentation can be left in place in production.
+
+:func:`enable_tracing` turns the events into log records of the
+``pptx.trace`` logger, each carrying its |Event| as the record's
+``pptx_event`` attribute for handlers that want structured data.
+"""
+
+import logging
+import threading
+
+from timeit import default_timer
+
+
+# registered listeners; replaced rather than mutated, so a phase ending in
+# one thread can iterate over it while another thread registers a listener
+_listeners = ()
+_listeners_lock = threading.Lock()
+
+# listener registered by enable_tracing(), if any
+_trace_listener = None
+
+trace_log = logging.getLogger('pptx.trace')
+
+
+class Event(object):
+    """
+    Report of one completed instrumented phase, passed to each listener.
+
+    .. attribute:: name
+
+       Name of the phase, e.g. ``'save.compress'``.
+
+    .. attribute:: elapsed
+
+       Wall-clock duration of the phase in seconds.
+
+    .. attribute:: detail
+
+       Dict of phase-specific values, e.g. ``{'partname':
+       '/ppt/slides/slide1.xml', 'bytes': 2310}``; empty for most phases.
+    """
+    __slots__ = ('name', 'elapsed', 'detail')
+
+    def __init__(self, name, elapsed, detail):
+        super(Event, self).__init__()
+        self.name = name
+        self.elapsed = elapsed
+        self.detail = detail
+
+    def __repr__(self):
+        return '<Event %s %.6fs %r>' % (self.name, self.elapsed, self.detail)
+
+
+class PhaseStats(object):
+    """
+    Listener that aggregates the events it receives by phase name, for when
+    per-phase totals are all that's wanted.
+    """
+    def __init__(self):
+        super(PhaseStats, self).__init__()
+        self.__lock = threading.Lock()
+        self.__stats = {}
+
+    def __call__(self, event):
+        with self.__lock:
+            stats = self.__stats.get(event.name)
+            if stats is None:
+                stats = self.__stats[event.name] = {
+                    'count': 0, 'total': 0.0, 'min': event.elapsed,
+                    'max': event.elapsed}
+            stats['count'] += 1
+            stats['total'] += event.elapsed
+            stats['min'] = min(stats['min'], event.elapsed)
+            stats['max'] = max(stats['max'], event.elapsed)
+
+    @property
+    def summary(self):
+        """
+        Dict mapping the name of each phase seen to a dict of its event
+        ``'count'`` and the ``'total'``, ``'min'`` and ``'max'`` elapsed
+        seconds.
+        """
+        with self.__lock:
+            return dict((name, dict(stats))
+                        for name, stats in self.__stats.items())
+
+
+class LogListener(object):
+    """
+    Listener logging each event to *logger*, ``pptx.trace`` by default, at
+    *level*. The message is formatted only if the record is emitted, and the
+    |Event| is attached to the record as its ``pptx_event`` attribute.
+    """
+    def __init__(self, logger=None, level=logging.DEBUG):
+        super(LogListener, self).__init__()
+        self.__logger = trace_log if logger is None else logger
+        self.__level = level
+
+    def __call__(self, event):
+        logger = self.__logger
+        if logger.isEnabledFor(self.__level):
+            logger.log(self.__level, '%s %.6fs %r', event.name,
+                       event.elapsed, event.detail,
+                       extra={'pptx_event': event})
+
+
+class listening(object):
+    """
+    Context manager registering *listener* on entry and removing it on
+    exit.
+    """
+    def __init__(self, listener):
+        super(listening, self).__init__()
+        self.__listener = listener
+
+    def __enter__(self):
+        add_listener(self.__listener)
+        return self.__listener
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        remove_listener(self.__listener)
+        return False
+
+
+def add_listener(listener):
+    """
+    Register *listener*, a callable taking an |Event|, to be called at the
+    end of each instrumented phase, in whichever thread ran the phase.
+    """
+    global _listeners
+    with _listeners_lock:
+        _listeners = _listeners + (listener,)
+
+
+def remove_listener(listener):
+    """
+    Remove *listener*, registered with :func:`add_listener`. Raises
+    |ValueError| if *listener* isn't registered.
+    """
+    global _listeners
+    with _listeners_lock:
+        listeners = list(_listeners)
+        listeners.remove(listener)
+        _listeners = tuple(listeners)
+
+
+def enable_tracing(level=logging.DEBUG):
+    """
+    Start logging each instrumented phase to the ``pptx.trace`` logger at
+    *level* using a |LogListener|. Records are only seen once the
+    application has configured a handler and level for that logger. Does
+    nothing if tracing is already enabled.
+    """
+    global _trace_listener
+    if _trace_listener is not None:
+        return
+    _trace_listener = LogListener(level=level)
+    add_listener(_trace_listener)
+
+
+def disable_tracing():
+    """
+    Stop logging instrumented phases started by :func:`enable_tracing`.
+    """
+    global _trace_listener
+    if _trace_listener is None:
+        return
+    remove_listener(_trace_listener)
+    _trace_listener = None
+
+
+def phase(name, **detail):
+    """
+    Return a context manager timing the phase *name* and reporting it to
+    each registered listener when it ends, with *detail* as the event's
+    :attr:`Event.detail`. Values known only once the phase is under way can
+    be added with the ``set()`` method of the context manager, e.g.::
+
+        with phase('save.serialize', partname=partname) as ph:
+            blob = part._serialize()
+            ph.set(bytes=len(blob))
+
+    When no listener is registered a shared do-nothing context manager is
+    returned. An exception raised in a listener propagates to the caller.
+    """
+    if not _listeners:
+        return _null_phase
+    return _Phase(name, detail)
+
+
+class _Phase(object):
+    """
+    Context manager returned by :func:`phase` when a listener is registered.
+    """
+    __slots__ = ('__name', '__detail', '__start')
+
+    def __init__(self, name, detail):
+        self.__name = name
+        self.__detail = detail
+
+    def __enter__(self):
+        self.__start = default_timer()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = default_timer() - self.__start
+        event = Event(self.__name, elapsed, self.__detail)
+        for listener in _listeners:
+            listener(event)
+        return False
+
+    def set(self, **detail):
+        """Add the items in *detail* to the event's detail."""
+        self.__detail.update(detail)
+
+
+class _NullPhase(object):
+    """
+    Context manager returned by :func:`phase` when no listener is
+    registered, doing nothing.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set(self, **detail):
+        pass
+
+
+_null_phase = _NullPhase()
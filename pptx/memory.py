@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+#
+# memory.py
+#
+# This module is part of python-pptx and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+Report of the memory held by an open presentation, for finding what's
+retained in long-lived processes. Use :meth:`Presentation.memory_report`::
+
+    report = prs.memory_report()
+    report['totals']   # {'blob_bytes': 52341, 'tree_bytes': 310240, ...}
+    report['proxies']  # {'_Relationship': 61, '_ShapeCollection': 14, ...}
+
+Sizes of parsed XML trees are estimates, as libxml2 memory isn't visible to
+Python: a fixed cost per node, by default that of a 64-bit libxml2 build,
+plus the length of each text and attribute value. The data of a new chart
+is held outside its tree until the chart is saved, and is reported
+separately.
+"""
+
+import gc
+import sys
+import weakref
+
+from lxml import etree
+
+
+# estimated bytes allocated by libxml2 for each element or text node and
+# for each attribute, on a 64-bit build
+NODE_BYTES = 120
+ATTRIBUTE_BYTES = 96
+
+# containers followed when looking for the objects a package holds
+_container_types = (dict, list, tuple, set, frozenset)
+
+
+def memory_report(package):
+    """
+    Return a dict describing the memory held by |_Package| *package*:
+
+    ``'parts'``
+        List of a dict for each part, in package order, holding its
+        ``'partname'``, ``'content_type'``, ``'source_bytes'`` (size as read
+        from the package file, 0 for a part created since),
+        ``'blob_bytes'`` (size of the binary content held in memory),
+        ``'tree_bytes'`` (estimated size of its parsed XML tree),
+        ``'elements'`` (nodes in that tree), ``'deferred_points'`` and
+        ``'deferred_bytes'`` (number and estimated size of the data points
+        a new chart holds until it's saved, 0 for other parts),
+        ``'relationships'`` and ``'observers'``.
+    ``'totals'``
+        Dict of the sum of each of the numeric items over all parts.
+    ``'proxies'``
+        Dict mapping the class name of each kind of python-pptx object held
+        by the package, such as ``'_Relationship'`` or ``'_Shape'``, to the
+        number held. lxml element proxies held by them are counted as
+        ``'_Element'``.
+    ``'live_packages'``
+        Number of packages open in this process, including *package*, each
+        of which is retained until the last reference to it is dropped.
+    """
+    parts = [_part_report(part) for part in package._parts]
+    totals = {}
+    for part in parts:
+        for key, value in part.items():
+            if isinstance(value, (int, long)):
+                totals[key] = totals.get(key, 0) + value
+    return {
+        'parts':         parts,
+        'totals':        totals,
+        'proxies':       _proxy_counts(package),
+        'live_packages': len(type(package).instances()),
+    }
+
+
+def tree_bytes(element):
+    """
+    Return an ``(estimated_bytes, node_count)`` pair for the XML tree rooted
+    at *element*. Comments and processing instructions aren't counted.
+    """
+    nodes = 0
+    value_bytes = 0
+    attributes = 0
+    for elm in element.iter(tag=etree.Element):
+        nodes += 1
+        if elm.text:
+            nodes += 1
+            value_bytes += len(elm.text)
+        if elm.tail:
+            nodes += 1
+            value_bytes += len(elm.tail)
+        for value in elm.values():
+            attributes += 1
+            value_bytes += len(value)
+    # an attribute's value is held in a text node of its own
+    estimate = ((nodes + attributes) * NODE_BYTES +
+                attributes * ATTRIBUTE_BYTES + value_bytes)
+    return estimate, nodes
+
+
+def sequence_bytes(series):
+    """
+    Return the estimated bytes held by the sequence of values *series*: the
+    buffer of a NumPy array, or the list or tuple and each of the objects it
+    refers to. Objects shared with other sequences are counted in each.
+    """
+    nbytes = getattr(series, 'nbytes', None)
+    if nbytes is not None:
+        return nbytes
+    size = sys.getsizeof(series)
+    if isinstance(series, (list, tuple)):
+        size += sum([sys.getsizeof(value) for value in series])
+    return size
+
+
+def _part_report(part):
+    """Return the dict describing the memory held by *part*."""
+    blob = part._load_blob
+    estimate, nodes = (0, 0)
+    if part._element is not None:
+        estimate, nodes = tree_bytes(part._element)
+    deferred_series = getattr(part, '_deferred_series', [])
+    return {
+        'partname':        part.partname,
+        'content_type':    part._content_type,
+        'source_bytes':    part._source_bytes,
+        'blob_bytes':      len(blob) if blob is not None else 0,
+        'tree_bytes':      estimate,
+        'elements':        nodes,
+        'deferred_points': sum([len(series) for series in deferred_series]),
+        'deferred_bytes':  sum([sequence_bytes(series)
+                                for series in deferred_series]),
+        'relationships':   len(part._relationships),
+        'observers':       len(part._observers),
+    }
+
+
+def _proxy_counts(package):
+    """
+    Return a dict mapping class name to the number of instances of
+    python-pptx classes reachable from *package*, found by following the
+    references of those instances and of the built-in containers they
+    hold. Weak references aren't followed, as they don't retain anything.
+    """
+    counts = {}
+    seen = set([id(package)])
+    pending = [package]
+    while pending:
+        obj = pending.pop()
+        for referent in gc.get_referents(obj):
+            if id(referent) in seen:
+                continue
+            if isinstance(referent, etree._Element):
+                seen.add(id(referent))
+                counts['_Element'] = counts.get('_Element', 0) + 1
+                continue
+            if isinstance(referent, _container_types):
+                seen.add(id(referent))
+                pending.append(referent)
+                continue
+            cls = type(referent)
+            if (isinstance(referent, weakref.ref) or
+                    not cls.__module__.startswith('pptx.')):
+                continue
+            seen.add(id(referent))
+            counts[cls.__name__] = counts.get(cls.__name__, 0) + 1
+            pending.append(referent)
+    return counts
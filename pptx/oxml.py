@@ -13,18 +13,25 @@ access to the XML elements. Classes are implemented as a wrapper around their
 bit of the lxml graph that spans the entire Open XML package part, e.g. a
 slide.
 """
-import string
+import os
 import re
+import threading
 
-from datetime import datetime, timedelta
+from copy import copy, deepcopy
+from datetime import date, datetime, timedelta
+from itertools import islice
+from numbers import Number
+from xml.sax.saxutils import escape
 
 from lxml import etree, objectify
 
-from pptx.spec import nsmap
+from pptx.constants import XL_CHART_TYPE as XL
+from pptx.spec import chart_types, nsmap
 from pptx.spec import (
     PH_ORIENT_HORZ, PH_SZ_FULL, PH_TYPE_BODY, PH_TYPE_CTRTITLE, PH_TYPE_OBJ,
     PH_TYPE_SUBTITLE, PH_TYPE_TITLE
 )
+from pptx.util import column_letters
 
 # import logging
 # log = logging.getLogger('pptx.oxml')
@@ -32,13 +39,55 @@ from pptx.spec import (
 
 # oxml-specific constants --------------
 XSD_TRUE = '1'
+# number format of date categories, in chart XML and embedded worksheet
+DATE_FORMAT_CODE = 'yyyy\\-mm\\-dd'
 
 
-# configure objectified XML parser
-fallback_lookup = objectify.ObjectifyElementClassLookup()
+class _OxmlElement(etree.ElementBase):
+    """
+    Base class for oxml elements when the ``'etree'`` backend is selected.
+    Provides the few ``ObjectifiedElement`` methods oxml code relies on, so
+    custom element classes work unchanged on either backend.
+    """
+    def _setText(self, text):
+        """Set the text of this element to *text*."""
+        self.text = text
+
+
+# select element class backend. The default 'objectify' backend makes every
+# element an ObjectifiedElement; the 'etree' backend uses plain
+# etree.ElementBase classes, skipping objectify's per-element type lookup.
+# oxml code accesses child elements explicitly, so works on either backend.
+OXML_BACKEND = os.environ.get('PPTX_OXML_BACKEND', 'objectify')
+
+if OXML_BACKEND == 'objectify':
+    BaseOxmlElement = objectify.ObjectifiedElement
+    fallback_lookup = objectify.ObjectifyElementClassLookup()
+elif OXML_BACKEND == 'etree':
+    BaseOxmlElement = _OxmlElement
+    fallback_lookup = etree.ElementDefaultClassLookup(element=_OxmlElement)
+else:
+    tmpl = "PPTX_OXML_BACKEND must be 'objectify' or 'etree', got '%s'"
+    raise ValueError(tmpl % OXML_BACKEND)
+
+# configure oxml parser. lxml locks a parser while it parses, so a parser
+# shared between threads would serialize their parsing; each thread gets a
+# parser of its own instead.
 element_class_lookup = etree.ElementNamespaceClassLookup(fallback_lookup)
-oxml_parser = etree.XMLParser(remove_blank_text=True)
-oxml_parser.set_element_class_lookup(element_class_lookup)
+_thread_local = threading.local()
+
+
+def _oxml_parser():
+    """
+    Return the oxml parser of the current thread, creating it on first use.
+    """
+    try:
+        return _thread_local.parser
+    except AttributeError:
+        parser = etree.XMLParser(remove_blank_text=True)
+        parser.set_element_class_lookup(element_class_lookup)
+        _thread_local.parser = parser
+        return parser
 
 
 # ============================================================================
@@ -46,15 +95,30 @@ oxml_parser.set_element_class_lookup(element_class_lookup)
 # ============================================================================
 
 def _Element(tag, nsmap=None):
-    return oxml_parser.makeelement(qn(tag), nsmap=nsmap)
+    """
+    Return a new element having *tag*, e.g. ``'a:p'``. If *nsmap* is |None|,
+    only the namespace of *tag* itself is declared, so the element carries no
+    stray namespace declarations when it's added to a part tree.
+    """
+    if nsmap is None:
+        nsmap = _tag_nsmap(tag)
+    return _oxml_parser().makeelement(qn(tag), nsmap=nsmap)
 
 
 def _SubElement(parent, tag, nsmap=None):
-    return objectify.SubElement(parent, qn(tag), nsmap=nsmap)
+    return etree.SubElement(parent, qn(tag), nsmap=nsmap)
 
 
 def new(tag, **extra):
-    return objectify.Element(qn(tag), **extra)
+    """
+    Return a new element having *tag*, e.g. ``'c:numRef'``, with attributes
+    specified in *extra*. Unlike ``objectify.Element()``, no ``py:pytype``
+    annotation is added.
+    """
+    elm = _Element(tag)
+    for name, value in extra.items():
+        elm.set(name, value)
+    return elm
 
 
 def nsdecls(*prefixes):
@@ -63,19 +127,23 @@ def nsdecls(*prefixes):
 
 def oxml_fromstring(text):
     """``etree.fromstring()`` replacement that uses oxml parser"""
-    return objectify.fromstring(text, oxml_parser)
+    return etree.fromstring(text, _oxml_parser())
 
 
 def oxml_parse(source):
     """``etree.parse()`` replacement that uses oxml parser"""
-    return objectify.parse(source, oxml_parser)
+    return etree.parse(source, _oxml_parser())
 
 
 def oxml_tostring(elm, encoding=None, pretty_print=False, standalone=None):
-    # if xsi parameter is not set to False, PowerPoint won't load without a
-    # repair step; deannotate removes some original xsi:type tags in core.xml
-    # if this parameter is left out (or set to True)
-    objectify.deannotate(elm, xsi=False, cleanup_namespaces=True)
+    """
+    ``etree.tostring()`` replacement for serializing an oxml element that has
+    been built or modified in isolation, removing any namespace declarations
+    it doesn't use. No deannotate pass is required; oxml elements are never
+    annotated in the first place (see :func:`_set_child_text`). Parts are
+    saved with a plain ``etree.tostring()`` call, without this cleanup pass.
+    """
+    etree.cleanup_namespaces(elm)
     return etree.tostring(elm, encoding=encoding, pretty_print=pretty_print,
                           standalone=standalone)
 
@@ -85,28 +153,41 @@ def qn(tag):
     Stands for "qualified name", a utility function to turn a namespace
     prefixed tag name into a Clark-notation qualified tag name for lxml. For
     example, ``qn('p:cSld')`` returns ``'{http://schemas.../main}cSld'``.
+    Results are memoized as qn() is called in tight loops.
     """
-    prefix, tagroot = tag.split(':')
-    uri = nsmap[prefix]
-    return '{%s}%s' % (uri, tagroot)
+    try:
+        return _qn_cache[tag]
+    except KeyError:
+        prefix, tagroot = tag.split(':')
+        uri = nsmap[prefix]
+        clark_name = _qn_cache[tag] = '{%s}%s' % (uri, tagroot)
+        return clark_name
 
 
 def sub_elm(parent, tag, **extra):
-    return objectify.SubElement(parent, qn(tag), **extra)
+    return etree.SubElement(parent, qn(tag), **extra)
 
 
 # ============================================================================
 # utility functions
 # ============================================================================
 
+# memo of Clark names returned by qn(), keyed by prefixed tag name. Like
+# _xpath_cache below, entries are only ever added, each with a single dict
+# assignment the GIL makes atomic, so no lock is needed between threads.
+_qn_cache = {}
+
+# compiled XPath objects returned by _xpath(), keyed by expression; lxml
+# serializes calls to a compiled XPath object, so they can be shared
+_xpath_cache = {}
+
+
 def _child(element, child_tagname):
     """
     Return direct child of *element* having *child_tagname* or |None|
     if no such child element is present.
     """
-    xpath = './%s' % child_tagname
-    matching_children = element.xpath(xpath, namespaces=nsmap)
-    return matching_children[0] if len(matching_children) else None
+    return element.find(qn(child_tagname))
 
 
 def _child_list(element, child_tagname):
@@ -114,8 +195,56 @@ def _child_list(element, child_tagname):
     Return list containing the direct children of *element* having
     *child_tagname*.
     """
-    xpath = './%s' % child_tagname
-    return element.xpath(xpath, namespaces=nsmap)
+    return element.findall(qn(child_tagname))
+
+
+def _xpath(expr):
+    """
+    Return a compiled ``etree.XPath`` object for *expr*, which can use any of
+    the namespace prefixes in ``pptx.spec.nsmap``. Compiled objects are
+    cached, so the expression is compiled only once, e.g.
+    ``_xpath('./a:r')(p)`` returns the runs in paragraph *p*.
+    """
+    try:
+        return _xpath_cache[expr]
+    except KeyError:
+        xpath = _xpath_cache[expr] = etree.XPath(expr, namespaces=nsmap)
+        return xpath
+
+
+def _set_child_text(parent, tag, text):
+    """
+    Set the text of the *tag* child of *parent* to *text*, adding the child
+    if not present, and return the child. Unlike objectify attribute
+    assignment (e.g. ``parent.v = text``), no ``py:pytype`` annotation is
+    added, so the tree doesn't need to be deannotated before it's saved.
+    """
+    child = _child(parent, tag)
+    if child is None:
+        child = _SubElement(parent, tag)
+    child._setText(_to_text(text))
+    return child
+
+
+def _to_text(value):
+    """
+    Return *value* as a string suitable for use as XML element text. Floats
+    are rendered with ``repr()`` so no precision is lost.
+    """
+    if isinstance(value, basestring):
+        return value
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def _tag_nsmap(tag):
+    """
+    Return a namespace map containing only the namespace of the prefixed
+    *tag*, e.g. ``{'a': 'http://...'}`` for ``'a:p'``.
+    """
+    prefix = tag.split(':')[0]
+    return {prefix: nsmap[prefix]}
 
 
 def _get_or_add(start_elm, *path_tags):
@@ -129,7 +258,7 @@ def _get_or_add(start_elm, *path_tags):
     for tag in path_tags:
         child = _child(parent, tag)
         if child is None:
-            child = _SubElement(parent, tag, nsmap)
+            child = _SubElement(parent, tag)
         parent = child
     return child
 
@@ -138,7 +267,7 @@ def _get_or_add(start_elm, *path_tags):
 # Custom element classes
 # ============================================================================
 
-class CT_CoreProperties(objectify.ObjectifiedElement):
+class CT_CoreProperties(BaseOxmlElement):
     """
     ``<cp:coreProperties>`` element, the root element of the Core Properties
     part stored as ``/docProps/core.xml``. Implements many of the Dublin Core
@@ -205,19 +334,19 @@ class CT_CoreProperties(objectify.ObjectifiedElement):
     def __get_str_prop(self, name):
         """Return string value of *name* property."""
         # explicit class reference avoids another pass through getattribute
-        tag = qn(CT_CoreProperties._str_tags[name])
-        if not hasattr(self, tag):
+        elm = _child(self, CT_CoreProperties._str_tags[name])
+        if elm is None:
             return ''
-        return getattr(self, tag).text
+        return elm.text
 
     def __get_date_prop(self, name):
         """Return datetime value of *name* property."""
         # explicit class reference avoids another pass through getattribute
-        tag = qn(CT_CoreProperties._date_tags[name])
+        elm = _child(self, CT_CoreProperties._date_tags[name])
         # date properties return None when property element not present
-        if not hasattr(self, tag):
+        if elm is None:
             return None
-        datetime_str = getattr(self, tag).text
+        datetime_str = elm.text
         try:
             return self._parse_W3CDTF_to_datetime(datetime_str)
         except ValueError:
@@ -226,11 +355,11 @@ class CT_CoreProperties(objectify.ObjectifiedElement):
 
     def __get_revision(self):
         """Return integer value of revision property."""
-        tag = qn('cp:revision')
+        elm = _child(self, 'cp:revision')
         # revision returns zero when element not present
-        if not hasattr(self, tag):
+        if elm is None:
             return 0
-        revision_str = getattr(self, tag).text
+        revision_str = elm.text
         try:
             revision = int(revision_str)
         except ValueError:
@@ -248,8 +377,7 @@ class CT_CoreProperties(objectify.ObjectifiedElement):
             tmpl = ("exceeded 255 char max length of property '%s', got:"
                     "\n\n'%s'")
             raise ValueError(tmpl % (name, value))
-        tag = qn(CT_CoreProperties._str_tags[name])
-        setattr(self, tag, value)
+        _set_child_text(self, CT_CoreProperties._str_tags[name], value)
 
     def __set_date_prop(self, name, value):
         """Set datetime value of *name* property to *value*"""
@@ -258,16 +386,15 @@ class CT_CoreProperties(objectify.ObjectifiedElement):
                     "t, got %s")
             raise ValueError(tmpl % (name, type(value)))
         tagname = CT_CoreProperties._date_tags[name]
-        tag = qn(tagname)
         dt_str = value.strftime('%Y-%m-%dT%H:%M:%SZ')
-        setattr(self, tag, dt_str)
+        elm = _set_child_text(self, tagname, dt_str)
         if name in ('created', 'modified'):
             # these two require an explicit 'xsi:type' attribute
             # first and last line are a hack required to add the xsi
             # namespace to the root element rather than each child element
             # in which it is referenced
             self.set(qn('xsi:foo'), 'bar')
-            self[tag].set(qn('xsi:type'), 'dcterms:W3CDTF')
+            elm.set(qn('xsi:type'), 'dcterms:W3CDTF')
             del self.attrib[qn('xsi:foo')]
 
     def __set_revision(self, value):
@@ -275,8 +402,7 @@ class CT_CoreProperties(objectify.ObjectifiedElement):
         if not isinstance(value, int) or value < 1:
             tmpl = "revision property requires positive int, got '%s'"
             raise ValueError(tmpl % value)
-        tag = qn('cp:revision')
-        setattr(self, tag, str(value))
+        _set_child_text(self, 'cp:revision', str(value))
 
     _offset_pattern = re.compile('([+-])(\d\d):(\d\d)')
 
@@ -329,7 +455,7 @@ class CT_CoreProperties(objectify.ObjectifiedElement):
         return dt
 
 
-class CT_GraphicalObjectFrame(objectify.ObjectifiedElement):
+class CT_GraphicalObjectFrame(BaseOxmlElement):
     """
     ``<p:graphicFrame>`` element, which is a container for a table, a chart,
     or another graphical object.
@@ -360,7 +486,8 @@ class CT_GraphicalObjectFrame(objectify.ObjectifiedElement):
     @property
     def has_table(self):
         """True if graphicFrame contains a table, False otherwise"""
-        datatype = self[qn('a:graphic')].graphicData.get('uri')
+        graphicData = _child(_child(self, 'a:graphic'), 'a:graphicData')
+        datatype = graphicData.get('uri')
         if datatype == CT_GraphicalObjectFrame.DATATYPE_TABLE:
             return True
         return False
@@ -375,8 +502,6 @@ class CT_GraphicalObjectFrame(objectify.ObjectifiedElement):
         xml = CT_GraphicalObjectFrame._graphicFrame_tmpl % (
             id_, name, left, top, width, height)
         graphicFrame = oxml_fromstring(xml)
-
-        objectify.deannotate(graphicFrame, cleanup_namespaces=True)
         return graphicFrame
 
     @staticmethod
@@ -389,13 +514,13 @@ class CT_GraphicalObjectFrame(objectify.ObjectifiedElement):
             id_, name, left, top, width, height)
 
         # set type of contained graphic to table
-        graphicData = graphicFrame[qn('a:graphic')].graphicData
+        graphic = _child(graphicFrame, 'a:graphic')
+        graphicData = _child(graphic, 'a:graphicData')
         graphicData.set('uri', CT_GraphicalObjectFrame.DATATYPE_TABLE)
 
         # add tbl element tree
         tbl = CT_Table.new_tbl(rows, cols, width, height)
         graphicData.append(tbl)
-        objectify.deannotate(graphicFrame, cleanup_namespaces=True)
         return graphicFrame
     #Code added by Hussain for new chart in graphic frame
     
@@ -416,10 +541,12 @@ class CT_GraphicalObjectFrame(objectify.ObjectifiedElement):
             id_, name, left, top, width, height)
 
         # set type of contained graphic to table
-        graphicData = graphicFrame[qn('a:graphic')].graphicData
+        graphic = _child(graphicFrame, 'a:graphic')
+        graphicData = _child(graphic, 'a:graphicData')
         graphicData.set('uri', CT_GraphicalObjectFrame.DATATYPE_CHART)
         
-        styleData  = graphicFrame[qn('p:nvGraphicFramePr')].nvPr
+        nvGraphicFramePr = _child(graphicFrame, 'p:nvGraphicFramePr')
+        styleData = _child(nvGraphicFramePr, 'p:nvPr')
         
         s1 = sub_elm(styleData,'p:extLst')
         s1 = sub_elm(s1,'p:ext')
@@ -443,23 +570,21 @@ class CT_GraphicalObjectFrame(objectify.ObjectifiedElement):
         return graphicFrame
 #Code added by hussain for CT_CHART in the slides.xml file
 
-class CT_Chart(objectify.ObjectifiedElement):
+class CT_Chart(BaseOxmlElement):
     _chart_tmpl = (
         '<c:chart xmlns:c="http://schemas.openxmlformats.org/drawingml/2006/chart" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" r:id="%s"/>' % ('%s')
     )
     @staticmethod
     def new_chart(rId):
-        print rId
-       
+        """
+        Return a new ``<c:chart>`` element referring to the chart part
+        related by *rId*.
+        """
         xml = CT_Chart._chart_tmpl % rId
-        chrt = oxml_fromstring(xml) 
-        
-        #objectify.deannotate(chrt, cleanup_namespaces=True)
-        #chartXML = etree.tostring(chrt, pretty_print=True,xml_declaration = True, encoding='UTF-8', standalone="yes")
-        #print chartXML
+        chrt = oxml_fromstring(xml)
         return chrt
 
-class CT_Picture(objectify.ObjectifiedElement):
+class CT_Picture(BaseOxmlElement):
     """
     ``<p:pic>`` element, which represents a picture shape (an image placement
     on a slide).
@@ -501,12 +626,10 @@ class CT_Picture(objectify.ObjectifiedElement):
         xml = CT_Picture._pic_tmpl % (id_, name, desc, rId,
                                       left, top, width, height)
         pic = oxml_fromstring(xml)
-
-        objectify.deannotate(pic, cleanup_namespaces=True)
         return pic
 
 
-class CT_PresetGeometry2D(objectify.ObjectifiedElement):
+class CT_PresetGeometry2D(BaseOxmlElement):
     """<a:prstGeom> custom element class"""
     @property
     def gd(self):
@@ -514,11 +637,10 @@ class CT_PresetGeometry2D(objectify.ObjectifiedElement):
         Sequence containing the ``gd`` element children of ``<a:avLst>``
         child element, empty if none are present.
         """
-        try:
-            gd_elms = tuple([gd for gd in self.avLst.gd])
-        except AttributeError:
-            gd_elms = ()
-        return gd_elms
+        avLst = _child(self, 'a:avLst')
+        if avLst is None:
+            return ()
+        return tuple(_child_list(avLst, 'a:gd'))
 
     @property
     def prst(self):
@@ -530,20 +652,18 @@ class CT_PresetGeometry2D(objectify.ObjectifiedElement):
         Remove any ``<a:gd>`` element children of ``<a:avLst>`` and replace
         them with ones having (name, val) in *guides*.
         """
-        try:
-            avLst = self.avLst
-        except AttributeError:
+        avLst = _child(self, 'a:avLst')
+        if avLst is None:
             avLst = _SubElement(self, 'a:avLst')
-        if hasattr(self.avLst, 'gd'):
-            for gd_elm in self.avLst.gd[:]:
-                avLst.remove(gd_elm)
+        for gd_elm in _child_list(avLst, 'a:gd'):
+            avLst.remove(gd_elm)
         for name, val in guides:
             gd = _SubElement(avLst, 'a:gd')
             gd.set('name', name)
             gd.set('fmla', 'val %d' % val)
 
 
-class CT_Shape(objectify.ObjectifiedElement):
+class CT_Shape(BaseOxmlElement):
     """<p:sp> custom element class"""
     _autoshape_sp_tmpl = (
         '<p:sp %s>\n'
@@ -631,10 +751,10 @@ class CT_Shape(objectify.ObjectifiedElement):
         has a ``<a:prstGeom>`` element and does not have a txBox="1" attribute
         on cNvSpPr.
         """
-        prstGeom = _child(self.spPr, 'a:prstGeom')
+        prstGeom = _child(_child(self, 'p:spPr'), 'a:prstGeom')
         if prstGeom is None:
             return False
-        txBox = self.nvSpPr.cNvSpPr.get('txBox')
+        txBox = self.cNvSpPr.get('txBox')
         if txBox in ('true', '1'):
             return False
         return True
@@ -645,11 +765,16 @@ class CT_Shape(objectify.ObjectifiedElement):
         True if this shape is a text box. A shape is a text box if it has a
         txBox="1" attribute on cNvSpPr.
         """
-        txBox = self.nvSpPr.cNvSpPr.get('txBox')
+        txBox = self.cNvSpPr.get('txBox')
         if txBox in ('true', '1'):
             return True
         return False
 
+    @property
+    def cNvSpPr(self):
+        """``<p:cNvSpPr>`` element, required in every ``<p:sp>``."""
+        return _child(_child(self, 'p:nvSpPr'), 'p:cNvSpPr')
+
     @staticmethod
     def new_autoshape_sp(id_, name, prst, left, top, width, height):
         """
@@ -658,7 +783,6 @@ class CT_Shape(objectify.ObjectifiedElement):
         xml = CT_Shape._autoshape_sp_tmpl % (id_, name, left, top,
                                              width, height, prst)
         sp = oxml_fromstring(xml)
-        objectify.deannotate(sp, cleanup_namespaces=True)
         return sp
 
     @staticmethod
@@ -671,11 +795,11 @@ class CT_Shape(objectify.ObjectifiedElement):
         sp = oxml_fromstring(xml)
 
         # placeholder shapes get a "no group" lock
-        _SubElement(sp.nvSpPr.cNvSpPr, 'a:spLocks')
-        sp.nvSpPr.cNvSpPr[qn('a:spLocks')].set('noGrp', '1')
+        spLocks = _SubElement(sp.cNvSpPr, 'a:spLocks')
+        spLocks.set('noGrp', '1')
 
         # placeholder (ph) element attributes values vary by type
-        ph = _SubElement(sp.nvSpPr.nvPr, 'p:ph')
+        ph = _SubElement(_child(_child(sp, 'p:nvSpPr'), 'p:nvPr'), 'p:ph')
         if ph_type != PH_TYPE_OBJ:
             ph.set('type', ph_type)
         if orient != PH_ORIENT_HORZ:
@@ -691,8 +815,6 @@ class CT_Shape(objectify.ObjectifiedElement):
 
         if ph_type in placeholder_types_that_have_a_text_frame:
             sp.append(CT_TextBody.new_txBody())
-
-        objectify.deannotate(sp, cleanup_namespaces=True)
         return sp
 
     @staticmethod
@@ -703,7 +825,6 @@ class CT_Shape(objectify.ObjectifiedElement):
         """
         xml = CT_Shape._textbox_sp_tmpl % (id_, name, left, top, width, height)
         sp = oxml_fromstring(xml)
-        objectify.deannotate(sp, cleanup_namespaces=True)
         return sp
 
     @property
@@ -712,7 +833,7 @@ class CT_Shape(objectify.ObjectifiedElement):
         Value of ``prst`` attribute of ``<a:prstGeom>`` element or |None| if
         not present.
         """
-        prstGeom = _child(self.spPr, 'a:prstGeom')
+        prstGeom = _child(_child(self, 'p:spPr'), 'a:prstGeom')
         if prstGeom is None:
             return None
         return prstGeom.get('prst')
@@ -723,10 +844,10 @@ class CT_Shape(objectify.ObjectifiedElement):
         Reference to ``<a:prstGeom>`` child element or |None| if this shape
         doesn't have one, for example, if it's a placeholder shape.
         """
-        return _child(self.spPr, 'a:prstGeom')
+        return _child(_child(self, 'p:spPr'), 'a:prstGeom')
 
 
-class CT_Table(objectify.ObjectifiedElement):
+class CT_Table(BaseOxmlElement):
     """``<a:tbl>`` custom element class"""
     _tbl_tmpl = (
         '<a:tbl %s>\n'
@@ -769,9 +890,10 @@ class CT_Table(objectify.ObjectifiedElement):
         child element. Defaults to False if *propname* attribute is missing
         or ``<a:tblPr>`` element itself is not present.
         """
-        if not self.has_tblPr:
+        tblPr = _child(self, 'a:tblPr')
+        if tblPr is None:
             return False
-        return self.tblPr.get(propname) in ('1', 'true')
+        return tblPr.get(propname) in ('1', 'true')
 
     def _set_boolean_property(self, propname, value):
         """
@@ -782,13 +904,14 @@ class CT_Table(objectify.ObjectifiedElement):
         attribute is removed if present, allowing its default value of False
         to be its effective value.
         """
+        tblPr = _child(self, 'a:tblPr')
         if value:
             tblPr = self._get_or_insert_tblPr()
             tblPr.set(propname, XSD_TRUE)
-        elif not self.has_tblPr:
+        elif tblPr is None:
             pass
-        elif propname in self.tblPr.attrib:
-            del self.tblPr.attrib[propname]
+        elif propname in tblPr.attrib:
+            del tblPr.attrib[propname]
 
     @property
     def has_tblPr(self):
@@ -796,18 +919,15 @@ class CT_Table(objectify.ObjectifiedElement):
         True if this ``<a:tbl>`` element has a ``<a:tblPr>`` child element,
         False otherwise.
         """
-        try:
-            self.tblPr
-            return True
-        except AttributeError:
-            return False
+        return _child(self, 'a:tblPr') is not None
 
     def _get_or_insert_tblPr(self):
         """Return tblPr child element, inserting a new one if not present"""
-        if not self.has_tblPr:
+        tblPr = _child(self, 'a:tblPr')
+        if tblPr is None:
             tblPr = _Element('a:tblPr')
             self.insert(0, tblPr)
-        return self.tblPr
+        return tblPr
 
     @staticmethod
     def new_tbl(rows, cols, width, height, tableStyleId=None):
@@ -822,12 +942,13 @@ class CT_Table(objectify.ObjectifiedElement):
         # add specified number of rows and columns
         rowheight = height/rows
         colwidth = width/cols
+        tblGrid = _child(tbl, 'a:tblGrid')
 
         for col in range(cols):
             # adjust width of last col to absorb any div error
             if col == cols-1:
                 colwidth = width - ((cols-1) * colwidth)
-            sub_elm(tbl.tblGrid, 'a:gridCol', w=str(colwidth))
+            sub_elm(tblGrid, 'a:gridCol', w=str(colwidth))
 
         for row in range(rows):
             # adjust height of last row to absorb any div error
@@ -836,12 +957,10 @@ class CT_Table(objectify.ObjectifiedElement):
             tr = sub_elm(tbl, 'a:tr', h=str(rowheight))
             for col in range(cols):
                 tr.append(CT_TableCell.new_tc())
-
-        objectify.deannotate(tbl, cleanup_namespaces=True)
         return tbl
 
 
-class CT_TableCell(objectify.ObjectifiedElement):
+class CT_TableCell(BaseOxmlElement):
     """``<a:tc>`` custom element class"""
     _tc_tmpl = (
         '<a:tc %s>\n'
@@ -859,7 +978,6 @@ class CT_TableCell(objectify.ObjectifiedElement):
         """Return a new ``<a:tc>`` element tree"""
         xml = CT_TableCell._tc_tmpl
         tc = oxml_fromstring(xml)
-        objectify.deannotate(tc, cleanup_namespaces=True)
         return tc
 
     @property
@@ -868,9 +986,10 @@ class CT_TableCell(objectify.ObjectifiedElement):
         String held in ``anchor`` attribute of ``<a:tcPr>`` child element of
         this ``<a:tc>`` element.
         """
-        if not hasattr(self, 'tcPr'):
+        tcPr = _child(self, 'a:tcPr')
+        if tcPr is None:
             return None
-        return self.tcPr.get('anchor')
+        return tcPr.get('anchor')
 
     def _set_anchor(self, anchor):
         """
@@ -878,29 +997,27 @@ class CT_TableCell(objectify.ObjectifiedElement):
         """
         if anchor is None:
             return self._clear_anchor()
-        if not hasattr(self, 'tcPr'):
-            tcPr = _Element('a:tcPr')
-            idx = 1 if hasattr(self, 'txBody') else 0
-            self.insert(idx, tcPr)
-        self.tcPr.set('anchor', anchor)
+        self._get_or_insert_tcPr().set('anchor', anchor)
 
     def _clear_anchor(self):
         """
         Remove anchor attribute from ``<a:tcPr>`` if it exists and remove
         ``<a:tcPr>`` element if it then has no attributes.
         """
-        if not hasattr(self, 'tcPr'):
+        tcPr = _child(self, 'a:tcPr')
+        if tcPr is None:
             return
-        if 'anchor' in self.tcPr.attrib:
-            del self.tcPr.attrib['anchor']
-        if len(self.tcPr.attrib) == 0:
-            self.remove(self.tcPr)
+        if 'anchor' in tcPr.attrib:
+            del tcPr.attrib['anchor']
+        if len(tcPr.attrib) == 0:
+            self.remove(tcPr)
 
     def __get_marX(self, attr_name, default):
         """generalized method to get margin values"""
-        if not hasattr(self, 'tcPr'):
+        tcPr = _child(self, 'a:tcPr')
+        if tcPr is None:
             return default
-        return int(self.tcPr.get(attr_name, default))
+        return int(tcPr.get(attr_name, default))
 
     @property
     def marT(self):
@@ -938,23 +1055,29 @@ class CT_TableCell(objectify.ObjectifiedElement):
         """
         if value is None:
             return self.__clear_marX(marX)
-        if not hasattr(self, 'tcPr'):
-            tcPr = _Element('a:tcPr')
-            idx = 1 if hasattr(self, 'txBody') else 0
-            self.insert(idx, tcPr)
-        self.tcPr.set(marX, str(value))
+        self._get_or_insert_tcPr().set(marX, str(value))
 
     def __clear_marX(self, marX):
         """
         Remove marX attribute from ``<a:tcPr>`` if it exists and remove
         ``<a:tcPr>`` element if it then has no attributes.
         """
-        if not hasattr(self, 'tcPr'):
+        tcPr = _child(self, 'a:tcPr')
+        if tcPr is None:
             return
-        if marX in self.tcPr.attrib:
-            del self.tcPr.attrib[marX]
-        if len(self.tcPr.attrib) == 0:
-            self.remove(self.tcPr)
+        if marX in tcPr.attrib:
+            del tcPr.attrib[marX]
+        if len(tcPr.attrib) == 0:
+            self.remove(tcPr)
+
+    def _get_or_insert_tcPr(self):
+        """Return tcPr child element, inserting a new one if not present"""
+        tcPr = _child(self, 'a:tcPr')
+        if tcPr is None:
+            tcPr = _Element('a:tcPr')
+            idx = 0 if _child(self, 'a:txBody') is None else 1
+            self.insert(idx, tcPr)
+        return tcPr
 
     def __setattr__(self, attr, value):
         """
@@ -970,7 +1093,7 @@ class CT_TableCell(objectify.ObjectifiedElement):
             super(CT_TableCell, self).__setattr__(attr, value)
 
 
-class CT_TextBody(objectify.ObjectifiedElement):
+class CT_TextBody(BaseOxmlElement):
     """<p:txBody> custom element class"""
     _txBody_tmpl = (
         '<p:txBody %s>\n'
@@ -985,20 +1108,20 @@ class CT_TextBody(objectify.ObjectifiedElement):
         """Return a new ``<p:txBody>`` element tree"""
         xml = CT_TextBody._txBody_tmpl
         txBody = oxml_fromstring(xml)
-        objectify.deannotate(txBody, cleanup_namespaces=True)
         return txBody
 
 
-class CT_TextParagraph(objectify.ObjectifiedElement):
+class CT_TextParagraph(BaseOxmlElement):
     """<a:p> custom element class"""
     def get_algn(self):
         """
         Paragraph horizontal alignment value, like ``TAT.CENTER``. Value of
         algn attribute on <a:pPr> child element
         """
-        if not hasattr(self, 'pPr'):
+        pPr = _child(self, 'a:pPr')
+        if pPr is None:
             return None
-        return self.pPr.get('algn')
+        return pPr.get('algn')
 
     def set_algn(self, value):
         """
@@ -1006,22 +1129,24 @@ class CT_TextParagraph(objectify.ObjectifiedElement):
         """
         if value is None:
             return self._clear_algn()
-        if not hasattr(self, 'pPr'):
+        pPr = _child(self, 'a:pPr')
+        if pPr is None:
             pPr = _Element('a:pPr')
             self.insert(0, pPr)
-        self.pPr.set('algn', value)
+        pPr.set('algn', value)
 
     def _clear_algn(self):
         """
         Remove algn attribute from ``<a:pPr>`` if it exists and remove
         ``<a:pPr>`` element if it then has no attributes.
         """
-        if not hasattr(self, 'pPr'):
+        pPr = _child(self, 'a:pPr')
+        if pPr is None:
             return
-        if 'algn' in self.pPr.attrib:
-            del self.pPr.attrib['algn']
-        if len(self.pPr.attrib) == 0:
-            self.remove(self.pPr)
+        if 'algn' in pPr.attrib:
+            del pPr.attrib['algn']
+        if len(pPr.attrib) == 0:
+            self.remove(pPr)
 
     # def __setattr__(self, attr, value):
     #     """
@@ -1038,7 +1163,7 @@ class CT_TextParagraph(objectify.ObjectifiedElement):
 #
 #
 #
-class CT_Chart_Container(objectify.ObjectifiedElement):
+class CT_Chart_Container(BaseOxmlElement):
     """
     ``<p:graphicFrame>`` element, which is a container for a table, a chart,
     or another graphical object.
@@ -1106,285 +1231,599 @@ class CT_Chart_Container(objectify.ObjectifiedElement):
     )
 
 
-    @staticmethod
-    def new_chart_wrapper(rId):
+    # parsed ``_chart_tmpl``, cloned for each new chart; assigned only once
+    # parsed, so threads racing to parse it at most duplicate the work
+    __chartSpace = None
 
-        xml = CT_Chart_Container._chart_tmpl % rId
-        graphicFrame = oxml_fromstring(xml)
+    @classmethod
+    def new_chart_wrapper(cls, rId):
+        """
+        Return a new ``<c:chartSpace>`` element having an empty plot area
+        and external data related by *rId*. The template is parsed just
+        once and the parsed skeleton cloned for each new chart.
+        """
+        if cls.__chartSpace is None:
+            cls.__chartSpace = oxml_fromstring(cls._chart_tmpl % '')
+        chartSpace = deepcopy(cls.__chartSpace)
+        _child(chartSpace, 'c:externalData').set(qn('r:id'), rId)
+        return chartSpace
 
-        objectify.deannotate(graphicFrame, cleanup_namespaces=True)
-        return graphicFrame
-    
-            
     @staticmethod
-    def edit_chart(xml):
+    def new_chart(data, headings_xlsx, rId, chart_type=XL.LINE,
+                  sources=None):
+        """
+        Return a new ``<c:chartSpace>`` element containing a chart of
+        *chart_type* whose external data is the workbook related by *rId*.
+        The first sequence in *data* holds the categories and each of the
+        rest the values of one series, headed in the workbook by the
+        corresponding string in *headings_xlsx*. If *sources* is a list, the
+        data caches are left empty and their points written later by
+        :meth:`write_chart`; see :meth:`CT_ChartCell.deferred_ref_node`.
+        Raises |ValueError| if the x values of a scatter chart aren't
+        numbers.
+        """
+        chartFrame = CT_Chart_Container.new_chart_wrapper(rId)
+        plotArea = _child(_child(chartFrame, 'c:chart'), 'c:plotArea')
+
+        # add plot and axes cloned from the chart type's prototypes
+        template = _ChartTemplate.get(chart_type, _is_date_series(data[0]))
+        plotArea.extend(template.new_plot(data, headings_xlsx, sources))
+        return chartFrame
 
-        chartFrame =objectify.fromstring(xml)
-        
+    @staticmethod
+    def write_chart(chartSpace, sources, stream, pretty_print=True):
+        """
+        Write *chartSpace* to file-like *stream* as a UTF-8 XML document,
+        writing the points of each deferred data cache from its series in
+        *sources* where the cache's placeholder comment is. The document is
+        written incrementally, an element at a time, and the points are
+        generated a chunk at a time and written as they are generated, so
+        neither the XML of the chart nor of a cache is ever all in memory at
+        once. Elements are written with a start and end tag even when empty.
+        """
+        if pretty_print:
+            # indenting a copy is cheap, the points aren't in the tree
+            chartSpace = deepcopy(chartSpace)
+            etree.indent(chartSpace)
+        with etree.xmlfile(stream, encoding='UTF-8') as xf:
+            xf.write_declaration(standalone=True)
+            _write_element(xf, stream, chartSpace, {}, sources)
+
+
+class CT_ChartCell(BaseOxmlElement):
+    
+    _strRef_tmpl = '<c:strRef %s><c:f>%s</c:f>%s</c:strRef>'
 
-        # set type of contained graphic to table
-        chartData = chartFrame['chart'].plotArea  
+    _numRef_tmpl = '<c:numRef %s><c:f>%s</c:f>%s</c:numRef>'
 
-        # add chart data element tree
-        chart = CT_ChartCell.new_chart()
-        chartData.append(chart)
+    _strCache_tmpl = '<c:strCache><c:ptCount val="%d"/>%s</c:strCache>'
 
-        objectify.deannotate(chartData, cleanup_namespaces=True)
-      
-        print etree.tostring(chartData, pretty_print=True,xml_declaration = True, encoding='UTF-8', standalone="yes")  
-        print "--------------------------------------------------------------------------"
-        print etree.tostring(chartFrame, pretty_print=True,xml_declaration = True, encoding='UTF-8', standalone="yes")    
-        return chartData
+    _numCache_tmpl = (
+        '<c:numCache><c:formatCode>%s</c:formatCode><c:ptCount val="%d"/>%s'
+        '</c:numCache>'
+    )
 
     @staticmethod
-    def new_chart(data,headings_xlsx,rId):
+    def strRef_node(series,series_ref):
+        """
+        Return a new ``<c:strRef>`` element referring to *series_ref* and
+        caching the values in *series* as ``<c:pt>`` elements. The cache is
+        generated as a single XML string and parsed once rather than built
+        up an element at a time.
+        """
+        xml = CT_ChartCell._strRef_tmpl % (
+            nsdecls('c'), escape(series_ref),
+            CT_ChartCell._strCache_xml(series))
+        return oxml_fromstring(xml)
 
-        headings=[[]]
-        for i,e in enumerate(headings_xlsx):
-            headings[i].append(headings_xlsx[i])
-            if i == len(headings_xlsx)-1:
-                continue
-            else:
-                headings.append([])
+    @staticmethod
+    def numRef_node(series,series_ref,format_code='General'):
+        """
+        Return a new ``<c:numRef>`` element referring to *series_ref* and
+        caching the values in *series*, which may be a NumPy array or other
+        buffer-backed sequence, with number format *format_code*. Numbers
+        are formatted in a batch and the cache is parsed from a single XML
+        string.
+        """
+        xml = CT_ChartCell._numRef_tmpl % (
+            nsdecls('c'), escape(series_ref),
+            CT_ChartCell._numCache_xml(series, format_code))
+        return oxml_fromstring(xml)
 
-        
-        chartFrame =  CT_Chart_Container.new_chart_wrapper(rId)
+    @staticmethod
+    def deferred_ref_node(series, series_ref, sources, is_text=False,
+                          format_code='General'):
+        """
+        Return a new ``<c:strRef>`` (when *is_text* is True) or
+        ``<c:numRef>`` element referring to *series_ref*, like
+        :meth:`strRef_node` and :meth:`numRef_node` but whose cache holds
+        only the point count. A copy of *series* is appended to the list
+        *sources* and a placeholder comment left where its ``<c:pt>``
+        elements go, to be filled in by :meth:`CT_Chart_Container.write_chart`
+        when the chart is written.
+        """
+        placeholder = '<!--pts %d-->' % len(sources)
+        sources.append((copy(series), is_text))
+        if is_text:
+            cache_xml = CT_ChartCell._strCache_tmpl % (
+                len(series), placeholder)
+            tmpl = CT_ChartCell._strRef_tmpl
+        else:
+            cache_xml = CT_ChartCell._numCache_tmpl % (
+                escape(format_code), len(series), placeholder)
+            tmpl = CT_ChartCell._numRef_tmpl
+        xml = tmpl % (nsdecls('c'), escape(series_ref), cache_xml)
+        return oxml_fromstring(xml)
 
-        # set type of contained graphic to table
-        chartData = chartFrame['chart'].plotArea  
+    @staticmethod
+    def replace_cache(ref, series):
+        """
+        Replace the ``<c:strCache>`` or ``<c:numCache>`` child of *ref*, a
+        ``<c:strRef>`` or ``<c:numRef>`` element, with one caching the values
+        in *series*. The ``<c:f>`` formula and the number format of an
+        existing ``<c:numCache>`` are left as they are; nothing else in the
+        chart is rebuilt.
+        """
+        cache = CT_ChartCell.new_cache(ref, series)
+        return CT_ChartCell.set_cache(ref, cache)
 
-        # add chart data element tree
-        chart = CT_ChartCell.new_chart(data,headings,headings_xlsx)
-        chartData.append(chart)
-        chart =CT_plotArea.new_plot_vars()
-        chartData.append(chart)
-        
-        chart =CT_plotArea.plot_val_vars()
-        chartData.append(chart)
-        objectify.deannotate(chartData, cleanup_namespaces=True)
-        chartXML = etree.tostring(chartFrame, pretty_print=True,xml_declaration = True, encoding='UTF-8', standalone="yes")
-        return chartFrame
-    
-class CT_ChartCell(objectify.ObjectifiedElement):
-    
-    _tbl_tmpl = (
-        '<dummy>'
-        '</dummy>'
-    )
-    
     @staticmethod
-    def new_chart(data,headings,headings_xlsx):
- 
-        
-        #xml = new('c:lineChart')
-        #grouping = sub_elm(xml,'c:grouping',val="standard")
-        #varycolors = sub_elm(xml,'c:varyColors',val="0")
-        
-        xml = new('c:lineChart')
-        grouping = sub_elm(xml,'c:grouping',val="standard")
-        varycolors = sub_elm(xml,'c:varyColors',val="0")
-        
-        
-        chart = xml
+    def new_cache(ref, series):
+        """
+        Return a new ``<c:strCache>`` or ``<c:numCache>`` element, as suits
+        *ref*, caching the values in *series* and keeping the number format
+        of the existing ``<c:numCache>`` of *ref*. *ref* is not changed.
+        Raises |ValueError| if a ``<c:numCache>`` is called for and *series*
+        holds a value that isn't a number.
+        """
+        if ref.tag == qn('c:strRef'):
+            xml = CT_ChartCell._strCache_xml(series)
+        else:
+            _check_numbers(series)
+            format_code = 'General'
+            old_cache = _child(ref, 'c:numCache')
+            if old_cache is not None:
+                formatCode = _child(old_cache, 'c:formatCode')
+                if formatCode is not None and formatCode.text:
+                    format_code = formatCode.text
+            xml = CT_ChartCell._numCache_xml(series, format_code)
+        return _fragment(xml)[0]
 
-        
-        for idx, val in enumerate(headings):
-            
-            if idx == 0:
-                continue
-            else:
-                ref_series = "Sheet1!$"+ string.uppercase[idx]+ '$1' 
-                
-                ref_cat    = 'Sheet1!$A$2:$A$'+ str(len(data[1])+1)
-                
-                ref_val   = "Sheet1!$"+ string.uppercase[idx]+ '$2' + ":$"  + string.uppercase[idx] + "$"+str(len(data[0])+1) 
-    
-                tr = sub_elm(chart, 'c:ser')
-                tx = sub_elm(tr,'c:idx',val=str(idx-1))
-                tx = sub_elm(tr,'c:order',val=str(idx-1))
-                
-                # Category for Legend
-                
-                tx = sub_elm(tr,'c:tx')
-                ostrRef = CT_ChartCell.strRef_node(val,ref_series)
-                tx.append(ostrRef) 
-                
-                marker = sub_elm(tr,'c:marker')
-                sym    = sub_elm (marker,'c:symbol', val = "none")
-        
-                
-                # X-axis Categories
-                
-                cat = sub_elm(tr,'c:cat')
-                
-                ostrRef = CT_ChartCell.strRef_node(data[0],ref_cat)
-                cat.append(ostrRef) 
-                
-                
-                # Series Values - Y-Axis
-                
-                val = sub_elm(tr,'c:val')
-                
-                ostrRef = CT_ChartCell.numRef_node(data[idx],ref_val)
-                val.append(ostrRef) 
-                
-                marker = sub_elm(tr,'c:smooth', val = "0")
-        
-            # c:dLbls Settings for Line Chart 
-                
-        odLbls = sub_elm(chart,'c:dLbls')
-        legend = sub_elm(odLbls,'c:showLegendKey',val ="0")
-        legend = sub_elm(odLbls,'c:showVal',val ="0")
-        legend = sub_elm(odLbls,'c:showCatName',val ="0")
-        legend = sub_elm(odLbls,'c:showSerName',val ="0")
-        legend = sub_elm(odLbls,'c:showPercent',val ="0")
-        legend = sub_elm(odLbls,'c:showBubbleSize',val ="0")
-            
-        mark   = sub_elm(chart,'c:marker', val="1")
-        mark   =  sub_elm(chart,'c:smooth', val="0")
-        mark   =  sub_elm(chart,'c:axId', val="172167552")
-        mark   =  sub_elm(chart,'c:axId', val="172169088")
-  
-   
-
-            
-        # add specified number of rows and columns
+    @staticmethod
+    def set_cache(ref, cache):
+        """
+        Replace the cache child of *ref* with *cache*, made by
+        :meth:`new_cache`, adding it after the ``<c:f>`` formula if *ref* has
+        no cache.
+        """
+        cache_tag = 'c:strCache' if ref.tag == qn('c:strRef') else (
+            'c:numCache')
+        old_cache = _child(ref, cache_tag)
+        if old_cache is not None:
+            ref.replace(old_cache, cache)
+        else:
+            _child(ref, 'c:f').addnext(cache)
+        return cache
 
-        
-        objectify.deannotate(chart, cleanup_namespaces=True)
-        return chart
-    
-    
     @staticmethod
-    def strRef_node(series,series_ref):
-        """ create new strRef node c:strCache -> <c:ptCount> -> <c:pt idx =0> -> <c:v> 
-        """
-        #xml = CT_ChartCell._tbl_tmpl 
-        #series= ['Series 1','Series 2','Series 3']
-        #series_ref = 'Sheet1!$B$1'
-        data = new('c:strRef')
-        strRef= data
-        f = sub_elm(strRef,'c:f')
-        ostrCache = sub_elm(strRef,'c:strCache')
-        optCount = sub_elm(ostrCache,'c:ptCount',val=str(len(series)))
-        
-        for idx, val in enumerate(series):
-            opt = sub_elm(ostrCache,'c:pt',idx=str(idx))
-            #ov = sub_elm(opt,'c:v')
-            opt.v= val
-        
-        
-        strRef.f = series_ref
-       
-        objectify.deannotate(data, cleanup_namespaces=True)
-        return data
+    def _numCache_xml(series, format_code):
+        """
+        Return a ``<c:numCache>`` XML string caching the values in *series*
+        with number format *format_code*.
+        """
+        texts = _series_texts(series)
+        return CT_ChartCell._numCache_tmpl % (
+            escape(format_code), len(texts), _pts_xml(texts))
+
     @staticmethod
-    def numRef_node(series,series_ref):
-        """ create new  c:strCache -> <c:ptCount> -> <c:pt idx =0> -> <c:v> 
-        """
-        #xml = CT_ChartCell._tbl_tmpl 
-        #series= ['Series 1','Series 2','Series 3']
-        #series_ref = 'Sheet1!$B$1'
-        data = new('c:numRef')
-        strRef= data
-        f = sub_elm(strRef,'c:f')
-        ostrCache = sub_elm(strRef,'c:numCache')
-        ostrCache.formatCode = 'General'
-        optCount = sub_elm(ostrCache,'c:ptCount',val=str(len(series)))
-        
-        for idx, val in enumerate(series):
-            opt = sub_elm(ostrCache,'c:pt',idx=str(idx))
-            #ov = sub_elm(opt,'c:v')
-            opt.v= val
-        
-        
-        strRef.f = series_ref
-       
-        objectify.deannotate(data, cleanup_namespaces=True)
-        return data
-        
-         
+    def _strCache_xml(series):
+        """
+        Return a ``<c:strCache>`` XML string caching the values in *series*.
+        """
+        texts = _escaped(_series_texts(series))
+        return CT_ChartCell._strCache_tmpl % (len(texts), _pts_xml(texts))
+
+
+def _iter_pts_xml(series, is_text, chunk_size=4096):
+    """
+    Generate the ``<c:pt>`` elements for the values in *series* as UTF-8 XML
+    strings of *chunk_size* points each. Text values are escaped when
+    *is_text* is True. A NumPy array is formatted a slice at a time; other
+    sequences are pulled from an iterator.
+    """
+    if getattr(series, 'dtype', None) is not None:
+        chunks = (series[start:start+chunk_size]
+                  for start in xrange(0, len(series), chunk_size))
+    else:
+        values = iter(series)
+        chunks = iter(lambda: list(islice(values, chunk_size)), [])
+    idx = 0
+    for chunk in chunks:
+        texts = _series_texts(chunk)
+        if is_text:
+            texts = _escaped(texts)
+        pts_xml = _pts_xml(texts, idx)
+        if isinstance(pts_xml, unicode):
+            pts_xml = pts_xml.encode('utf-8')
+        yield pts_xml
+        idx += len(texts)
+
+
+_cache_tags = (qn('c:numCache'), qn('c:strCache'))
+
+_pts_placeholder_re = re.compile(r'^<!--pts (\d+)-->$')
+
+
+def _write_element(xf, stream, elm, parent_nsmap, sources):
+    """
+    Write *elm* and its descendants, but not its tail, to ``etree.xmlfile``
+    writer *xf* whose output is file-like *stream*, declaring only the
+    namespaces not already declared in *parent_nsmap*. A placeholder
+    comment of a deferred cache, left by
+    :meth:`CT_ChartCell.deferred_ref_node`, is replaced by the ``<c:pt>``
+    elements of its series in *sources*, written straight to *stream*.
+    """
+    nsmap = elm.nsmap
+    new_nsmap = dict([(prefix, uri) for prefix, uri in nsmap.items()
+                      if parent_nsmap.get(prefix) != uri])
+    with xf.element(elm.tag, elm.attrib, new_nsmap):
+        if elm.text:
+            xf.write(elm.text)
+        for child in elm.iterchildren():
+            # every element is namespaced, so this is a comment or the like;
+            # objectify gives a comment an element proxy, so its text is
+            # read from its own serialization
+            if not str(child.tag).startswith('{'):
+                match = None
+                if elm.tag in _cache_tags:
+                    match = _pts_placeholder_re.match(
+                        etree.tostring(child, with_tail=False))
+                if match:
+                    series, is_text = sources[int(match.group(1))]
+                    # points are XML already, so go straight to stream
+                    xf.flush()
+                    for pts_xml in _iter_pts_xml(series, is_text):
+                        stream.write(pts_xml)
+                else:
+                    xf.write(child, with_tail=False)
+            else:
+                _write_element(xf, stream, child, nsmap, sources)
+            if child.tail:
+                xf.write(child.tail)
+
+
+def _escaped(texts):
+    """
+    Return a list of the strings in *texts* escaped for use as XML element
+    text, |None| items being left as they are.
+    """
+    return [None if text is None else escape(text) for text in texts]
+
+
+def _pts_xml(texts, start=0):
+    """
+    Return a string containing a ``<c:pt>`` element for each of the
+    already-escaped strings in *texts*, numbered from *start*. A |None|
+    item is a missing point, for which no ``<c:pt>`` is written, so it's
+    left as a gap in the chart.
+    """
+    return ''.join([
+        '<c:pt idx="%d"><c:v>%s</c:v></c:pt>' % (idx, text)
+        for idx, text in enumerate(texts, start) if text is not None
+    ])
+
+
+def _check_numbers(series):
+    """
+    Raise |ValueError| if *series* holds a value other than a number or
+    |None|, which can't be cached in a ``<c:numCache>``.
+    """
+    dtype = getattr(series, 'dtype', None)
+    if dtype is not None and dtype.kind in 'biuf':
+        return
+    for value in _series_values(series):
+        if value is not None and not isinstance(value, Number):
+            raise ValueError("expected a number, got %r" % (value,))
+
+
+def _series_texts(series):
+    """
+    Return the values in *series* as a list of strings suitable for use as
+    XML element text, with |None| for a missing value, either |None| or
+    NaN. Booleans become ``'1'`` and ``'0'``. A NumPy numeric array is
+    formatted in one vectorized ``astype()`` call; other sequences are
+    converted with ``_point_text()``.
+    """
+    dtype = getattr(series, 'dtype', None)
+    if dtype is not None and dtype.kind in 'biuf':
+        if dtype.kind == 'b':
+            series = series.astype(int)
+        texts = series.astype(str).tolist()
+        if dtype.kind == 'f':
+            # NaN is the only value not equal to itself
+            for idx in (series != series).nonzero()[0].tolist():
+                texts[idx] = None
+        return texts
+    return map(_point_text, _series_values(series))
+
+
+def _point_text(value):
+    """
+    Return the text of chart data point *value* as :func:`_to_text` does,
+    but |None| if *value* is |None| or NaN and ``'1'`` or ``'0'`` if it's a
+    boolean.
+    """
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    return _to_text(value)
+
+
+def _series_values(series):
+    """
+    Return the values in *series* as a list. NumPy arrays and buffer-backed
+    sequences such as ``array.array`` and ``memoryview`` are converted with a
+    single ``tolist()`` call rather than element by element, which also
+    turns NumPy scalars into plain Python numbers. NumPy ``datetime64``
+    values become ``datetime`` objects.
+    """
+    dtype = getattr(series, 'dtype', None)
+    if dtype is not None and dtype.kind == 'M':
+        series = series.astype('datetime64[us]')
+    tolist = getattr(series, 'tolist', None)
+    if tolist is not None:
+        return tolist()
+    return list(series)
+
+
 a_namespace = element_class_lookup.get_namespace(nsmap['a'])
 a_namespace = element_class_lookup.get_namespace(nsmap['c'])
 
-class CT_plotArea(objectify.ObjectifiedElement):
-    """ <c:catAx>
-        <c:axId val="172167552"/>
-        <c:scaling>
-          <c:orientation val="minMax"/>
-        </c:scaling>
-        <c:delete val="0"/>
-        <c:axPos val="b"/>
-        <c:majorTickMark val="out"/>
-        <c:minorTickMark val="none"/>
-        <c:tickLblPos val="nextTo"/>
-        <c:crossAx val="172169088"/>
-        <c:crosses val="autoZero"/>
-        <c:auto val="1"/>
-        <c:lblAlgn val="ctr"/>
-        <c:lblOffset val="100"/>
-        <c:noMultiLvlLbl val="0"/>
-      </c:catAx>
-      <c:valAx>
-        <c:axId val="172169088"/>
-        <c:scaling>
-          <c:orientation val="minMax"/>
-        </c:scaling>
-        <c:delete val="0"/>
-        <c:axPos val="l"/>
-        <c:majorGridlines/>
-        <c:numFmt formatCode="General" sourceLinked="1"/>
-        <c:majorTickMark val="out"/>
-        <c:minorTickMark val="none"/>
-        <c:tickLblPos val="nextTo"/>
-        <c:crossAx val="172167552"/>
-        <c:crosses val="autoZero"/>
-        <c:crossBetween val="between"/>
-      </c:valAx>"""
+class _ChartTemplate(object):
+    """
+    XML prototypes of the plot element, series and axes of one chart type,
+    compiled from its ``chart_types`` spec the first time the type is used
+    and cloned for each new chart of that type, so only the data caches of a
+    new chart are built from scratch.
+    """
+    _dLbls_xml = (
+        '<c:dLbls>'
+        '<c:showLegendKey val="0"/>'
+        '<c:showVal val="0"/>'
+        '<c:showCatName val="0"/>'
+        '<c:showSerName val="0"/>'
+        '<c:showPercent val="0"/>'
+        '<c:showBubbleSize val="0"/>'
+        '</c:dLbls>'
+    )
+
+    _ser_tmpl = (
+        '<c:idx val="0"/>'
+        '<c:order val="0"/>'
+        '<c:tx/>'
+        '%s'
+        '<%s/>'
+        '<%s/>'
+        '%s'
+    )
+
+    _axis_tmpls = {
+        'catAx': (
+            '<c:catAx>'
+            '<c:axId val="%(axId)s"/>'
+            '<c:scaling><c:orientation val="minMax"/></c:scaling>'
+            '<c:delete val="0"/>'
+            '<c:axPos val="%(axPos)s"/>'
+            '<c:majorTickMark val="out"/>'
+            '<c:minorTickMark val="none"/>'
+            '<c:tickLblPos val="nextTo"/>'
+            '<c:crossAx val="%(crossAx)s"/>'
+            '<c:crosses val="autoZero"/>'
+            '<c:auto val="1"/>'
+            '<c:lblAlgn val="ctr"/>'
+            '<c:lblOffset val="100"/>'
+            '<c:noMultiLvlLbl val="0"/>'
+            '</c:catAx>'
+        ),
+        'dateAx': (
+            '<c:dateAx>'
+            '<c:axId val="%(axId)s"/>'
+            '<c:scaling><c:orientation val="minMax"/></c:scaling>'
+            '<c:delete val="0"/>'
+            '<c:axPos val="%(axPos)s"/>'
+            '<c:numFmt formatCode="%(formatCode)s" sourceLinked="1"/>'
+            '<c:majorTickMark val="out"/>'
+            '<c:minorTickMark val="none"/>'
+            '<c:tickLblPos val="nextTo"/>'
+            '<c:crossAx val="%(crossAx)s"/>'
+            '<c:crosses val="autoZero"/>'
+            '<c:auto val="1"/>'
+            '<c:lblOffset val="100"/>'
+            '<c:baseTimeUnit val="days"/>'
+            '</c:dateAx>'
+        ),
+        'valAx': (
+            '<c:valAx>'
+            '<c:axId val="%(axId)s"/>'
+            '<c:scaling><c:orientation val="minMax"/></c:scaling>'
+            '<c:delete val="0"/>'
+            '<c:axPos val="%(axPos)s"/>'
+            '<c:majorGridlines/>'
+            '<c:numFmt formatCode="%(formatCode)s" sourceLinked="1"/>'
+            '<c:majorTickMark val="out"/>'
+            '<c:minorTickMark val="none"/>'
+            '<c:tickLblPos val="nextTo"/>'
+            '<c:crossAx val="%(crossAx)s"/>'
+            '<c:crosses val="autoZero"/>'
+            '<c:crossBetween val="%(crossBetween)s"/>'
+            '</c:valAx>'
+        ),
+    }
+
+    # axis ids need only be unique within a chart part, so every chart gets
+    # the same ids, which keeps generated output reproducible
+    _axis_ids = ('172167552', '172169088')
+
+    # compiled templates, keyed by (chart_type, date_axis); a template is
+    # cached only once compiled and is read-only thereafter, so templates
+    # can be shared between threads
+    __templates = {}
+
+    def __init__(self, chart_type, date_axis):
+        super(_ChartTemplate, self).__init__()
+        spec = chart_types[chart_type]
+        self.__date_axis = date_axis
+        self.__num_cat = date_axis or spec['cat_cache'] == 'num'
+        axis_ids = self._axis_ids[:len(spec['axes'])]
+        # plot element, series are inserted at self.__ser_idx
+        plot = _Element(spec['plot'])
+        plot_head = _fragment(spec['plot_head'])
+        plot.extend(plot_head)
+        self.__ser_idx = len(plot_head)
+        axId_xml = ''.join(['<c:axId val="%s"/>' % id_ for id_ in axis_ids])
+        plot.extend(
+            _fragment(self._dLbls_xml + spec['plot_tail'] + axId_xml))
+        self.__plot = plot
+        # series
+        ser = _Element('c:ser')
+        ser.extend(_fragment(self._ser_tmpl % (
+            spec['ser_head'], spec['ser_refs'][0], spec['ser_refs'][1],
+            spec['ser_tail'])))
+        self.__ser = ser
+        # offsets of the series children set for each new series, so a clone
+        # needs just one pass over its children rather than a find() per tag
+        tags = [child.tag for child in ser.iterchildren()]
+        self.__ser_offsets = [
+            tags.index(qn(tag)) for tag in
+            ('c:idx', 'c:order', 'c:tx') + tuple(spec['ser_refs'])]
+        # axes, category (x) axis first
+        self.__axes = []
+        for idx, (kind, axPos) in enumerate(spec['axes']):
+            if kind == 'catAx' and date_axis:
+                kind = 'dateAx'
+            is_date = date_axis and idx == 0
+            xml = self._axis_tmpls[kind] % {
+                'axId':         axis_ids[idx],
+                'crossAx':      axis_ids[1-idx],
+                'axPos':        axPos,
+                'formatCode':   DATE_FORMAT_CODE if is_date else 'General',
+                'crossBetween': spec['crossBetween'],
+            }
+            self.__axes.append(_fragment(xml)[0])
+
+    @classmethod
+    def get(cls, chart_type, date_axis=False):
+        """
+        Return the template for *chart_type*, compiling it on first use.
+        *date_axis* is True when the chart categories are dates, which are
+        given a date axis. Raises |KeyError| if *chart_type* isn't a
+        supported ``XL_CHART_TYPE`` value.
+        """
+        key = (chart_type, date_axis)
+        template = cls.__templates.get(key)
+        if template is None:
+            if chart_type not in chart_types:
+                raise KeyError("no chart type with id %s" % chart_type)
+            template = cls(chart_type, date_axis)
+            cls.__templates[key] = template
+        return template
+
+    def new_plot(self, data, headings, sources=None):
+        """
+        Return a list containing a new plot element for the series in
+        *data*, followed by its axes. The first sequence in *data* holds the
+        categories; each of the rest holds the values of the series whose
+        heading is at the same offset in *headings*. When *sources* is a
+        list, the category and value caches are deferred, their data added
+        to *sources*. Raises |ValueError| if the chart type caches its
+        categories as numbers, like the x values of a scatter chart, and a
+        category isn't a number.
+        """
+        categories = data[0]
+        point_count = len(categories)
+        columns = column_letters(len(headings))
+
+        def ref_node(series, series_ref, is_text=False,
+                     format_code='General'):
+            if sources is not None:
+                return CT_ChartCell.deferred_ref_node(
+                    series, series_ref, sources, is_text, format_code)
+            if is_text:
+                return CT_ChartCell.strRef_node(series, series_ref)
+            return CT_ChartCell.numRef_node(series, series_ref, format_code)
+
+        # category cache is the same for every series, so build it just once
+        cat_ref = 'Sheet1!$A$2:$A$%d' % (point_count+1)
+        if self.__date_axis:
+            cat = ref_node(
+                _excel_serials(categories), cat_ref,
+                format_code=DATE_FORMAT_CODE)
+        else:
+            if self.__num_cat:
+                _check_numbers(categories)
+            cat = ref_node(categories, cat_ref, not self.__num_cat)
+
+        sers = []
+        for idx in range(1, len(headings)):
+            column = columns[idx]
+            ser = deepcopy(self.__ser)
+            children = list(ser.iterchildren())
+            idx_, order, tx, ser_cat, ser_val = [
+                children[offset] for offset in self.__ser_offsets]
+            idx_.set('val', str(idx-1))
+            order.set('val', str(idx-1))
+            tx.append(CT_ChartCell.strRef_node(
+                [headings[idx]], 'Sheet1!$%s$1' % column))
+            ser_cat.append(deepcopy(cat))
+            val_ref = 'Sheet1!$%s$2:$%s$%d' % (column, column, point_count+1)
+            ser_val.append(ref_node(data[idx], val_ref))
+            sers.append(ser)
+
+        plot = deepcopy(self.__plot)
+        for offset, ser in enumerate(sers):
+            plot.insert(self.__ser_idx + offset, ser)
+        return [plot] + [deepcopy(axis) for axis in self.__axes]
+
+
+def _excel_serials(series):
+    """
+    Return the dates in *series* as Excel serial date numbers, i.e. days
+    since 1899-12-30, with any time of day as a fraction.
+    """
+    epoch = datetime(1899, 12, 30)
+    serials = []
+    for value in _series_values(series):
+        if not isinstance(value, datetime):
+            value = datetime(value.year, value.month, value.day)
+        delta = value - epoch
+        if delta.seconds or delta.microseconds:
+            serials.append(delta.total_seconds() / 86400)
+        else:
+            serials.append(delta.days)
+    return serials
+
+
+def _fragment(xml):
+    """
+    Return a list of the elements in *xml*, a string of zero or more sibling
+    elements in the chart (``c:``) and DrawingML (``a:``) namespaces.
+    """
+    fragment = oxml_fromstring(
+        '<c:fragment %s>%s</c:fragment>' % (nsdecls('c', 'a'), xml))
+    return list(fragment.iterchildren())
+
+
+def _is_date_series(series):
+    """
+    Return True if the values in *series* are dates, either a NumPy
+    ``datetime64`` array or a sequence of ``date`` or ``datetime`` objects.
+    """
+    dtype = getattr(series, 'dtype', None)
+    if dtype is not None:
+        return dtype.kind == 'M'
+    return len(series) > 0 and isinstance(series[0], date)
 
-    @staticmethod
-    def new_plot_vars():
-        ocatAx = new('c:catAx')
-        ocatAx_l= sub_elm(ocatAx,'c:axId', val ="172167552")
-        ocatAx_l= sub_elm(ocatAx,'c:scaling')
-        ocatAx_l= sub_elm(ocatAx_l,'c:orientation', val ="minMax")
-        ocatAx_l= sub_elm(ocatAx,'c:delete',val="0")
-        ocatAx_l= sub_elm(ocatAx,'c:axPos',val="b")
-        ocatAx_l= sub_elm(ocatAx,'c:majorTickMark',val="out")
-        ocatAx_l= sub_elm(ocatAx,'c:minorTickMark',val="none")
-        ocatAx_l= sub_elm(ocatAx,'c:tickLblPos',val="nextTo")
-        ocatAx_l= sub_elm(ocatAx,'c:crossAx',val="172169088")
-        ocatAx_l= sub_elm(ocatAx,'c:crosses',val="autoZero")
-        ocatAx_l= sub_elm(ocatAx,'c:auto',val="1")
-        ocatAx_l= sub_elm(ocatAx,'c:lblAlgn',val="ctr")
-        ocatAx_l= sub_elm(ocatAx,'c:lblOffset',val="100")
-        ocatAx_l= sub_elm(ocatAx,'c:noMultiLvlLbl',val="0")
-        
-  
-        objectify.deannotate(ocatAx, cleanup_namespaces=True)
-        return ocatAx  
-        
-    @staticmethod
-    def plot_val_vars():
-     
-        ovalAx = new('c:valAx')
-        ovalAx_l= sub_elm(ovalAx,'c:axId', val ="172169088")
-        ovalAx_l= sub_elm(ovalAx,'c:scaling')
-        ovalAx_l= sub_elm(ovalAx_l,'c:orientation', val ="minMax")
-        ovalAx_l= sub_elm(ovalAx,'c:delete',val="0")
-        ovalAx_l= sub_elm(ovalAx,'c:axPos',val="l")
-        ovalAx_l= sub_elm(ovalAx,'c:majorGridlines')
-        ovalAx_l= sub_elm(ovalAx,'c:numFmt',formatCode="General" ,sourceLinked ="1")
-        ovalAx_l= sub_elm(ovalAx,'c:majorTickMark',val="out")
-        ovalAx_l= sub_elm(ovalAx,'c:minorTickMark',val="none")
-        ovalAx_l= sub_elm(ovalAx,'c:tickLblPos',val="nextTo")
-        ovalAx_l= sub_elm(ovalAx,'c:crossAx',val="172167552")
-        ovalAx_l= sub_elm(ovalAx,'c:crosses',val="autoZero")
-        ovalAx_l= sub_elm(ovalAx,'c:crossBetween',val="between")
-        
-      
-        objectify.deannotate(ovalAx, cleanup_namespaces=True)
-        return ovalAx  
 
 a_namespace = element_class_lookup.get_namespace(nsmap['a'])
 
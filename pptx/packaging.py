@@ -21,13 +21,16 @@ methods :meth:`open`, :meth:`marshal`, and :meth:`save`.
 import os
 import posixpath
 import re
+import threading
+import time
 
 from StringIO import StringIO
 from lxml import etree
-from zipfile import ZipFile, is_zipfile, ZIP_DEFLATED
+from zipfile import ZipFile, ZipInfo, is_zipfile, ZIP_DEFLATED
 
 import pptx.spec
 
+from pptx.instrument import phase
 from pptx.exceptions import (
     CorruptedPackageError, DuplicateKeyError, NotXMLError,
     PackageNotFoundError)
@@ -40,6 +43,11 @@ from pptx.spec import PTS_HASRELS_NEVER, PTS_HASRELS_OPTIONAL
 
 PKG_BASE_URI = '/'
 
+# timestamp of every item written to a package, the earliest a zip file can
+# record, as PowerPoint does; saving the same presentation twice then gives
+# the same bytes
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
 
 # ============================================================================
 # API Classes
@@ -57,6 +65,9 @@ class Package(object):
     def __init__(self):
         super(Package, self).__init__()
         self.__relationships = []
+        # every part marshal() creates, keyed by partname, including those
+        # not yet linked into the relationship graph if marshaling fails
+        self.__marshaled_parts = {}
 
     @property
     def parts(self):
@@ -86,11 +97,13 @@ class Package(object):
         such as is produced by unzipping an OPC package file.
         """
         fs = FileSystem(file)
-        cti = _ContentTypesItem().load(fs)
+        with phase('open.xml_parse', partname='/[Content_Types].xml'):
+            cti = _ContentTypesItem().load(fs)
         self.__relationships = []  # discard any rels from prior load
         parts_dict = {}            # track loaded parts, graph is cyclic
-        pkg_rel_elms = fs.getelement(Package.PKG_RELSITEM_URI)\
-                         .findall(qtag('pr:Relationship'))
+        with phase('open.xml_parse', partname=Package.PKG_RELSITEM_URI):
+            pkg_rel_elms = fs.getelement(Package.PKG_RELSITEM_URI)\
+                             .findall(qtag('pr:Relationship'))
         for rel_elm in pkg_rel_elms:
             rId = rel_elm.get('Id')
             reltype = rel_elm.get('Type')
@@ -103,46 +116,76 @@ class Package(object):
         fs.close()
         return self
 
-    def marshal(self, model_pkg):
+    def marshal(self, model_pkg, pretty_print=True):
         """
         Load the contents of a model-side package such that it can be saved to
-        a package file.
-        """
-        part_dict = {}  # keep track of marshaled parts, graph is cyclic
-        for rel in model_pkg._relationships:
-            # unpack working values for target part and relationship
-            rId = rel._rId
-            reltype = rel._reltype
-            model_part = rel._target
-            partname = model_part.partname
-            # create package-part for target
-            part = Part()
-            part_dict[partname] = part
-            part._marshal(model_part, part_dict)
-            # create marshaled version of relationship
-            marshaled_rel = Relationship(rId, self, reltype, part)
-            self.__relationships.append(marshaled_rel)
+        a package file. XML parts are serialized without indentation when
+        *pretty_print* is False.
+        """
+        # keep track of marshaled parts, graph is cyclic
+        part_dict = self.__marshaled_parts
+        with phase('save.marshal'):
+            for rel in model_pkg._relationships:
+                # unpack working values for target part and relationship
+                rId = rel._rId
+                reltype = rel._reltype
+                model_part = rel._target
+                partname = model_part.partname
+                # create package-part for target
+                part = Part()
+                part_dict[partname] = part
+                part._marshal(model_part, part_dict, pretty_print)
+                # create marshaled version of relationship
+                marshaled_rel = Relationship(rId, self, reltype, part)
+                self.__relationships.append(marshaled_rel)
         return self
 
-    def save(self, file):
+    def save(self, file, pretty_print=True):
         """
         Save this package to *file*, where *file* can be either a path to a
-        file (a string) or a file-like object.
-        """
-        # open a zip filesystem for writing package
-        zipfs = ZipFileSystem(file, 'w')
-        # write [Content_Types].xml
-        cti = _ContentTypesItem().compose(self.parts)
-        zipfs.write_element(cti.element, '/[Content_Types].xml')
-        # write pkg rels item
-        zipfs.write_element(self.__relsitem_element, self.PKG_RELSITEM_URI)
-        for part in self.parts:
-            # write part item
-            zipfs.write_blob(part.blob, part.partname)
-            # write rels item if part has one
-            if part.relationships:
-                zipfs.write_element(part._relsitem_element, part._relsitemURI)
-        zipfs.close()
+        file (a string) or a file-like object. The content types and rels
+        items are written without indentation when *pretty_print* is False.
+        """
+        zipfs = None
+        try:
+            # open a zip filesystem for writing package
+            zipfs = ZipFileSystem(file, 'w')
+            # write [Content_Types].xml
+            with phase('save.content_types'):
+                cti = _ContentTypesItem().compose(self.parts)
+            zipfs.write_element(cti.element, '/[Content_Types].xml',
+                                pretty_print)
+            # write pkg rels item
+            zipfs.write_element(self.__relsitem_element,
+                                self.PKG_RELSITEM_URI, pretty_print)
+            for part in self.parts:
+                # write part item, from disk if it was spooled to a file
+                if part.blob_path is not None:
+                    zipfs.write_file(part.blob_path, part.partname)
+                else:
+                    zipfs.write_blob(part.blob, part.partname)
+                # write rels item if part has one
+                if part.relationships:
+                    zipfs.write_element(part._relsitem_element,
+                                        part._relsitemURI, pretty_print)
+        finally:
+            self.remove_spool_files()
+            if zipfs is not None:
+                zipfs.close()
+
+    def remove_spool_files(self):
+        """
+        Remove the temporary files parts spooled their contents to when
+        marshaled, including parts marshaled before marshaling failed.
+        Called by :meth:`save`; call it when a marshaled package won't be
+        saved.
+        """
+        parts = self.__marshaled_parts.values() + self.parts
+        for part in parts:
+            if part.blob_path is not None:
+                if os.path.exists(part.blob_path):
+                    os.remove(part.blob_path)
+                part.blob_path = None
 
     @property
     def __relsitem_element(self):
@@ -195,6 +238,12 @@ class Part(object):
        this is the string of bytes corresponding exactly to the bytes on disk
        for the binary object.
 
+    .. attribute:: blob_path
+
+       Path of a temporary file holding the contents of this part in place of
+       :attr:`blob`, or |None|. Set when a model part spools its contents to
+       disk on marshaling; the file is removed once the package is saved.
+
     """
     def __init__(self):
         super(Part, self).__init__()
@@ -202,6 +251,7 @@ class Part(object):
         self.__relationships = []
         self.typespec = None
         self.blob = None
+        self.blob_path = None
 
     @property
     def content_type(self):
@@ -236,7 +286,9 @@ class Part(object):
 
         # set persisted attributes
         self.__partname = partname
-        self.blob = fs.getblob(partname)
+        with phase('open.zip_read', partname=partname) as ph:
+            self.blob = fs.getblob(partname)
+            ph.set(bytes=len(self.blob))
         self.typespec = PartTypeSpec(content_type)
 
         # load relationships and propagate load to target parts
@@ -261,7 +313,7 @@ class Part(object):
 
         return self
 
-    def _marshal(self, model_part, part_dict):
+    def _marshal(self, model_part, part_dict, pretty_print=True):
         """
         Load the contents of model-side part such that it can be saved to
         disk. Propagate marshalling to related parts.
@@ -270,7 +322,17 @@ class Part(object):
         content_type = model_part._content_type
         # assign persisted attributes from model part
         self.__partname = model_part.partname
-        self.blob = model_part._blob
+        # parts able to spool their content to a file, like charts with
+        # large data caches, are written to the package from disk
+        spool = getattr(model_part, '_spool', None)
+        with phase('save.serialize', partname=self.__partname) as ph:
+            self.blob_path = (spool(pretty_print) if spool is not None
+                              else None)
+            if self.blob_path is None:
+                self.blob = model_part._serialize(pretty_print)
+                ph.set(bytes=len(self.blob))
+            else:
+                ph.set(bytes=os.path.getsize(self.blob_path))
         self.typespec = PartTypeSpec(content_type)
 
         # load relationships and propagate marshal to target parts
@@ -286,7 +348,7 @@ class Part(object):
             else:
                 part = Part()
                 part_dict[partname] = part
-                part._marshal(model_target_part, part_dict)
+                part._marshal(model_target_part, part_dict, pretty_print)
             # create marshalled version of relationship
             marshalled_rel = Relationship(rId, self, reltype, part)
             self.__relationships.append(marshalled_rel)
@@ -322,7 +384,8 @@ class Part(object):
         if relsitemURI not in fs:
             tmpl = "required relationships item '%s' not found in package"
             raise CorruptedPackageError(tmpl % relsitemURI)
-        root_elm = fs.getelement(relsitemURI)
+        with phase('open.xml_parse', partname=relsitemURI):
+            root_elm = fs.getelement(relsitemURI)
         return root_elm.findall(qtag('pr:Relationship'))
 
     @staticmethod
@@ -492,26 +555,27 @@ class PartTypeSpec(object):
 
     """
     __instances = {}
+    __instances_lock = threading.Lock()
 
     def __new__(cls, content_type):
         """
         Only create new instance on first call for content_type. After that,
-        use cached instance.
-        """
-        # if there's not a matching instance in the cache, create one
-        if content_type not in cls.__instances:
-            inst = super(PartTypeSpec, cls).__new__(cls)
-            cls.__instances[content_type] = inst
-        # return the instance; note that __init__() gets called either way
-        return cls.__instances[content_type]
-
-    def __init__(self, content_type):
+        use cached instance. An instance is fully loaded before it's cached,
+        under a lock, so a thread never sees one another thread is still
+        loading.
+        """
+        inst = cls.__instances.get(content_type)
+        if inst is None:
+            with cls.__instances_lock:
+                inst = cls.__instances.get(content_type)
+                if inst is None:
+                    inst = super(PartTypeSpec, cls).__new__(cls)
+                    inst.__load(content_type)
+                    cls.__instances[content_type] = inst
+        return inst
+
+    def __load(self, content_type):
         """Initialize spec attributes from constant values in pptx.spec."""
-        # skip loading if this instance is from the cache
-        if hasattr(self, '_loaded'):
-            return
-        # otherwise initialize new instance
-        self._loaded = True
         if content_type not in pptx.spec.pml_parttypes:
             tmpl = "no content type '%s' in pptx.spec.pml_parttypes"
             raise KeyError(tmpl % content_type)
@@ -825,20 +889,54 @@ class ZipFileSystem(BaseFileSystem):
             tmpl = "Item with URI '%s' already in package"
             raise DuplicateKeyError(tmpl % itemURI)
         membername = itemURI[1:]  # trim off leading slash
-        self.zipf.writestr(membername, blob)
+        with phase('save.compress', partname=itemURI, bytes=len(blob)):
+            self.zipf.writestr(self.__zipinfo(membername), blob)
+
+    def write_file(self, path, itemURI):
+        """
+        Write the file at *path* to zip file as binary stream named
+        *itemURI*, reading it a block at a time. The zip file takes the
+        item's timestamp from the file, so the file's modification time is
+        first set to ``ZIP_DATE_TIME``.
+        """
+        if itemURI in self:
+            tmpl = "Item with URI '%s' already in package"
+            raise DuplicateKeyError(tmpl % itemURI)
+        membername = itemURI[1:]  # trim off leading slash
+        mtime = time.mktime(ZIP_DATE_TIME + (0, 0, -1))
+        os.utime(path, (mtime, mtime))
+        with phase('save.compress', partname=itemURI,
+                   bytes=os.path.getsize(path)):
+            self.zipf.write(path, membername)
 
-    def write_element(self, element, itemURI):
+    def write_element(self, element, itemURI, pretty_print=True):
         """
-        Write *element* to zip file as an XML document named *itemURI*.
+        Write *element* to zip file as an XML document named *itemURI*. When
+        *pretty_print* is False the XML is written on a single line with no
+        indentation and the root element's namespace declarations are left
+        unwrapped.
         """
         if itemURI in self:
             tmpl = "Item with URI '%s' already in package"
             raise DuplicateKeyError(tmpl % itemURI)
         membername = itemURI[1:]  # trim off leading slash
-        xml = etree.tostring(element, encoding='UTF-8', pretty_print=True,
-                             standalone=True)
-        xml = prettify_nsdecls(xml)
-        self.zipf.writestr(membername, xml)
+        xml = etree.tostring(element, encoding='UTF-8',
+                             pretty_print=pretty_print, standalone=True)
+        if pretty_print:
+            xml = prettify_nsdecls(xml)
+        with phase('save.compress', partname=itemURI, bytes=len(xml)):
+            self.zipf.writestr(self.__zipinfo(membername), xml)
+
+    @staticmethod
+    def __zipinfo(membername):
+        """
+        Return a |ZipInfo| for a compressed item named *membername*,
+        timestamped ``ZIP_DATE_TIME``.
+        """
+        zipinfo = ZipInfo(membername, ZIP_DATE_TIME)
+        zipinfo.compress_type = ZIP_DEFLATED
+        zipinfo.external_attr = 0600 << 16  # as writestr() gives a name
+        return zipinfo
 
 
 # ============================================================================
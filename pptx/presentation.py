@@ -15,33 +15,34 @@ encounters as an end-user of the PowerPoint user interface.
 import hashlib
 from lxml import etree, objectify
 
-
-try:
-    from PIL import Image as PIL_Image
-except ImportError:
-    import Image as PIL_Image
-
 import os
 import posixpath
+import re
+import tempfile
+import threading
 import weakref
 
 from datetime import datetime
+from io import BytesIO
 from StringIO import StringIO
 
 import pptx.packaging
 import pptx.spec as spec
 import pptx.util as util
 
+from pptx.constants import XL_CHART_TYPE as XL
 from pptx.exceptions import InvalidPackageError
+from pptx.instrument import phase
 from pptx.oxml import (
-    CT_CoreProperties, _Element, _SubElement, oxml_fromstring, oxml_tostring,
-    qn,CT_Chart_Container
+    CT_CoreProperties, _Element, _SubElement, _xpath, oxml_fromstring,
+    qn,CT_Chart_Container, CT_ChartCell, _excel_serials, _is_date_series,
+    _series_values
 )
 from pptx.shapes import _ShapeCollection
 from pptx.spec import namespaces
 from pptx.spec import (
-    CT_CORE_PROPS, CT_PRESENTATION, CT_SLIDE, CT_SLIDE_LAYOUT,CT_CHART,
-    CT_SLIDE_MASTER, CT_SLIDESHOW, CT_TEMPLATE
+    CT_CORE_PROPS, CT_EXCEL_XLSX, CT_PRESENTATION, CT_SLIDE, CT_SLIDE_LAYOUT,
+    CT_CHART, CT_SLIDE_MASTER, CT_SLIDESHOW, CT_TEMPLATE
 )
 from pptx.spec import (
     RT_CORE_PROPS, RT_IMAGE, RT_OFFICE_DOCUMENT, RT_SLIDE, RT_SLIDE_LAYOUT,RT_CHART,RT_EXCEL_XLSX,
@@ -49,25 +50,35 @@ from pptx.spec import (
 )
 
 from pptx.util import Collection, Px
-
-#temperorary workaround for worksheet numbers
-#global variable 
-wsID = 0
+from pptx.workbook import CellRange, replace_columns
 
 # default namespace map for use in lxml calls
 _nsmap = namespaces('a', 'r', 'p')
 
+# new charts whose data caches hold more points than this are serialized to
+# a temporary file on save rather than in memory
+CHART_SPOOL_POINTS = 100000
+
 
-def _child(element, child_tagname, nsmap=None):
+def _pil_image():
+    """
+    Return the PIL ``Image`` module. It's imported on first use rather than
+    with this module because importing PIL takes longer than importing the
+    rest of the package, and only image parts need it.
+    """
+    try:
+        from PIL import Image as PIL_Image
+    except ImportError:
+        import Image as PIL_Image
+    return PIL_Image
+
+
+def _child(element, child_tagname):
     """
     Return direct child of *element* having *child_tagname* or |None| if no
     such child element is present.
     """
-    # use default nsmap if not specified
-    if nsmap is None:
-        nsmap = _nsmap
-    xpath = './%s' % child_tagname
-    matching_children = element.xpath(xpath, namespaces=nsmap)
+    matching_children = _xpath('./%s' % child_tagname)(element)
     return matching_children[0] if len(matching_children) else None
 
 
@@ -86,6 +97,7 @@ class _Package(object):
     """
     # track instances as weakrefs so .containing() can be computed
     __instances = []
+    __instances_lock = threading.Lock()
 
     def __init__(self, file=None):
         super(_Package, self).__init__()
@@ -95,12 +107,44 @@ class _Package(object):
         self.__images = _ImageCollection()
         self.__charts = _ChartCollection(self)
         self.__xlsx = _xlsxCollection(self)
-        
-        self.__instances.append(weakref.ref(self))
+        self.__closed = False
+
+        with self.__instances_lock:
+            self.__instances.append(weakref.ref(self))
         if file is None:
             file = self.__default_pptx_path
         self.__open(file)
 
+    def close(self):
+        """
+        Release the parts of this package and everything they hold, and
+        remove it from the packages :meth:`instances` returns. The
+        references between parts, relationship collections and observers
+        are broken, so the memory is reclaimed as soon as the last reference
+        to the package is dropped rather than at the next garbage
+        collection. The package can't be used afterward. Calling
+        :meth:`close` again has no effect.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        for part in self._parts:
+            part._close()
+        self.__presentation = None
+        self.__core_properties = None
+        self.__relationships = _RelationshipCollection()
+        self.__images = None
+        self.__charts = None
+        self.__xlsx = None
+        with self.__instances_lock:
+            self.__instances[:] = [wkref for wkref in self.__instances
+                                   if wkref() not in (None, self)]
+
+    @property
+    def closed(self):
+        """True if :meth:`close` has been called on this package."""
+        return self.__closed
+
     @classmethod
     def containing(cls, part):
         """Return package instance that contains *part*"""
@@ -122,12 +166,15 @@ class _Package(object):
     @classmethod
     def instances(cls):
         """Return tuple of _Package instances that have been created"""
-        # clean garbage collected pkgs out of __instances
-        cls.__instances[:] = [wkref for wkref in cls.__instances
-                              if wkref() is not None]
+        # clean garbage collected pkgs out of __instances, under the lock so
+        # an instance registered meanwhile by another thread isn't lost
+        with cls.__instances_lock:
+            cls.__instances[:] = [wkref for wkref in cls.__instances
+                                  if wkref() is not None]
+            wkrefs = list(cls.__instances)
         # return instance references in a tuple
-        pkgs = [wkref() for wkref in cls.__instances]
-        return tuple(pkgs)
+        pkgs = [wkref() for wkref in wkrefs]
+        return tuple(pkg for pkg in pkgs if pkg is not None)
 
     @property
     def presentation(self):
@@ -136,13 +183,24 @@ class _Package(object):
         """
         return self.__presentation
 
-    def save(self, file):
+    def save(self, file, compact=False):
         """
         Save this package to *file*, where *file* can be either a path to a
-        file (a string) or a file-like object.
-        """
-        pkgng_pkg = pptx.packaging.Package().marshal(self)
-        pkgng_pkg.save(file)
+        file (a string) or a file-like object. If *compact* is True, XML
+        items are written without indentation, producing a smaller package
+        more quickly.
+        """
+        if self.__closed:
+            raise ValueError('cannot save a closed presentation')
+        pretty_print = not compact
+        with phase('save'):
+            pkgng_pkg = pptx.packaging.Package()
+            # remove chart spool files even if marshaling or writing fails
+            try:
+                pkgng_pkg.marshal(self, pretty_print)
+                pkgng_pkg.save(file, pretty_print)
+            finally:
+                pkgng_pkg.remove_spool_files()
 
     @property
     def _images(self):
@@ -196,12 +254,27 @@ class _Package(object):
         for image in image_parts:
             self.__images._loadpart(image)
 
+        # gather chart and embedded workbook parts so parts added later are
+        # named after them
+        self.__charts = _ChartCollection(self)
+        chart_parts = [part for part in self._parts
+                       if part.__class__.__name__ == '_Chart']
+        for chart in chart_parts:
+            self.__charts._loadpart(chart)
+        self.__xlsx = _xlsxCollection(self)
+        xlsx_parts = [part for part in self._parts
+                      if part._content_type == CT_EXCEL_XLSX]
+        for xlsx in xlsx_parts:
+            self.__xlsx._loadpart(xlsx)
+
     def __open(self, file):
         """
         Load presentation contained in *file* into this package.
         """
-        pkg = pptx.packaging.Package().open(file)
-        self.__load(pkg.relationships)
+        with phase('open'):
+            pkg = pptx.packaging.Package().open(file)
+            with phase('open.model_build'):
+                self.__load(pkg.relationships)
         # unmarshal relationships selectively for now
         for rel in self.__relationships:
             if rel._reltype == RT_OFFICE_DOCUMENT:
@@ -468,6 +541,10 @@ class _Relationship(object):
     def _rId(self, value):
         self.__rId = value
 
+    @_target.setter
+    def _target(self, target):
+        self.__target = target
+
 
 # ============================================================================
 # Parts
@@ -586,6 +663,11 @@ class _BasePart(_Observable):
        be set to ``None`` by subclasses that override ._blob after content is
        unmarshaled, to free up memory.
 
+    .. attribute:: _source_bytes
+
+       Size in bytes of the part as read from the package file, 0 for a part
+       created since the package was opened.
+
     .. attribute:: _relationships
 
        |_RelationshipCollection| instance containing the relationships for this
@@ -602,6 +684,7 @@ class _BasePart(_Observable):
         self.__partname = partname
         self._element = None
         self._load_blob = None
+        self._source_bytes = 0
         self._relationships = _RelationshipCollection()
 
     @property
@@ -610,11 +693,19 @@ class _BasePart(_Observable):
         Default is to return unchanged _load_blob. Dynamic parts will override.
         Raises |ValueError| if _load_blob is None.
         """
+        return self._serialize()
+
+    def _serialize(self, pretty_print=True):
+        """
+        Return the content of this part as a byte string suitable for writing
+        to a package. XML parts are serialized from _element, indented only
+        when *pretty_print* is True. Binary parts return _load_blob.
+        """
         if self.partname.endswith('.xml'):
             assert self._element is not None, '_BasePart._blob is undefined '\
                 'for xml parts when part.__element is None'
-            xml = oxml_tostring(self._element, encoding='UTF-8',
-                                pretty_print=True, standalone=True)
+            xml = etree.tostring(self._element, encoding='UTF-8',
+                                 pretty_print=pretty_print, standalone=True)
             return xml
         # default for binary parts is to return _load_blob unchanged
         assert self._load_blob, "_BasePart._blob called on part with no "\
@@ -661,6 +752,17 @@ class _BasePart(_Observable):
         self._relationships._additem(rel)
         return rel
 
+    def _close(self):
+        """
+        Drop the XML tree or blob of this part, its relationships and its
+        observers, breaking the reference cycles it's part of. Subclasses
+        extend this to drop what they hold besides.
+        """
+        self._element = None
+        self._load_blob = None
+        del self._observers[:]
+        self._relationships = _RelationshipCollection()
+
     def _load(self, pkgpart, part_dict):
         """
         Load part and relationships from package part, and propagate load
@@ -672,8 +774,11 @@ class _BasePart(_Observable):
         # set attributes from package part
         self.__content_type = pkgpart.content_type
         self.__partname = pkgpart.partname
+        self._source_bytes = len(pkgpart.blob)
         if pkgpart.partname.endswith('.xml'):
-            self._element = oxml_fromstring(pkgpart.blob)
+            with phase('open.xml_parse', partname=pkgpart.partname,
+                       bytes=len(pkgpart.blob)):
+                self._element = oxml_fromstring(pkgpart.blob)
         else:
             self._load_blob = pkgpart.blob
 
@@ -777,8 +882,15 @@ class Presentation(_BasePart):
         """
         return self.__charts
 
-    @property
-    def _blob(self):
+    def _close(self):
+        """Drop the slide, slide master and chart collections as well."""
+        super(Presentation, self)._close()
+        self.__slidemasters = None
+        self.__slides = None
+        self.__charts = None
+        self.__xlsx = None
+
+    def _serialize(self, pretty_print=True):
         """
         Rewrite sldId elements in sldIdLst before handing over to super for
         transformation of _element into a blob.
@@ -789,7 +901,7 @@ class Presentation(_BasePart):
         # self.__rewrite_notesMasterIdLst()
         # self.__rewrite_handoutMasterIdLst()
         # self.__rewrite_sldMasterIdLst()
-        return super(Presentation, self)._blob
+        return super(Presentation, self)._serialize(pretty_print)
 
     def _load(self, pkgpart, part_dict):
         """
@@ -824,13 +936,13 @@ class Presentation(_BasePart):
         reflect current ordering of slide relationships and possible
         renumbering of ``rId`` values.
         """
-        sldIdLst = _child(self._element, 'p:sldIdLst', _nsmap)
+        sldIdLst = _child(self._element, 'p:sldIdLst')
         if sldIdLst is None:
             sldIdLst = self.__add_sldIdLst()
         sldIdLst.clear()
         sld_rels = self._relationships.rels_of_reltype(RT_SLIDE)
         for idx, rel in enumerate(sld_rels):
-            sldId = _Element('p:sldId', _nsmap)
+            sldId = _Element('p:sldId')
             sldIdLst.append(sldId)
             sldId.set('id', str(256+idx))
             sldId.set(qn('r:id'), rel._rId)
@@ -840,16 +952,16 @@ class Presentation(_BasePart):
         Add a <p:sldIdLst> element to <p:presentation> in the right sequence
         among its siblings.
         """
-        sldIdLst = _child(self._element, 'p:sldIdLst', _nsmap)
+        sldIdLst = _child(self._element, 'p:sldIdLst')
         assert sldIdLst is None, '__add_sldIdLst() called where '\
                                  '<p:sldIdLst> already exists'
-        sldIdLst = _Element('p:sldIdLst', _nsmap)
+        sldIdLst = _Element('p:sldIdLst')
         # insert new sldIdLst element in right sequence
-        sldSz = _child(self._element, 'p:sldSz', _nsmap)
+        sldSz = _child(self._element, 'p:sldSz')
         if sldSz is not None:
             sldSz.addprevious(sldIdLst)
         else:
-            notesSz = _child(self._element, 'p:notesSz', _nsmap)
+            notesSz = _child(self._element, 'p:notesSz')
             notesSz.addprevious(sldIdLst)
         return sldIdLst
 
@@ -927,7 +1039,7 @@ class _Image(_BasePart):
         image in pixels.
         """
         image_stream = StringIO(self._blob)
-        width_px, height_px = PIL_Image.open(image_stream).size
+        width_px, height_px = _pil_image().open(image_stream).size
         image_stream.close()
         return width_px, height_px
 
@@ -969,7 +1081,7 @@ class _Image(_BasePart):
         ext_map = {'GIF': '.gif', 'JPEG': '.jpg', 'PNG': '.png',
                    'TIFF': '.tiff', 'WMF': '.wmf'}
         stream.seek(0)
-        format = PIL_Image.open(stream).format
+        format = _pil_image().open(stream).format
         if format not in ext_map:
             tmpl = "unsupported image format, expected one of: %s, got '%s'"
             raise ValueError(tmpl % (ext_map.keys(), format))
@@ -1046,7 +1158,7 @@ class _BaseSlide(_BasePart):
     @property
     def name(self):
         """Internal name of this slide-like object."""
-        cSld = self._element.cSld
+        cSld = _child(self._element, 'p:cSld')
         return cSld.get('name', default='')
 
     @property
@@ -1067,14 +1179,22 @@ class _BaseSlide(_BasePart):
         rel = self._add_relationship(RT_IMAGE, image)
         return (image, rel)
     
-    def _add_chart(self,data,headings_xlsx,file):
+    def _add_chart(self, data, headings_xlsx, file, chart_type=XL.LINE):
         """
-        Return a tuple ``(image, relationship)`` representing the |Image| part
-        specified by *file*. If a matching image part already exists it is
-        reused. If the slide already has a relationship to an existing image,
-        that relationship is reused.
+        Return a tuple ``(chart, relationship)`` representing a new chart
+        part of *chart_type* plotting *data*, whose data is embedded as the
+        Excel workbook in *file*. The workbook part is added to the package
+        the chart belongs to, which names it.
         """
-        image = self._package._charts.add_chart(data,headings_xlsx,file)
+        xlsx = self._package._xlsx.add_xlsx(file)
+        try:
+            image = self._package._charts.add_chart(
+                data, headings_xlsx, xlsx, chart_type)
+        except ValueError:
+            # don't leave behind a workbook no chart embeds
+            if xlsx not in self._package._parts:
+                self._package._xlsx.remove_xlsx(xlsx)
+            raise
         rel = self._add_relationship(RT_CHART, image)
         return (image, rel)
     
@@ -1091,12 +1211,18 @@ class _BaseSlide(_BasePart):
 
 
     
+    def _close(self):
+        """Drop the shape collection as well."""
+        super(_BaseSlide, self)._close()
+        self._shapes = None
+
     def _load(self, pkgpart, part_dict):
         """Handle aspects of loading that are general to slide types."""
         # call parent to do generic aspects of load
         super(_BaseSlide, self)._load(pkgpart, part_dict)
         # unmarshal shapes
-        self._shapes = _ShapeCollection(self._element.cSld.spTree, self)
+        spTree = _child(self._element, 'p:cSld/p:spTree')
+        self._shapes = _ShapeCollection(spTree, self)
         # return self-reference to allow generative calling
         return self
 
@@ -1114,7 +1240,8 @@ class _Slide(_BaseSlide):
         super(_Slide, self).__init__(CT_SLIDE)
         self.__slidelayout = slidelayout
         self._element = self.__minimal_element
-        self._shapes = _ShapeCollection(self._element.cSld.spTree, self)
+        spTree = _child(self._element, 'p:cSld/p:spTree')
+        self._shapes = _ShapeCollection(spTree, self)
         # if slidelayout, this is a slide being added, not one being loaded
         if slidelayout:
             self._shapes._clone_layout_placeholders(slidelayout)
@@ -1128,6 +1255,11 @@ class _Slide(_BaseSlide):
         """
         return self.__slidelayout
 
+    def _close(self):
+        """Drop the reference to the slide layout as well."""
+        super(_Slide, self)._close()
+        self.__slidelayout = None
+
     def _load(self, pkgpart, part_dict):
         """
         Load slide from package part.
@@ -1147,15 +1279,15 @@ class _Slide(_BaseSlide):
         is required by the XMLSchema.
         """
         sld = _Element('p:sld', _nsmap)
-        _SubElement(sld, 'p:cSld', _nsmap)
-        _SubElement(sld.cSld, 'p:spTree', _nsmap)
-        _SubElement(sld.cSld.spTree, 'p:nvGrpSpPr', _nsmap)
-        _SubElement(sld.cSld.spTree.nvGrpSpPr, 'p:cNvPr', _nsmap)
-        _SubElement(sld.cSld.spTree.nvGrpSpPr, 'p:cNvGrpSpPr', _nsmap)
-        _SubElement(sld.cSld.spTree.nvGrpSpPr, 'p:nvPr', _nsmap)
-        _SubElement(sld.cSld.spTree, 'p:grpSpPr', _nsmap)
-        sld.cSld.spTree.nvGrpSpPr.cNvPr.set('id', '1')
-        sld.cSld.spTree.nvGrpSpPr.cNvPr.set('name', '')
+        cSld = _SubElement(sld, 'p:cSld', _nsmap)
+        spTree = _SubElement(cSld, 'p:spTree', _nsmap)
+        nvGrpSpPr = _SubElement(spTree, 'p:nvGrpSpPr', _nsmap)
+        cNvPr = _SubElement(nvGrpSpPr, 'p:cNvPr', _nsmap)
+        _SubElement(nvGrpSpPr, 'p:cNvGrpSpPr', _nsmap)
+        _SubElement(nvGrpSpPr, 'p:nvPr', _nsmap)
+        _SubElement(spTree, 'p:grpSpPr', _nsmap)
+        cNvPr.set('id', '1')
+        cNvPr.set('name', '')
         return sld
 
 
@@ -1175,6 +1307,11 @@ class _SlideLayout(_BaseSlide):
                                                 "referenced before assigned")
         return self.__slidemaster
 
+    def _close(self):
+        """Drop the reference to the slide master as well."""
+        super(_SlideLayout, self)._close()
+        self.__slidemaster = None
+
     def _load(self, pkgpart, part_dict):
         """
         Load slide layout from package part.
@@ -1213,6 +1350,11 @@ class _SlideMaster(_BaseSlide):
         """
         return self.__slidelayouts
 
+    def _close(self):
+        """Drop the slide layout collection as well."""
+        super(_SlideMaster, self)._close()
+        self.__slidelayouts = None
+
     def _load(self, pkgpart, part_dict):
         """
         Load slide master from package part.
@@ -1244,10 +1386,10 @@ class _ChartCollection(_PartCollection,):
         
 
 
-    def add_chart(self,data,headings_xlsx,file):
+    def add_chart(self, data, headings_xlsx, xlsx, chart_type=XL.LINE):
         """Add a new slide that inherits layout from *slidelayout*."""
         # 1. construct new slide
-        chart = _Chart(data,headings_xlsx,file)
+        chart = _Chart(data, headings_xlsx, xlsx, chart_type)
         #chart = CT_Chart_Container.new_chart(data,headings_xlsx)
         # 2. add it to this collection
         self._values.append(chart)
@@ -1257,7 +1399,6 @@ class _ChartCollection(_PartCollection,):
         #self.__presentation._add_relationship(RT_CHART, chart)
         # 5. return reference to new slide
         #rel = self.__presentation._add_relationship(RT_CHART, chart)
-        #print rel
         return chart
     
 
@@ -1280,31 +1421,81 @@ class _Chart(_BaseSlide):
     """
     Slide part. Corresponds to package files ppt/slides/slide[1-9][0-9]*.xml.
     """
-    def __init__(self,data, headings_xlsx,file):
+    def __init__(self, data=None, headings_xlsx=None, xlsx=None,
+                 chart_type=XL.LINE):
         super(_Chart, self).__init__(CT_CHART)
         #self._values= self.__minimal_element
         
         
-        self.xlsx = _xlsxCollection(self)
-        xlsx = self.xlsx.add_xlsx(file)
+        # data of the chart's deferred caches, written when chart is saved
+        self.__sources = []
+        # chart parts loaded from a package are populated by _load()
+        if data is None:
+            return
         rel =self._add_relationship(RT_EXCEL_XLSX, xlsx)
         rId = rel._rId
-        print rId[3:]
-        
-        
-        chrt = self.add_chart(data,headings_xlsx,rId)
+        chrt = self.add_chart(
+            data, headings_xlsx, rId, chart_type, self.__sources)
         self._element=chrt
         #self._element = self.__chart_full(data, headings_xlsx)
 
+    def _close(self):
+        """Drop the data of the deferred caches as well."""
+        super(_Chart, self)._close()
+        del self.__sources[:]
+
+    @property
+    def _deferred_series(self):
+        """
+        List of the sequences of values held for this chart's deferred
+        caches until the chart is written, empty for a loaded chart.
+        """
+        return [series for series, is_text in self.__sources]
+
     def _load(self, pkgpart, part_dict):
         """
         Load chart from package part.
         """
-        # call parent to do generic aspects of load
-        super(_Chart, self)._load(pkgpart, part_dict)
-
+        # chart part has no shape tree, so skip _BaseSlide shape loading and
+        # do only the generic aspects of load
+        super(_BaseSlide, self)._load(pkgpart, part_dict)
         return self
 
+    def _serialize(self, pretty_print=True):
+        """
+        Return the XML of this chart as a byte string. The points of a new
+        chart's data caches aren't held in its element tree but written from
+        the chart data as the XML is generated.
+        """
+        if not self.__sources:
+            return super(_Chart, self)._serialize(pretty_print)
+        stream = BytesIO()
+        CT_Chart_Container.write_chart(
+            self._element, self.__sources, stream, pretty_print)
+        return stream.getvalue()
+
+    def _spool(self, pretty_print=True):
+        """
+        Return the path of a new temporary file containing the XML of this
+        chart, or |None| if the chart's deferred data caches hold no more
+        than :data:`CHART_SPOOL_POINTS` points, in which case serializing it
+        in memory is cheaper. The XML is written to the file as it's
+        generated, so the whole chart is never in memory at once. The caller
+        removes the file when done.
+        """
+        point_count = sum([len(series) for series, is_text in self.__sources])
+        if point_count <= CHART_SPOOL_POINTS:
+            return None
+        fd, path = tempfile.mkstemp(suffix='.xml')
+        try:
+            with os.fdopen(fd, 'wb') as stream:
+                CT_Chart_Container.write_chart(
+                    self._element, self.__sources, stream, pretty_print)
+        except:
+            os.remove(path)
+            raise
+        return path
+
     @property
     def __minimal_element(self):
         """
@@ -1317,9 +1508,114 @@ class _Chart(_BaseSlide):
         return 
     
     @staticmethod
-    def add_chart (data,headings_xlsx,rId):
-        chrt = CT_Chart_Container.new_chart(data,headings_xlsx,rId)
+    def add_chart(data, headings_xlsx, rId, chart_type=XL.LINE,
+                  sources=None):
+        chrt = CT_Chart_Container.new_chart(
+            data, headings_xlsx, rId, chart_type, sources)
         return chrt
+
+    def replace_data(self, categories, series):
+        """
+        Replace the data plotted by this chart with *categories* and
+        *series*, a sequence holding the values of each series in the chart,
+        in chart order. Only the ``<c:strCache>`` and ``<c:numCache>``
+        elements of the chart XML and the referenced cells of the embedded
+        worksheet are rewritten, so the chart's formatting is preserved.
+        Series formulas are resized to the new number of points. Raises
+        |ValueError| if the number of sequences in *series* doesn't match
+        the number of series in the chart, a series doesn't get its data
+        from worksheet references or the embedded workbook is malformed, in
+        which case the chart is left unchanged. The old workbook part is
+        dropped from the package once no chart embeds it.
+        """
+        sers = _xpath('./c:chart/c:plotArea/*/c:ser')(self._element)
+        if len(series) != len(sers):
+            tmpl = "chart has %d series, got values for %d"
+            raise ValueError(tmpl % (len(sers), len(series)))
+        if _is_date_series(categories):
+            categories = _excel_serials(categories)
+        else:
+            categories = _series_values(categories)
+
+        # the new caches, formulas and workbook are all built before the
+        # chart is changed, so a failure leaves the chart as it was
+        refs = []
+        for ser, values in zip(sers, series):
+            cat_refs = _xpath('./c:cat/c:strRef|./c:cat/c:numRef|'
+                              './c:xVal/c:strRef|./c:xVal/c:numRef')(ser)
+            val_refs = _xpath('./c:val/c:numRef|./c:yVal/c:numRef')(ser)
+            if not (cat_refs and val_refs):
+                raise ValueError("chart series has no worksheet reference")
+            refs.append((cat_refs[0], categories))
+            refs.append((val_refs[0], _series_values(values)))
+        changes = [self.__ref_change(ref, values) for ref, values in refs]
+
+        # edits to workbook cells, keyed by the formula of their old range
+        # so categories shared by the series are written just once
+        edits = {}
+        for ref, values in refs:
+            cell_range = CellRange.parse(_child(ref, 'c:f').text)
+            if cell_range is not None:
+                edits[cell_range.formula] = (cell_range, values)
+        # workbook parts can be shared by charts, so rather than being
+        # edited in place the workbook is replaced by an edited copy
+        rel = self.__xlsx_rel
+        new_xlsx = None
+        if rel is not None and edits:
+            blob = replace_columns(rel._target._blob, edits.values())
+            new_xlsx = self._package._xlsx.add_xlsx(BytesIO(blob))
+
+        for (ref, values), (cache, formula) in zip(refs, changes):
+            CT_ChartCell.set_cache(ref, cache)
+            if formula is not None:
+                _child(ref, 'c:f')._setText(formula)
+        # every deferred cache has now been replaced
+        del self.__sources[:]
+        if new_xlsx is not None:
+            old_xlsx = rel._target
+            rel._target = new_xlsx
+            if not self.__is_referenced(old_xlsx):
+                self._package._xlsx.remove_xlsx(old_xlsx)
+
+    @staticmethod
+    def __ref_change(ref, values):
+        """
+        Return a ``(cache, formula)`` pair holding the new cache element for
+        *ref* caching *values* and its formula resized to the new number of
+        values, or |None| for the formula when it isn't a plain
+        single-column range. *ref* is not changed.
+        """
+        cache = CT_ChartCell.new_cache(ref, values)
+        cell_range = CellRange.parse(_child(ref, 'c:f').text)
+        if cell_range is None:
+            return cache, None
+        return cache, cell_range.resized(len(values)).formula
+
+    def __is_referenced(self, part):
+        """
+        Return True if any part of this chart's package has a relationship to
+        *part*.
+        """
+        for pkg_part in self._package._parts:
+            for rel in pkg_part._relationships:
+                if rel._target is part:
+                    return True
+        return False
+
+    @property
+    def __xlsx_rel(self):
+        """
+        The relationship to the embedded workbook part holding this chart's
+        data, or |None| if the chart has no embedded workbook.
+        """
+        externalData = _child(self._element, 'c:externalData')
+        if externalData is None:
+            return None
+        rId = externalData.get(qn('r:id'))
+        for rel in self._relationships:
+            if rel._rId == rId:
+                return rel
+        return None
     
 # ============================================================================
 # Excel xlsx Parts
@@ -1328,36 +1624,70 @@ class _Chart(_BaseSlide):
 
 class _xlsxCollection(_PartCollection):
     """
- 
+    Sequence of the embedded Excel workbook parts belonging to an instance of
+    |_Package|. Like an image, a workbook with particular content appears
+    only once, however many charts embed it. Each workbook added is named
+    with the next number in a sequence kept by the collection, e.g.
+    ``/ppt/embeddings/Microsoft_Excel_Worksheet3.xlsx``, so naming doesn't
+    depend on other packages and the same deck always gets the same
+    partnames. Adding a workbook is safe from multiple threads.
     """
+    __partname_tmpl = '/ppt/embeddings/Microsoft_Excel_Worksheet%d.xlsx'
+    __partname_re = re.compile(
+        r'^/ppt/embeddings/Microsoft_Excel_Worksheet([1-9][0-9]*)\.xlsx$')
+
     def __init__(self,presentation):
         super(_xlsxCollection, self).__init__()
         self.__presentation = presentation
+        self.__lock = threading.Lock()
+        self.__last_idx = 0
+        self.__parts_by_sha1 = {}
 
     def add_xlsx(self, file):
         """
-        
+        Return workbook part containing the Excel workbook in *file*, which
+        is either a path to an ``.xlsx`` file or a file-like object
+        containing one. If a part containing this same workbook already
+        exists, that part is returned. Otherwise a new one is created.
         """
-        # use _Image constructor to validate and characterize image file
         xlsx = _Xlsx(file)
-        self._values.append(xlsx)
-        self.__rename_xlsx()
+        sha1 = xlsx._sha1
+        with self.__lock:
+            # return matching workbook if found
+            existing_xlsx = self.__parts_by_sha1.get(sha1)
+            if existing_xlsx is not None:
+                return existing_xlsx
+            # otherwise name it, add it to collection and return it
+            self.__last_idx += 1
+            xlsx.partname = self.__partname_tmpl % self.__last_idx
+            self._values.append(xlsx)
+            self.__parts_by_sha1[sha1] = xlsx
         return xlsx
 
-    def __rename_xlsx(self):
+    def remove_xlsx(self, xlsx):
         """
-        Assign partnames like ``/ppt/media/image9.png`` to all images in the
-        collection. The name portion is always ``image``. The number part
-        forms a continuous sequence starting at 1 (e.g. 1, 2, 3, ...). The
-        extension is preserved during renaming.
+        Remove workbook part *xlsx* from the collection, e.g. once a chart
+        has been given an edited copy and nothing else refers to it. Other
+        workbooks keep their partnames.
         """
-        for idx, image in enumerate(self._values):
-            global wsID
-            wsID = wsID +1
-            #print wsID
-            image.partname = '/ppt/embeddings/Microsoft_Excel_Worksheet%d.xlsx' % (wsID)
-            
+        with self.__lock:
+            if xlsx in self._values:
+                self._values.remove(xlsx)
+            sha1 = hashlib.sha1(xlsx._blob).hexdigest()
+            if self.__parts_by_sha1.get(sha1) is xlsx:
+                del self.__parts_by_sha1[sha1]
 
+    def _loadpart(self, part):
+        """
+        Add workbook *part* loaded from a package. Workbooks added afterward
+        are numbered after it so their partnames don't collide with its.
+        """
+        match = self.__partname_re.match(part.partname)
+        if match:
+            self.__last_idx = max(self.__last_idx, int(match.group(1)))
+        self._values.append(part)
+        sha1 = hashlib.sha1(part._blob).hexdigest()
+        self.__parts_by_sha1.setdefault(sha1, part)
 
 
 class _Xlsx(_BasePart):
@@ -1383,6 +1713,11 @@ class _Xlsx(_BasePart):
         """
         return self._load_blob
 
+    @property
+    def _sha1(self):
+        """Return SHA1 hash digest for workbook"""
+        return hashlib.sha1(self._blob).hexdigest()
+
     def _load(self, pkgpart, part_dict):
         """Handle aspects of loading that are particular to image parts."""
         # call parent to do generic aspects of load
@@ -1414,5 +1749,8 @@ class _Xlsx(_BasePart):
             self._content_type = self.__image_ext_content_type(self.__ext)
             with open(self.__filepath, 'rb') as f:
                 self._load_blob = f.read()
- 
-
+        else:  # assume file is a file-like object containing an xlsx file
+            self.__ext = '.xlsx'
+            self._content_type = self.__image_ext_content_type(self.__ext)
+            file.seek(0)
+            self._load_blob = file.read()
@@ -11,19 +11,21 @@
 Classes that implement PowerPoint shapes such as picture, textbox, and table.
 """
 
-from numbers import Number
+import threading
 
-import xlsxwriter
-import string
+from datetime import datetime
+from io import BytesIO
+from itertools import izip_longest
+from numbers import Number
 
-from pptx.constants import MSO
+from pptx.constants import MSO, XL_CHART_TYPE as XL
 from pptx.oxml import (
-    _get_or_add, qn, _Element, _SubElement, CT_GraphicalObjectFrame,
+    DATE_FORMAT_CODE, _get_or_add, _is_date_series, qn, _Element,
+    _series_values, _SubElement, _xpath, CT_GraphicalObjectFrame,
     CT_Picture, CT_Shape
 )
 from pptx.spec import (
-    autoshape_types, namespaces, ParagraphAlignment, slide_ph_basenames,
-    VerticalAnchor
+    autoshape_types, ParagraphAlignment, slide_ph_basenames, VerticalAnchor
 )
 from pptx.spec import (
     PH_ORIENT_HORZ, PH_ORIENT_VERT, PH_SZ_FULL, PH_TYPE_DT, PH_TYPE_FTR,
@@ -33,23 +35,39 @@ from pptx.util import Collection
 # import logging
 # log = logging.getLogger('pptx.shapes')
 
-# default namespace map for use in lxml calls
-_nsmap = namespaces('a', 'r', 'p')
+# charts with more values than this get a workbook built in constant memory
+_IN_MEMORY_WORKBOOK_POINTS = 100000
 
 
-def _child(element, child_tagname, nsmap=None):
+def _child(element, child_tagname):
     """
     Return direct child of *element* having *child_tagname* or |None| if no
     such child element is present.
     """
-    # use default nsmap if not specified
-    if nsmap is None:
-        nsmap = _nsmap
-    xpath = './%s' % child_tagname
-    matching_children = element.xpath(xpath, namespaces=nsmap)
+    matching_children = _xpath('./%s' % child_tagname)(element)
     return matching_children[0] if len(matching_children) else None
 
 
+def _iter_rows(data, chunk_size=4096):
+    """
+    Generate the rows of the table whose columns are the sequences in
+    *data*, as tuples, padding short columns with |None|. NaN values are
+    also given as |None|, so they're written as blank cells, as they're
+    missing points in the chart. Columns are converted with
+    ``_series_values()`` a chunk of *chunk_size* rows at a time, so no
+    full-length copy of a column is made.
+    """
+    row_count = max([len(series) for series in data])
+    for start in xrange(0, row_count, chunk_size):
+        chunks = [_series_values(series[start:start+chunk_size])
+                  for series in data]
+        # NaN is the only value not equal to itself
+        columns = [[None if value != value else value for value in chunk]
+                   for chunk in chunks]
+        for row in izip_longest(*columns):
+            yield row
+
+
 def _to_unicode(text):
     """
     Return *text* as a unicode string.
@@ -248,34 +266,40 @@ class _AutoShapeType(object):
 
     """
     __instances = {}
+    __instances_lock = threading.Lock()
+
+    # prst -> autoshape_type_id and prst -> avLst indexes of
+    # pptx.spec.autoshape_types, built on first use by __load_prst_indexes()
+    __ids_by_prst = None
+    __avLsts_by_prst = None
 
     def __new__(cls, autoshape_type_id):
         """
-        Only create new instance on first call for content_type. After that,
-        use cached instance.
-        """
-        # if there's not a matching instance in the cache, create one
-        if autoshape_type_id not in cls.__instances:
-            inst = super(_AutoShapeType, cls).__new__(cls)
-            cls.__instances[autoshape_type_id] = inst
-        # return the instance; note that __init__() gets called either way
-        return cls.__instances[autoshape_type_id]
-
-    def __init__(self, autoshape_type_id):
+        Only create new instance on first call for autoshape_type_id. After
+        that, use cached instance. An instance is fully loaded before it's
+        cached, under a lock, so a thread never sees one another thread is
+        still loading.
+        """
+        inst = cls.__instances.get(autoshape_type_id)
+        if inst is None:
+            with cls.__instances_lock:
+                inst = cls.__instances.get(autoshape_type_id)
+                if inst is None:
+                    inst = super(_AutoShapeType, cls).__new__(cls)
+                    inst.__load(autoshape_type_id)
+                    cls.__instances[autoshape_type_id] = inst
+        return inst
+
+    def __load(self, autoshape_type_id):
         """Initialize attributes from constant values in pptx.spec"""
-        # skip loading if this instance is from the cache
-        if hasattr(self, '_loaded'):
-            return
         # raise on bad autoshape_type_id
         if autoshape_type_id not in autoshape_types:
             tmpl = "no autoshape type with id %d in pptx.spec.autoshape_types"
             raise KeyError(tmpl % autoshape_type_id)
-        # otherwise initialize new instance
         autoshape_type = autoshape_types[autoshape_type_id]
         self.__autoshape_type_id = autoshape_type_id
         self.__prst = autoshape_type['prst']
         self.__basename = autoshape_type['basename']
-        self._loaded = True
 
     @property
     def autoshape_type_id(self):
@@ -290,34 +314,53 @@ class _AutoShapeType(object):
         """
         return self.__basename
 
-    @staticmethod
-    def default_adjustment_values(prst):
+    @classmethod
+    def default_adjustment_values(cls, prst):
         """
         Return sequence of name, value tuples representing the adjustment
         value defaults for the auto shape type identified by *prst*.
         """
-        try:
-            autoshape_type_id = _AutoShapeType._lookup_id_by_prst(prst)
-        except KeyError:
-            return ()
-        return autoshape_types[autoshape_type_id]['avLst']
+        if cls.__avLsts_by_prst is None:
+            cls.__load_prst_indexes()
+        return cls.__avLsts_by_prst.get(prst, ())
 
     @property
     def desc(self):
         """Informal description of this auto shape type"""
         return self.__desc
 
-    @staticmethod
-    def _lookup_id_by_prst(prst):
+    @classmethod
+    def _lookup_id_by_prst(cls, prst):
         """
         Return auto shape id (e.g. ``MSO.SHAPE_RECTANGLE``) corresponding to
         specified preset geometry keyword *prst*.
         """
+        if cls.__ids_by_prst is None:
+            cls.__load_prst_indexes()
+        if prst not in cls.__ids_by_prst:
+            msg = "no auto shape with prst '%s'" % prst
+            raise KeyError(msg)
+        return cls.__ids_by_prst[prst]
+
+    @classmethod
+    def __load_prst_indexes(cls):
+        """
+        Index the auto shape types in ``pptx.spec.autoshape_types`` by prst
+        so lookups don't scan the whole table. Where more than one auto shape
+        type shares a prst, the first one in iteration order wins, as it did
+        for a scan. Each index is complete before it's assigned, so threads
+        racing to build them only duplicate the work.
+        """
+        ids_by_prst = {}
+        avLsts_by_prst = {}
         for autoshape_type_id, attribs in autoshape_types.iteritems():
-            if attribs['prst'] == prst:
-                return autoshape_type_id
-        msg = "no auto shape with prst '%s'" % prst
-        raise KeyError(msg)
+            prst = attribs['prst']
+            if prst in ids_by_prst:
+                continue
+            ids_by_prst[prst] = autoshape_type_id
+            avLsts_by_prst[prst] = tuple(attribs['avLst'])
+        cls.__avLsts_by_prst = avLsts_by_prst
+        cls.__ids_by_prst = ids_by_prst
 
     @property
     def prst(self):
@@ -338,7 +381,7 @@ class _BaseShape(object):
         super(_BaseShape, self).__init__()
         self._element = shape_element
         # e.g. nvSpPr for shape, nvPicPr for pic, etc.
-        self.__nvXxPr = shape_element.xpath('./*[1]', namespaces=_nsmap)[0]
+        self.__nvXxPr = _xpath('./*[1]')(shape_element)[0]
 
     @property
     def has_textframe(self):
@@ -352,7 +395,7 @@ class _BaseShape(object):
         """
         Id of this shape. Note that ids are constrained to positive integers.
         """
-        return int(self.__nvXxPr.cNvPr.get('id'))
+        return int(_child(self.__nvXxPr, 'p:cNvPr').get('id'))
 
     @property
     def is_placeholder(self):
@@ -360,12 +403,12 @@ class _BaseShape(object):
         True if this shape is a placeholder. A shape is a placeholder if it
         has a <p:ph> element.
         """
-        return _child(self.__nvXxPr.nvPr, 'p:ph') is not None
+        return _child(self.__nvXxPr, 'p:nvPr/p:ph') is not None
 
     @property
     def name(self):
         """Name of this shape."""
-        return self.__nvXxPr.cNvPr.get('name')
+        return _child(self.__nvXxPr, 'p:cNvPr').get('name')
 
     def _set_text(self, text):
         """Replace all text in shape with single run containing *text*"""
@@ -410,7 +453,7 @@ class _BaseShape(object):
         """
         True if this shape is a title placeholder.
         """
-        ph = _child(self.__nvXxPr.nvPr, 'p:ph')
+        ph = _child(self.__nvXxPr, 'p:nvPr/p:ph')
         if ph is None:
             return False
         # idx defaults to 0 when idx attr is absent
@@ -536,35 +579,37 @@ class _ShapeCollection(_BaseShape, Collection):
         self.__shapes.append(table)
         return table
     # Added by Hussain Place Holder
-    def add_chart(self, left, top, width, height,data,headings_xlsx):
-        """
-        adding xlsx writer for excel file that is stored in /temp/ folder
-        
-        """
-        #name = 'temp/Worksheet.xlsx'
-        workbook = xlsxwriter.Workbook('temp/Worksheet.xlsx')
-        worksheet = workbook.add_worksheet()
-        bold = workbook.add_format({'bold': 1})
-    
-        # Add the worksheet data that the charts will refer to.
-        
-        
-        for i,e in enumerate(headings_xlsx):
-            if i ==0:
-                worksheet.write_row('A1', headings_xlsx, bold)
-                worksheet.write_column(string.uppercase[i]+'2',data[i])
-            else:
-                worksheet.write_column(string.uppercase[i]+'2',data[i])
-        
-        """
-        
-        
-        
-        """
-        
-        
+    def add_chart(self, left, top, width, height, data, headings_xlsx,
+                  chart_type=XL.LINE, decimation=None, max_points=2000,
+                  keep_full_data=False):
+        """
+        Add a chart of *data* at the specified position. *chart_type* is a
+        member of ``XL_CHART_TYPE``, e.g. ``XL_CHART_TYPE.COLUMN_CLUSTERED``,
+        and defaults to a line chart. The first sequence in *data* holds the
+        categories, or the x values of a scatter chart; when these are dates
+        the chart is given a date axis. The chart data is also embedded in
+        the package as an Excel workbook, which is built in memory rather
+        than written to disk.
+
+        Data with more than *max_points* points is downsampled before it's
+        charted when *decimation* names one of the methods of
+        :func:`pptx.decimate.decimate`, e.g. ``'lttb'``. The workbook then
+        holds the same downsampled data as the chart, unless
+        *keep_full_data* is True, in which case the full data is also
+        written to a second worksheet, ``'Full data'``.
+        """
+        full_data = None
+        if decimation is not None:
+            # imported here as it imports NumPy, slow to import when present
+            from pptx.decimate import decimate
+            chart_data = decimate(data, max_points, decimation)
+            if keep_full_data and chart_data is not data:
+                full_data = data
+            data = chart_data
+        xlsx_stream = self.__chart_workbook(data, headings_xlsx, full_data)
         id = self.__next_shape_id
-        chart, rel = self.__slide._add_chart(data,headings_xlsx,'temp/Worksheet.xlsx')
+        chart, rel = self.__slide._add_chart(
+            data, headings_xlsx, xlsx_stream, chart_type)
         rId = rel._rId
         
         name = 'Chart %d' % (id-1)
@@ -574,6 +619,51 @@ class _ShapeCollection(_BaseShape, Collection):
 
         return graphicFrame
     
+    @staticmethod
+    def __chart_workbook(data, headings_xlsx, full_data=None):
+        """
+        Return a file-like object containing an Excel workbook with
+        *headings_xlsx* in its first row and each sequence in *data* in the
+        column below its heading. If *full_data* is not |None|, it's written
+        the same way to a second worksheet named ``'Full data'``. Series may
+        be NumPy arrays; their values are converted to plain Python numbers
+        so xlsxwriter writes them as numbers.
+        The same data always produces the same bytes, so charts of the same
+        data can share one embedded workbook part. The workbook of a chart
+        with more than ``_IN_MEMORY_WORKBOOK_POINTS`` values is built in
+        xlsxwriter's constant-memory mode, which writes each finished row to
+        a temporary file rather than keeping every cell in memory.
+        """
+        sheets = [('Sheet1', data)]
+        if full_data is not None:
+            sheets.append(('Full data', full_data))
+        point_count = sum([len(series) for name, sheet_data in sheets
+                           for series in sheet_data])
+        if point_count > _IN_MEMORY_WORKBOOK_POINTS:
+            options = {'constant_memory': True}
+        else:
+            options = {'in_memory': True}
+        # imported on first use to keep it out of the cost of "import pptx"
+        import xlsxwriter
+        stream = BytesIO()
+        workbook = xlsxwriter.Workbook(stream, options)
+        # fixed creation date, otherwise the current time would be recorded
+        workbook.set_properties({'created': datetime(1980, 1, 1)})
+        bold = workbook.add_format({'bold': 1})
+        # date categories are formatted as dates rather than serial numbers
+        cat_format = None
+        if _is_date_series(data[0]):
+            cat_format = workbook.add_format({'num_format': DATE_FORMAT_CODE})
+        for name, sheet_data in sheets:
+            worksheet = workbook.add_worksheet(name)
+            worksheet.write_row(0, 0, headings_xlsx, bold)
+            # constant-memory mode requires rows be written in order
+            for row_idx, row in enumerate(_iter_rows(sheet_data), 1):
+                worksheet.write(row_idx, 0, row[0], cat_format)
+                worksheet.write_row(row_idx, 1, row[1:])
+        workbook.close()
+        return stream
+
     def add_xlsx(self, file):
         """
         Add picture shape displaying image in *file*, where *file* can be
@@ -649,7 +739,7 @@ class _ShapeCollection(_BaseShape, Collection):
             basename = 'Vertical %s' % basename
         # increment numpart as necessary to make name unique
         numpart = id - 1
-        names = self.__spTree.xpath('//p:cNvPr/@name', namespaces=_nsmap)
+        names = _xpath('//p:cNvPr/@name')(self.__spTree)
         while True:
             name = '%s %d' % (basename, numpart)
             if name not in names:
@@ -664,7 +754,7 @@ class _ShapeCollection(_BaseShape, Collection):
         and making use of any gaps in numbering. In practice, the minimum id
         is 2 because the spTree element is always assigned id="1".
         """
-        cNvPrs = self.__spTree.xpath('//p:cNvPr', namespaces=_nsmap)
+        cNvPrs = _xpath('//p:cNvPr')(self.__spTree)
         ids = [int(cNvPr.get('id')) for cNvPr in cNvPrs]
         ids.sort()
         # first gap in sequence wins, or falls off the end as max(ids)+1
@@ -688,7 +778,7 @@ class _Placeholder(object):
     def __init__(self, shape):
         self.__decorated = shape
         xpath = './*[1]/p:nvPr/p:ph'
-        self.__ph = self._element.xpath(xpath, namespaces=_nsmap)[0]
+        self.__ph = _xpath(xpath)(self._element)[0]
 
     def __getattr__(self, name):
         """
@@ -798,7 +888,8 @@ class _Table(_BaseShape):
     def __init__(self, graphicFrame):
         super(_Table, self).__init__(graphicFrame)
         self.__graphicFrame = graphicFrame
-        self.__tbl_elm = graphicFrame[qn('a:graphic')].graphicData.tbl
+        self.__tbl_elm = _child(graphicFrame,
+                                'a:graphic/a:graphicData/a:tbl')
         self.__rows = _RowCollection(self.__tbl_elm, self)
         self.__columns = _ColumnCollection(self.__tbl_elm, self)
 
@@ -896,7 +987,7 @@ class _Table(_BaseShape):
         """
         Read-only integer height of table in English Metric Units (EMU)
         """
-        return int(self.__graphicFrame.xfrm[qn('a:ext')].get('cy'))
+        return int(self.__ext.get('cy'))
 
     @property
     def rows(self):
@@ -920,7 +1011,7 @@ class _Table(_BaseShape):
         """
         Read-only integer width of table in English Metric Units (EMU)
         """
-        return int(self.__graphicFrame.xfrm[qn('a:ext')].get('cx'))
+        return int(self.__ext.get('cx'))
 
     def _notify_height_changed(self):
         """
@@ -928,7 +1019,7 @@ class _Table(_BaseShape):
         to recalculate its total height (as the sum of the row heights).
         """
         new_table_height = sum([row.height for row in self.rows])
-        self.__graphicFrame.xfrm[qn('a:ext')].set('cy', str(new_table_height))
+        self.__ext.set('cy', str(new_table_height))
 
     def _notify_width_changed(self):
         """
@@ -937,7 +1028,12 @@ class _Table(_BaseShape):
         widths).
         """
         new_table_width = sum([col.width for col in self.columns])
-        self.__graphicFrame.xfrm[qn('a:ext')].set('cx', str(new_table_width))
+        self.__ext.set('cx', str(new_table_width))
+
+    @property
+    def __ext(self):
+        """``<a:ext>`` element holding the extents of the graphic frame"""
+        return _child(self.__graphicFrame, 'p:xfrm/a:ext')
 
 
 class _Cell(object):
@@ -1132,14 +1228,20 @@ class _CellCollection(object):
 
     def __getitem__(self, idx):
         """Provides indexed access, (e.g. 'cells[0]')."""
-        if idx < 0 or idx >= len(self.__tr.tc):
+        tc_lst = self.__tc_lst
+        if idx < 0 or idx >= len(tc_lst):
             msg = "cell index [%d] out of range" % idx
             raise IndexError(msg)
-        return _Cell(self.__tr.tc[idx])
+        return _Cell(tc_lst[idx])
 
     def __len__(self):
         """Supports len() function (e.g. 'len(cells) == 1')."""
-        return len(self.__tr.tc)
+        return len(self.__tc_lst)
+
+    @property
+    def __tc_lst(self):
+        """Sequence of ``<a:tc>`` elements in this row"""
+        return _xpath('./a:tc')(self.__tr)
 
 
 class _ColumnCollection(object):
@@ -1154,14 +1256,20 @@ class _ColumnCollection(object):
 
     def __getitem__(self, idx):
         """Provides indexed access, (e.g. 'columns[0]')."""
-        if idx < 0 or idx >= len(self.__tbl_elm.tblGrid.gridCol):
+        gridCol_lst = self.__gridCol_lst
+        if idx < 0 or idx >= len(gridCol_lst):
             msg = "column index [%d] out of range" % idx
             raise IndexError(msg)
-        return _Column(self.__tbl_elm.tblGrid.gridCol[idx], self.__table)
+        return _Column(gridCol_lst[idx], self.__table)
 
     def __len__(self):
         """Supports len() function (e.g. 'len(columns) == 1')."""
-        return len(self.__tbl_elm.tblGrid.gridCol)
+        return len(self.__gridCol_lst)
+
+    @property
+    def __gridCol_lst(self):
+        """Sequence of ``<a:gridCol>`` elements in this table"""
+        return _xpath('./a:tblGrid/a:gridCol')(self.__tbl_elm)
 
 
 class _RowCollection(object):
@@ -1176,14 +1284,20 @@ class _RowCollection(object):
 
     def __getitem__(self, idx):
         """Provides indexed access, (e.g. 'rows[0]')."""
-        if idx < 0 or idx >= len(self.__tbl_elm.tr):
+        tr_lst = self.__tr_lst
+        if idx < 0 or idx >= len(tr_lst):
             msg = "row index [%d] out of range" % idx
             raise IndexError(msg)
-        return _Row(self.__tbl_elm.tr[idx], self.__table)
+        return _Row(tr_lst[idx], self.__table)
 
     def __len__(self):
         """Supports len() function (e.g. 'len(rows) == 1')."""
-        return len(self.__tbl_elm.tr)
+        return len(self.__tr_lst)
+
+    @property
+    def __tr_lst(self):
+        """Sequence of ``<a:tr>`` elements in this table"""
+        return _xpath('./a:tr')(self.__tbl_elm)
 
 
 # ============================================================================
@@ -1207,7 +1321,8 @@ class _TextFrame(object):
         paragraphs in this text frame. A text frame always contains at least
         one paragraph.
         """
-        return tuple([_Paragraph(p) for p in self.__txBody[qn('a:p')]])
+        p_lst = _xpath('./a:p')(self.__txBody)
+        return tuple([_Paragraph(p) for p in p_lst])
 
     def _set_text(self, text):
         """Replace all text in text frame with single run containing *text*"""
@@ -1243,7 +1358,7 @@ class _TextFrame(object):
         paragraphs contained in this text frame.
         """
         # <a:p> elements are last in txBody, so can simply append new one
-        p = _Element('a:p', _nsmap)
+        p = _Element('a:p')
         self.__txBody.append(p)
         return _Paragraph(p)
 
@@ -1251,7 +1366,7 @@ class _TextFrame(object):
         """
         Remove all paragraphs except one empty one.
         """
-        p_list = self.__txBody.xpath('./a:p', namespaces=_nsmap)
+        p_list = _xpath('./a:p')(self.__txBody)
         for p in p_list[1:]:
             self.__txBody.remove(p)
         p = self.paragraphs[0]
@@ -1345,20 +1460,20 @@ class _Paragraph(object):
         # This can cause "litter" <a:pPr> and <a:defRPr> elements to be
         # included in the XML if the _Font element is referred to but not
         # populated with values.
-        if not hasattr(self.__p, 'pPr'):
-            pPr = _Element('a:pPr', _nsmap)
-            self.__p.insert(0, pPr)
-        if not hasattr(self.__p.pPr, 'defRPr'):
-            _SubElement(self.__p.pPr, 'a:defRPr')
-        return _Font(self.__p.pPr.defRPr)
+        pPr = self.__get_or_insert_pPr()
+        defRPr = _child(pPr, 'a:defRPr')
+        if defRPr is None:
+            defRPr = _SubElement(pPr, 'a:defRPr')
+        return _Font(defRPr)
 
     def _get_level(self):
         """
         Return integer indentation level of this paragraph.
         """
-        if not hasattr(self.__p, 'pPr'):
+        pPr = _child(self.__p, 'a:pPr')
+        if pPr is None:
             return 0
-        return int(self.__p.pPr.get('lvl', 0))
+        return int(pPr.get('lvl', 0))
 
     def _set_level(self, level):
         """
@@ -1368,10 +1483,7 @@ class _Paragraph(object):
         if not isinstance(level, int) or level < 0 or level > 8:
             msg = "paragraph level must be integer between 0 and 8 inclusive"
             raise ValueError(msg)
-        if not hasattr(self.__p, 'pPr'):
-            pPr = _Element('a:pPr', _nsmap)
-            self.__p.insert(0, pPr)
-        self.__p.pPr.set('lvl', str(level))
+        self.__get_or_insert_pPr().set('lvl', str(level))
 
     #: Read-write integer indentation level of this paragraph. Range is 0-8.
     #: 0 represents a top-level paragraph and is the default value. Indentation
@@ -1385,12 +1497,8 @@ class _Paragraph(object):
         Immutable sequence of |_Run| instances corresponding to the runs in
         this paragraph.
         """
-        xpath = './a:r'
-        r_elms = self.__p.xpath(xpath, namespaces=_nsmap)
-        runs = []
-        for r in r_elms:
-            runs.append(_Run(r))
-        return tuple(runs)
+        r_elms = _xpath('./a:r')(self.__p)
+        return tuple([_Run(r) for r in r_elms])
 
     def _set_text(self, text):
         """Replace runs with single run containing *text*"""
@@ -1408,7 +1516,7 @@ class _Paragraph(object):
 
     def add_run(self):
         """Return a new run appended to the runs in this paragraph."""
-        r = _Element('a:r', _nsmap)
+        r = _Element('a:r')
         _SubElement(r, 'a:t')
         # work out where to insert it, ahead of a:endParaRPr if there is one
         endParaRPr = _child(self.__p, 'a:endParaRPr')
@@ -1418,6 +1526,14 @@ class _Paragraph(object):
             self.__p.append(r)
         return _Run(r)
 
+    def __get_or_insert_pPr(self):
+        """Return pPr child element, inserting a new one if not present"""
+        pPr = _child(self.__p, 'a:pPr')
+        if pPr is None:
+            pPr = _Element('a:pPr')
+            self.__p.insert(0, pPr)
+        return pPr
+
     def clear(self):
         """Remove all runs from this paragraph."""
         # retain pPr if present
@@ -1444,9 +1560,11 @@ class _Run(object):
         the run is contained in. Only those specifically assigned at the run
         level are contained in the |_Font| object.
         """
-        if not hasattr(self.__r, 'rPr'):
-            self.__r.insert(0, _Element('a:rPr', _nsmap))
-        return _Font(self.__r.rPr)
+        rPr = _child(self.__r, 'a:rPr')
+        if rPr is None:
+            rPr = _Element('a:rPr')
+            self.__r.insert(0, rPr)
+        return _Font(rPr)
 
     @property
     def text(self):
@@ -1457,9 +1575,9 @@ class _Run(object):
         can be a 7-bit ASCII string, a UTF-8 encoded 8-bit string, or unicode.
         String values are converted to unicode assuming UTF-8 encoding.
         """
-        return self.__r.t.text
+        return _child(self.__r, 'a:t').text
 
     @text.setter
     def text(self, str):
         """Set the text of this run to *str*."""
-        self.__r.t._setText(_to_unicode(str))
+        _child(self.__r, 'a:t')._setText(_to_unicode(str))
@@ -14,7 +14,7 @@ packaging, and a utility function or two for accessing some of them.
 
 from constants import (
     MSO_AUTO_SHAPE_TYPE as MAST, MSO, PP, TEXT_ALIGN_TYPE as TAT,
-    TEXT_ANCHORING_TYPE as TANC
+    TEXT_ANCHORING_TYPE as TANC, XL_CHART_TYPE as XL
 )
 
 
@@ -1470,6 +1470,100 @@ autoshape_types = {
 }
 
 
+# ============================================================================
+# Chart type specs
+# ============================================================================
+# Each entry describes the plot element of one chart type, e.g.
+# ``<c:lineChart>``, and is compiled once into an XML prototype that is
+# cloned for each new chart.
+#
+# * 'plot_head' and 'plot_tail' are the plot element children that precede
+#   and follow its ``<c:ser>`` elements. The ``<c:dLbls>`` and ``<c:axId>``
+#   elements are supplied by the compiler.
+# * 'ser_head' and 'ser_tail' are the ``<c:ser>`` children that precede and
+#   follow its data references, whose tagnames are in 'ser_refs', category
+#   (x) reference first.
+# * 'cat_cache' is 'str' when categories are cached as text and 'num' when
+#   they are numbers, as for the x values of a scatter chart. Date categories
+#   are always cached as numbers.
+# * 'axes' is a sequence of (kind, axPos) pairs, category (x) axis first.
+#   A 'catAx' kind becomes a ``<c:dateAx>`` when the categories are dates.
+# ============================================================================
+
+chart_types = {
+    XL.AREA: {
+        'plot':         'c:areaChart',
+        'plot_head':    '<c:grouping val="standard"/><c:varyColors val="0"/>',
+        'plot_tail':    '',
+        'ser_head':     '',
+        'ser_tail':     '',
+        'ser_refs':     ('c:cat', 'c:val'),
+        'cat_cache':    'str',
+        'axes':         (('catAx', 'b'), ('valAx', 'l')),
+        'crossBetween': 'midCat'
+    },
+    XL.BAR_CLUSTERED: {
+        'plot':         'c:barChart',
+        'plot_head':    ('<c:barDir val="bar"/><c:grouping val="clustered"/>'
+                         '<c:varyColors val="0"/>'),
+        'plot_tail':    '<c:gapWidth val="150"/>',
+        'ser_head':     '<c:invertIfNegative val="0"/>',
+        'ser_tail':     '',
+        'ser_refs':     ('c:cat', 'c:val'),
+        'cat_cache':    'str',
+        'axes':         (('catAx', 'l'), ('valAx', 'b')),
+        'crossBetween': 'between'
+    },
+    XL.COLUMN_CLUSTERED: {
+        'plot':         'c:barChart',
+        'plot_head':    ('<c:barDir val="col"/><c:grouping val="clustered"/>'
+                         '<c:varyColors val="0"/>'),
+        'plot_tail':    '<c:gapWidth val="150"/>',
+        'ser_head':     '<c:invertIfNegative val="0"/>',
+        'ser_tail':     '',
+        'ser_refs':     ('c:cat', 'c:val'),
+        'cat_cache':    'str',
+        'axes':         (('catAx', 'b'), ('valAx', 'l')),
+        'crossBetween': 'between'
+    },
+    XL.LINE: {
+        'plot':         'c:lineChart',
+        'plot_head':    '<c:grouping val="standard"/><c:varyColors val="0"/>',
+        'plot_tail':    '<c:marker val="1"/><c:smooth val="0"/>',
+        'ser_head':     '<c:marker><c:symbol val="none"/></c:marker>',
+        'ser_tail':     '<c:smooth val="0"/>',
+        'ser_refs':     ('c:cat', 'c:val'),
+        'cat_cache':    'str',
+        'axes':         (('catAx', 'b'), ('valAx', 'l')),
+        'crossBetween': 'between'
+    },
+    XL.PIE: {
+        'plot':         'c:pieChart',
+        'plot_head':    '<c:varyColors val="1"/>',
+        'plot_tail':    '<c:firstSliceAng val="0"/>',
+        'ser_head':     '',
+        'ser_tail':     '',
+        'ser_refs':     ('c:cat', 'c:val'),
+        'cat_cache':    'str',
+        'axes':         (),
+        'crossBetween': None
+    },
+    XL.XY_SCATTER: {
+        'plot':         'c:scatterChart',
+        'plot_head':    ('<c:scatterStyle val="lineMarker"/>'
+                         '<c:varyColors val="0"/>'),
+        'plot_tail':    '',
+        'ser_head':     ('<c:spPr><a:ln w="19050"><a:noFill/></a:ln>'
+                         '</c:spPr>'),
+        'ser_tail':     '<c:smooth val="0"/>',
+        'ser_refs':     ('c:xVal', 'c:yVal'),
+        'cat_cache':    'num',
+        'axes':         (('valAx', 'b'), ('valAx', 'l')),
+        'crossBetween': 'midCat'
+    },
+}
+
+
 # ============================================================================
 # Placeholder constants
 # ============================================================================
@@ -1864,8 +1958,8 @@ pml_parttypes = {
         'name':        'Excel Part',
         'cardinality': PTS_CARDINALITY_TUPLE,
         'required':    False,
-        'baseURI':     'ppt/embeddings',
-        'has_rels':    PTS_HASRELS_ALWAYS,
+        'baseURI':     '/ppt/embeddings',
+        'has_rels':    PTS_HASRELS_NEVER,
         'rels_from':   ['chart'],
         'reltype':     RT_EXCEL_XLSX},     
     CT_SLIDE_LAYOUT: {  # ECMA-376-1 13.3.9
@@ -15,6 +15,37 @@ and Open XML.
 import os
 import platform
 import re
+import string
+
+
+# a worksheet has at most 16,384 columns, A through XFD
+_MAX_COLUMNS = 16384
+
+
+def column_letters(count):
+    """
+    Return a list of the letters of the first *count* worksheet columns as
+    they appear in an A1-style cell reference, e.g. ``['A', 'B', ..., 'Z',
+    'AA', 'AB']`` when *count* is 28. Raises |ValueError| if *count* is
+    greater than the 16,384 columns (A through XFD) a worksheet can have.
+    """
+    if count > _MAX_COLUMNS:
+        tmpl = "worksheet has at most %d columns, got %d"
+        raise ValueError(tmpl % (_MAX_COLUMNS, count))
+    return [column_letter(idx) for idx in range(count)]
+
+
+def column_letter(idx):
+    """
+    Return the letters of the worksheet column at zero-based *idx*, e.g.
+    ``'A'`` for 0 and ``'AA'`` for 26.
+    """
+    letters = ''
+    number = idx + 1
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        letters = string.ascii_uppercase[remainder] + letters
+    return letters
 
 
 class _BaseLength(int):
@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+#
+# workbook.py
+#
+# This module is part of python-pptx and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+Editing of the Excel workbooks embedded in chart parts, used to keep the
+worksheet cells a chart refers to in step with the data in the chart XML.
+"""
+
+import posixpath
+import re
+import zipfile
+
+from bisect import bisect_left
+from io import BytesIO
+
+from lxml import etree
+
+from pptx.util import column_letter
+
+
+_nsmap = {
+    'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+    'pr': 'http://schemas.openxmlformats.org/package/2006/relationships',
+    'r': ('http://schemas.openxmlformats.org/officeDocument/2006/relationsh'
+          'ips'),
+}
+
+_INF = float('inf')
+
+_RT_OFFICE_DOCUMENT = (
+    'http://schemas.openxmlformats.org/officeDocument/2006/relationships/offi'
+    'ceDocument')
+
+
+def _qn(tag):
+    """
+    Return Clark notation for namespace-prefixed *tag*, e.g. ``'x:row'``.
+    """
+    prefix, tagroot = tag.split(':')
+    return '{%s}%s' % (_nsmap[prefix], tagroot)
+
+
+class CellRange(object):
+    """
+    A single-column range of worksheet cells as it appears in a chart series
+    formula, e.g. ``Sheet1!$B$2:$B$13``. Use :meth:`parse` to construct one
+    from a formula.
+    """
+    __formula_re = re.compile(
+        r"^(?P<sheet_ref>'(?:[^']|'')+'|[^'!]+)!"
+        r"\$(?P<column>[A-Z]{1,3})\$(?P<first_row>[1-9][0-9]*)"
+        r"(?::\$(?P=column)\$(?P<last_row>[1-9][0-9]*))?$")
+
+    def __init__(self, sheet_ref, column, first_row, last_row):
+        super(CellRange, self).__init__()
+        self.__sheet_ref = sheet_ref
+        self.column = column
+        self.first_row = first_row
+        self.last_row = last_row
+
+    @classmethod
+    def parse(cls, formula):
+        """
+        Return a |CellRange| for *formula*, or |None| if *formula* isn't a
+        reference to a single-column range of cells.
+        """
+        match = cls.__formula_re.match(formula or '')
+        if match is None:
+            return None
+        first_row = int(match.group('first_row'))
+        last_row = match.group('last_row')
+        last_row = first_row if last_row is None else int(last_row)
+        return cls(match.group('sheet_ref'), match.group('column'),
+                   first_row, last_row)
+
+    @property
+    def formula(self):
+        """
+        Formula referring to this range, e.g. ``Sheet1!$B$2:$B$13``.
+        """
+        start = '%s!$%s$%d' % (self.__sheet_ref, self.column, self.first_row)
+        if self.last_row == self.first_row:
+            return start
+        return '%s:$%s$%d' % (start, self.column, self.last_row)
+
+    def resized(self, cell_count):
+        """
+        Return a new |CellRange| starting at the same cell as this one and
+        spanning *cell_count* cells.
+        """
+        last_row = self.first_row + max(cell_count, 1) - 1
+        return CellRange(self.__sheet_ref, self.column, self.first_row,
+                         last_row)
+
+    @property
+    def sheet(self):
+        """
+        Name of the worksheet the range is on, e.g. ``'Sheet1'``.
+        """
+        sheet_ref = self.__sheet_ref
+        if sheet_ref.startswith("'"):
+            return sheet_ref[1:-1].replace("''", "'")
+        return sheet_ref
+
+
+def replace_columns(blob, edits):
+    """
+    Return a copy of the workbook *blob* in which the cells of each edited
+    column range hold new values. *edits* is a sequence of ``(cell_range,
+    values)`` pairs, where *cell_range* is the |CellRange| the values were
+    previously in and *values* is a sequence of numbers and strings written
+    one per cell starting at its first row. Cells of the old range beyond the
+    new values are removed. Only the edited worksheets are parsed; the other
+    members of the workbook package are copied through unchanged. Raises
+    |KeyError| if a range refers to a worksheet the workbook doesn't have
+    and |ValueError| if the workbook is malformed.
+    """
+    src = zipfile.ZipFile(BytesIO(blob))
+    sheet_paths = _sheet_paths(src)
+    sheet_edits = {}
+    for cell_range, values in edits:
+        sheet = cell_range.sheet
+        if sheet not in sheet_paths:
+            raise KeyError("no worksheet named '%s' in workbook" % sheet)
+        sheet_edits.setdefault(sheet_paths[sheet], []).append(
+            (cell_range, values))
+
+    stream = BytesIO()
+    dst = zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED)
+    for item in src.infolist():
+        member_blob = src.read(item.filename)
+        if item.filename in sheet_edits:
+            member_blob = _edited_worksheet(
+                member_blob, sheet_edits[item.filename])
+        dst.writestr(item, member_blob)
+    dst.close()
+    return stream.getvalue()
+
+
+def _column_number(column):
+    """
+    Return the one-based number of the worksheet column having letters
+    *column*, e.g. 1 for ``'A'`` and 27 for ``'AA'``.
+    """
+    number = 0
+    for letter in column:
+        number = number * 26 + ord(letter) - ord('A') + 1
+    return number
+
+
+def _edited_worksheet(blob, edits):
+    """
+    Return the worksheet XML in *blob* with the cell edits in *edits*
+    applied. See :func:`replace_columns` for the form of *edits*.
+    """
+    worksheet = etree.fromstring(blob)
+    sheetData = worksheet.find(_qn('x:sheetData'))
+    if sheetData is None:
+        raise ValueError("worksheet has no sheetData element")
+    _number_rows_and_cells(sheetData)
+    rows = dict((int(row.get('r')), row) for row in sheetData)
+    row_nums = sorted(rows)
+
+    for cell_range, values in edits:
+        column = cell_range.column
+        col_num = _column_number(column)
+        last_row = max(cell_range.last_row,
+                       cell_range.first_row + len(values) - 1)
+        for row_num in range(cell_range.first_row, last_row + 1):
+            offset = row_num - cell_range.first_row
+            value = values[offset] if offset < len(values) else None
+            # a NaN value is a missing point, written as no cell at all
+            if isinstance(value, float) and value != value:
+                value = None
+            row = rows.get(row_num)
+            if row is None:
+                if value is None:
+                    continue
+                row = etree.Element(_qn('x:row'), r=str(row_num))
+                idx = bisect_left(row_nums, row_num)
+                sheetData.insert(idx, row)
+                row_nums.insert(idx, row_num)
+                rows[row_num] = row
+            # cells may now extend beyond the row's optional spans hint
+            row.attrib.pop('spans', None)
+            ref = '%s%d' % (column, row_num)
+            cell = _get_or_add_cell(row, ref, col_num, value is not None)
+            if cell is None:
+                continue
+            if value is None:
+                row.remove(cell)
+                if len(row) == 0:
+                    sheetData.remove(row)
+                    row_nums.remove(row_num)
+                    del rows[row_num]
+            else:
+                _set_cell_value(cell, value)
+
+    _update_dimension(worksheet, rows)
+    return etree.tostring(
+        worksheet, encoding='UTF-8', xml_declaration=True, standalone=True)
+
+
+def _get_or_add_cell(row, ref, col_num, add):
+    """
+    Return the ``<c>`` element in *row* having cell reference *ref*, adding
+    it in column order if it's not present and *add* is True. Returns |None|
+    if the cell is not present and *add* is False.
+    """
+    for cell in row.iterchildren(_qn('x:c')):
+        cell_ref = cell.get('r')
+        if cell_ref == ref:
+            return cell
+        cell_column = re.match('[A-Z]+', cell_ref).group(0)
+        if _column_number(cell_column) > col_num:
+            if not add:
+                return None
+            new_cell = etree.Element(_qn('x:c'), r=ref)
+            cell.addprevious(new_cell)
+            return new_cell
+    if not add:
+        return None
+    return etree.SubElement(row, _qn('x:c'), r=ref)
+
+
+def _number_rows_and_cells(sheetData):
+    """
+    Set the ``r`` attribute of each row and cell in *sheetData* that omits
+    it, which is optional, to its position, one past that of the row or
+    cell before it. Raises |ValueError| if the rows or the cells of a row
+    aren't in increasing order or a cell reference is malformed.
+    """
+    row_num = 0
+    for row in sheetData.iterchildren(_qn('x:row')):
+        r = row.get('r')
+        if r is None:
+            row_num += 1
+            row.set('r', str(row_num))
+        elif not r.isdigit() or int(r) <= row_num:
+            raise ValueError("malformed worksheet row number '%s'" % r)
+        else:
+            row_num = int(r)
+        col_num = 0
+        for cell in row.iterchildren(_qn('x:c')):
+            ref = cell.get('r')
+            if ref is None:
+                col_num += 1
+                cell.set('r', '%s%d' % (column_letter(col_num-1), row_num))
+                continue
+            match = re.match('([A-Z]{1,3})([1-9][0-9]*)$', ref)
+            if (match is None or int(match.group(2)) != row_num or
+                    _column_number(match.group(1)) <= col_num):
+                raise ValueError("malformed worksheet cell reference '%s' "
+                                 "in row %d" % (ref, row_num))
+            col_num = _column_number(match.group(1))
+
+
+def _set_cell_value(cell, value):
+    """
+    Set *cell* to contain *value*, a number or a string, keeping the cell's
+    style. Strings are written inline so the shared string table needn't
+    be rewritten. Raises |ValueError| if *value* is an infinite float,
+    which a worksheet cell can't hold.
+    """
+    if isinstance(value, float) and value in (_INF, -_INF):
+        raise ValueError("can't write %r to worksheet cell %s" %
+                         (value, cell.get('r')))
+    for child in list(cell):
+        cell.remove(child)
+    cell.attrib.pop('t', None)
+    if isinstance(value, bool):
+        cell.set('t', 'b')
+        etree.SubElement(cell, _qn('x:v')).text = '1' if value else '0'
+    elif isinstance(value, (int, long, float)):
+        text = repr(value) if isinstance(value, float) else str(value)
+        etree.SubElement(cell, _qn('x:v')).text = text
+    else:
+        cell.set('t', 'inlineStr')
+        is_ = etree.SubElement(cell, _qn('x:is'))
+        etree.SubElement(is_, _qn('x:t')).text = value
+
+
+def _sheet_paths(workbook_zip):
+    """
+    Return a dict mapping each worksheet name in *workbook_zip* to the name
+    of the package member containing that worksheet.
+    """
+    def read(path):
+        try:
+            return workbook_zip.read(path)
+        except KeyError:
+            raise ValueError("workbook has no member '%s'" % path)
+
+    def rels_targets(rels_path):
+        rels = etree.fromstring(read(rels_path))
+        return dict(
+            (rel.get('Id'), (rel.get('Type'), rel.get('Target')))
+            for rel in rels.iterchildren(_qn('pr:Relationship')))
+
+    def resolve(base_dir, target):
+        if target.startswith('/'):
+            return target[1:]
+        return posixpath.normpath(posixpath.join(base_dir, target))
+
+    # find workbook part from package relationships
+    workbook_path = None
+    for reltype, target in rels_targets('_rels/.rels').values():
+        if reltype == _RT_OFFICE_DOCUMENT:
+            workbook_path = resolve('', target)
+    if workbook_path is None:
+        raise ValueError("workbook has no officeDocument relationship")
+    base_dir, filename = posixpath.split(workbook_path)
+    rels_path = posixpath.join(base_dir, '_rels', filename + '.rels')
+    targets = rels_targets(rels_path)
+
+    workbook = etree.fromstring(read(workbook_path))
+    sheet_paths = {}
+    for sheet in workbook.iter(_qn('x:sheet')):
+        rId = sheet.get(_qn('r:id'))
+        if rId not in targets:
+            tmpl = "workbook has no relationship '%s' for worksheet '%s'"
+            raise ValueError(tmpl % (rId, sheet.get('name')))
+        reltype, target = targets[rId]
+        sheet_paths[sheet.get('name')] = resolve(base_dir, target)
+    return sheet_paths
+
+
+def _update_dimension(worksheet, rows):
+    """
+    Set the ``<dimension>`` element of *worksheet*, if it has one, to the
+    range spanning the cells in *rows*.
+    """
+    dimension = worksheet.find(_qn('x:dimension'))
+    if dimension is None:
+        return
+    refs = [cell.get('r') for row in rows.values()
+            for cell in row.iterchildren(_qn('x:c'))]
+    if not refs:
+        dimension.set('ref', 'A1')
+        return
+    columns = [re.match('[A-Z]+', ref).group(0) for ref in refs]
+    row_nums = [int(ref[len(col):]) for ref, col in zip(refs, columns)]
+    col_nums = [_column_number(col) for col in columns]
+    first = min(col_nums), min(row_nums)
+    last = max(col_nums), max(row_nums)
+    letters = dict((_column_number(col), col) for col in columns)
+    dimension.set('ref', '%s%d:%s%d' % (
+        letters[first[0]], first[1], letters[last[0]], last[1]))
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# test_api.py
+#
+# This module is part of python-pptx and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""Test suite for pptx.api module."""
+
+import os
+
+from multiprocessing.pool import ThreadPool
+from StringIO import StringIO
+
+from hamcrest import assert_that, equal_to, is_
+from mock import Mock, patch
+
+from pptx.api import Presentation
+
+from testing import TestCase
+
+
+thisdir = os.path.split(__file__)[0]
+test_pptx_path = os.path.join(thisdir, 'test_files', 'test.pptx')
+
+
+class _UnseekableStream(object):
+    """Write-only stream recording the size of each write, like a socket"""
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+
+
+class _PoolExecutor(object):
+    """
+    Executor running calls on a thread pool, having the ``submit()`` method
+    of a ``concurrent.futures`` executor
+    """
+    def __init__(self):
+        self.pool = ThreadPool(2)
+
+    def submit(self, fn, *args):
+        return _PoolFuture(self.pool.apply_async(fn, args))
+
+
+class _PoolFuture(object):
+    """Result of a call submitted to |_PoolExecutor|"""
+    def __init__(self, async_result):
+        self.__async_result = async_result
+
+    def result(self, timeout=None):
+        return self.__async_result.get(timeout)
+
+
+class TestPresentation(TestCase):
+    """Test Presentation"""
+    def setUp(self):
+        self.executor = _PoolExecutor()
+
+    def tearDown(self):
+        self.executor.pool.terminate()
+
+    def test_open_async_loads_presentation_on_executor(self):
+        """Presentation.open_async() future result is loaded presentation"""
+        # exercise ---------------------
+        future = Presentation.open_async(test_pptx_path, self.executor)
+        prs = future.result(timeout=10)
+        # verify -----------------------
+        assert_that(isinstance(prs, Presentation), is_(True))
+        self.assertLength(prs.slides, len(Presentation(test_pptx_path).slides))
+
+    def test_open_async_uses_given_executor(self):
+        """Presentation.open_async() submits open to given executor"""
+        # setup ------------------------
+        executor = Mock(name='executor')
+        # exercise ---------------------
+        future = Presentation.open_async(test_pptx_path, executor)
+        # verify -----------------------
+        executor.submit.assert_called_once_with(Presentation, test_pptx_path)
+        assert_that(future, is_(executor.submit.return_value))
+
+    def test_save_async_writes_same_bytes_as_save_in_chunks(self):
+        """Presentation.save_async() writes unseekable stream in chunks"""
+        # setup ------------------------
+        prs = Presentation(test_pptx_path)
+        expected = StringIO()
+        prs.save(expected)
+        stream = _UnseekableStream()
+        # exercise ---------------------
+        with patch('pptx.api.SAVE_CHUNK_SIZE', 4096):
+            future = prs.save_async(stream, self.executor)
+            future.result(timeout=10)
+        # verify -----------------------
+        assert_that(''.join(stream.chunks),
+                    is_(equal_to(expected.getvalue())))
+        self.assertLength(stream.chunks, (len(expected.getvalue()) + 4095)
+                          // 4096)
+        chunk_sizes = set([len(chunk) for chunk in stream.chunks[:-1]])
+        assert_that(chunk_sizes, is_(equal_to(set([4096]))))
+
+    def test_save_async_writes_seekable_stream_directly(self):
+        """Presentation.save_async() saves straight to seekable stream"""
+        # setup ------------------------
+        prs = Presentation(test_pptx_path)
+        stream = StringIO()
+        # exercise ---------------------
+        with patch.object(prs, 'save') as save:
+            prs.save_async(stream, self.executor).result(timeout=10)
+        # verify -----------------------
+        save.assert_called_once_with(stream, False)
+
+    def test_context_manager_closes_presentation(self):
+        """Presentation closes on leaving with block"""
+        # exercise ---------------------
+        with Presentation(test_pptx_path) as prs:
+            package = prs._Presentation__package
+            assert_that(package.closed, is_(False))
+        # verify -----------------------
+        assert_that(package.closed, is_(True))
+        with self.assertRaises(ValueError):
+            prs.save(StringIO())
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# test_batch.py
+#
+# This module is part of python-pptx and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""Test suite for pptx.batch module."""
+
+import os
+import shutil
+import tempfile
+
+from hamcrest import assert_that, equal_to, is_
+
+from pptx import Presentation
+from pptx.batch import JobResult, render
+
+from testing import TestCase
+
+
+thisdir = os.path.split(__file__)[0]
+test_pptx_path = os.path.join(thisdir, 'test_files', 'test.pptx')
+
+
+def _build(prs, record):
+    """Build function adding a slide titled *record*, raising on 'fail'"""
+    if record == 'fail':
+        raise ValueError('bad record')
+    slide = prs.slides.add_slide(prs.slidelayouts[0])
+    slide.shapes.title.text = record
+
+
+class Test_render(TestCase):
+    """Test render()"""
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir)
+
+    def _titles(self, path):
+        """Return the title text of each slide in the deck at *path*"""
+        prs = Presentation(path)
+        return [''.join([run.text for para in
+                         slide.shapes.title.textframe.paragraphs
+                         for run in para.runs])
+                for slide in prs.slides]
+
+    def test_render_writes_deck_per_record(self):
+        """render() writes a deck built from template for each record"""
+        # setup ------------------------
+        records = ['foo', 'bar', 'baz']
+        template_slide_count = len(Presentation(test_pptx_path).slides)
+        # exercise ---------------------
+        results = render(test_pptx_path, records, _build, self.out_dir,
+                         workers=1)
+        # verify -----------------------
+        assert_that([r.index for r in results], is_(equal_to([0, 1, 2])))
+        for result, record in zip(results, records):
+            assert_that(result.ok, is_(True))
+            expected = os.path.join(self.out_dir, '%06d.pptx' % result.index)
+            assert_that(result.path, is_(equal_to(expected)))
+            titles = self._titles(result.path)
+            self.assertLength(titles, template_slide_count + 1)
+            assert_that(titles[-1], is_(equal_to(record)))
+
+    def test_render_reports_failure_and_continues(self):
+        """render() reports failed record and renders the others"""
+        # setup ------------------------
+        seen = []
+        # exercise ---------------------
+        results = render(None, ['foo', 'fail', 'bar'], _build, self.out_dir,
+                         workers=1, callback=seen.append)
+        # verify -----------------------
+        assert_that([r.ok for r in results], is_(equal_to([True, False,
+                                                            True])))
+        failed = results[1]
+        assert_that(failed.error, is_(equal_to("ValueError('bad record',)")))
+        assert_that('ValueError' in failed.traceback, is_(True))
+        assert_that(os.path.exists(failed.path), is_(False))
+        assert_that(seen, is_(equal_to(results)))
+        assert_that(results[0].elapsed > 0.0, is_(True))
+
+    def test_render_uses_worker_processes(self):
+        """render() on a process pool gives same results as in process"""
+        # setup ------------------------
+        records = ['rec %d' % idx for idx in range(6)] + ['fail']
+
+        def filename_fn(idx, record):
+            return record.replace(' ', '_') + '.pptx'
+        # exercise ---------------------
+        results = render(None, records, _build, self.out_dir, workers=3,
+                         filename_fn=filename_fn)
+        # verify -----------------------
+        for result, record in zip(results, records[:-1]):
+            assert_that(result.ok, is_(True))
+            assert_that(os.path.basename(result.path),
+                        is_(equal_to(filename_fn(0, record))))
+            assert_that(self._titles(result.path)[-1],
+                        is_(equal_to(record)))
+        assert_that(results[-1].ok, is_(False))
+        assert_that(sorted(os.listdir(self.out_dir)),
+                    is_(equal_to(sorted([filename_fn(0, record) for record
+                                         in records[:-1]]))))
+
+
+class TestJobResult(TestCase):
+    """Test JobResult"""
+    def test_elapsed_is_build_plus_save_time(self):
+        """JobResult.elapsed is sum of build and save time"""
+        result = JobResult(0, 'foo.pptx', build_secs=1.5, save_secs=0.25)
+        assert_that(result.elapsed, is_(equal_to(1.75)))
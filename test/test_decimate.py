@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+#
+# test_decimate.py
+#
+# This module is part of python-pptx and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""Test suite for pptx.decimate module."""
+
+import math
+
+from datetime import date, timedelta
+
+from hamcrest import assert_that, equal_to, is_, same_instance
+from mock import patch
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pptx.decimate import decimate, DECIMATION_METHODS
+
+from testing import TestCase
+
+
+def _spiky_data(point_count=10000, spike_idx=5001):
+    """
+    Return chart data for a slow sine wave having a single spike at
+    *spike_idx*, which a good decimation keeps.
+    """
+    x = range(point_count)
+    y = [math.sin(idx / 500.0) for idx in x]
+    y[spike_idx] = 10.0
+    return [x, y]
+
+
+class Test_decimate(TestCase):
+    """Test decimate()"""
+    def _backends(self):
+        """
+        Return the values to patch ``pptx.decimate.numpy`` with to test both
+        the NumPy and the plain Python code paths.
+        """
+        return [numpy, None] if numpy is not None else [None]
+
+    def test_decimate_returns_short_data_unchanged(self):
+        """decimate() returns data with few enough points unchanged"""
+        # setup ------------------------
+        data = [['a', 'b', 'c'], [1, 2, 3]]
+        # exercise ---------------------
+        retval = decimate(data, 3)
+        # verify -----------------------
+        assert_that(retval, is_(same_instance(data)))
+
+    def test_decimate_raises_on_bad_arguments(self):
+        """decimate() raises on unknown method or too few points"""
+        data = _spiky_data()
+        with self.assertRaises(ValueError):
+            decimate(data, 100, 'random')
+        with self.assertRaises(ValueError):
+            decimate(data, 2)
+
+    def test_stride_keeps_evenly_spaced_points(self):
+        """decimate(method='stride') keeps evenly spaced points"""
+        # setup ------------------------
+        data = [range(101), range(0, 202, 2)]
+        # exercise ---------------------
+        categories, values = decimate(data, 5, 'stride')
+        # verify -----------------------
+        assert_that(categories, is_(equal_to([0, 25, 50, 75, 100])))
+        assert_that(values, is_(equal_to([0, 50, 100, 150, 200])))
+
+    def test_decimate_keeps_spike_and_end_points(self):
+        """decimate() with lttb or minmax keeps spike and end points"""
+        data = _spiky_data()
+        for backend in self._backends():
+            for method in ('lttb', 'minmax'):
+                with patch('pptx.decimate.numpy', backend):
+                    # exercise ---------
+                    categories, values = decimate(data, 500, method)
+                # verify ---------------
+                categories = list(categories)
+                assert_that(len(categories) <= 500, is_(True))
+                assert_that(categories[0], is_(equal_to(0)))
+                assert_that(categories[-1], is_(equal_to(9999)))
+                assert_that(5001 in categories, is_(True))
+                assert_that(list(values)[categories.index(5001)],
+                            is_(equal_to(10.0)))
+
+    def test_lttb_gives_target_point_count(self):
+        """decimate(method='lttb') gives exactly max_points points"""
+        data = _spiky_data()
+        for backend in self._backends():
+            with patch('pptx.decimate.numpy', backend):
+                # exercise -------------
+                categories, values = decimate(data, 500)
+            # verify -------------------
+            self.assertLength(categories, 500)
+            self.assertLength(values, 500)
+
+    def test_decimate_shares_points_between_series(self):
+        """decimate() keeps the same points of every series"""
+        # setup ------------------------
+        x, y = _spiky_data()
+        y2 = [-value for value in y]
+        y2[100] = 50.0
+        # exercise ---------------------
+        categories, values, values2 = decimate([x, y, y2], 500, 'minmax')
+        # verify -----------------------
+        categories = list(categories)
+        assert_that(5001 in categories and 100 in categories, is_(True))
+        assert_that(len(categories) <= 500, is_(True))
+        assert_that(list(values2)[categories.index(100)],
+                    is_(equal_to(50.0)))
+
+    def test_decimate_keeps_max_points_shared_by_many_series(self):
+        """decimate() keeps at most max_points however many series"""
+        # setup ------------------------
+        data = _spiky_data(1000, 50)
+        for idx in range(1, 10):
+            data.append(_spiky_data(1000, 50 + idx * 90)[1])
+        for backend in self._backends():
+            for method in ('lttb', 'minmax'):
+                with patch('pptx.decimate.numpy', backend):
+                    # exercise ---------
+                    retval = decimate(data, 10, method)
+                # verify ---------------
+                categories = list(retval[0])
+                assert_that(len(categories) <= 10, is_(True))
+                assert_that(categories[0], is_(equal_to(0)))
+                assert_that(categories[-1], is_(equal_to(999)))
+
+    def test_decimate_skips_missing_values(self):
+        """decimate() chooses numbers over None and NaN values"""
+        # setup ------------------------
+        x, y = _spiky_data(1000, 501)
+        y[100:400] = [None] * 300
+        y[600:900] = [float('nan')] * 300
+        for backend in self._backends():
+            for method in ('lttb', 'minmax'):
+                with patch('pptx.decimate.numpy', backend):
+                    # exercise ---------
+                    categories, values = decimate([x, y], 50, method)
+                # verify ---------------
+                categories = list(categories)
+                assert_that(len(categories) <= 50, is_(True))
+                assert_that(501 in categories, is_(True))
+                assert_that(list(values)[categories.index(501)],
+                            is_(equal_to(10.0)))
+
+    def test_decimate_accepts_text_and_date_categories(self):
+        """decimate() positions text and date categories"""
+        # setup ------------------------
+        x, y = _spiky_data(1000, 501)
+        start = date(2024, 1, 1)
+        for categories in (['c%d' % idx for idx in x],
+                           [start + timedelta(idx) for idx in x]):
+            # exercise -----------------
+            kept_categories, values = decimate([categories, y], 100)
+            # verify -------------------
+            assert_that(kept_categories[0], is_(equal_to(categories[0])))
+            assert_that(categories[501] in kept_categories, is_(True))
+
+    def test_decimate_returns_numpy_arrays_for_numpy_input(self):
+        """decimate() returns NumPy arrays for NumPy series"""
+        if numpy is None:
+            return
+        # setup ------------------------
+        x = numpy.arange(10000, dtype=float)
+        y = numpy.sin(x / 500.0)
+        # exercise ---------------------
+        categories, values = decimate([x, y], 1000)
+        # verify -----------------------
+        assert_that(isinstance(values, numpy.ndarray), is_(True))
+        assert_that(values.tolist(),
+                    is_(equal_to(y[categories.astype(int)].tolist())))
+        for method in DECIMATION_METHODS:
+            point_count = len(decimate([x, y], 1000, method)[0])
+            assert_that(500 < point_count <= 1000, is_(True))
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#
+# test_extract.py
+#
+# This module is part of python-pptx and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""Test suite for pptx.extract module."""
+
+import os
+import zipfile
+
+from StringIO import StringIO
+
+from hamcrest import assert_that, equal_to, is_
+
+from pptx import Presentation
+from pptx.extract import iter_text
+
+from testing import TestCase
+
+
+thisdir = os.path.split(__file__)[0]
+test_file_dir = os.path.join(thisdir, 'test_files')
+test_slides_path = os.path.join(test_file_dir, 'test_slides.pptx')
+no_slides_path = os.path.join(test_file_dir, 'no-slides.pptx')
+
+
+def _reverse_slide_order(blob):
+    """
+    Return package *blob* with the ``<p:sldId>`` elements of its two slides
+    swapped, so presentation order no longer follows partname order.
+    """
+    src = zipfile.ZipFile(StringIO(blob))
+    stream = StringIO()
+    dst = zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED)
+    for info in src.infolist():
+        data = src.read(info.filename)
+        if info.filename == 'ppt/presentation.xml':
+            start = data.index('<p:sldIdLst>') + len('<p:sldIdLst>')
+            end = data.index('</p:sldIdLst>')
+            sldIds = data[start:end].replace('><', '>\n<').split('\n')
+            sldIds = [s.strip() for s in sldIds if s.strip()]
+            assert len(sldIds) == 2
+            data = data[:start] + ''.join(sldIds[::-1]) + data[end:]
+        dst.writestr(info, data)
+    dst.close()
+    return stream.getvalue()
+
+
+class Test_iter_text(TestCase):
+    """Test iter_text()"""
+    def test_generates_text_of_each_paragraph_with_shape_name(self):
+        """iter_text() generates slide number, shape name and text"""
+        # exercise ---------------------
+        items = list(iter_text(test_slides_path))
+        # verify -----------------------
+        expected = [
+            (1, 'TextBox 6', u'Test text'),
+            (1, 'TextBox 9', u'Group test text'),
+            (1, 'Rounded Rectangle 11', u'Box 1'),
+            (1, 'Rounded Rectangle 12', u'Box 2'),
+            (1, 'Table 15', u'Col head 1'),
+        ]
+        assert_that(items[:5], is_(equal_to(expected)))
+
+    def test_generates_nothing_for_presentation_without_slides(self):
+        """iter_text() generates nothing when there are no slides"""
+        assert_that(list(iter_text(no_slides_path)), is_(equal_to([])))
+
+    def test_follows_presentation_slide_order(self):
+        """iter_text() numbers slides in sldIdLst order, from a stream"""
+        # setup ------------------------
+        prs = Presentation()
+        for title in ('First', 'Second'):
+            slide = prs.slides.add_slide(prs.slidelayouts[0])
+            slide.shapes.title.text = title
+            slide.shapes.placeholders[1].text = title + u' – body'
+        stream = StringIO()
+        prs.save(stream)
+        blob = _reverse_slide_order(stream.getvalue())
+        # exercise ---------------------
+        items = list(iter_text(StringIO(blob)))
+        # verify -----------------------
+        expected = [
+            (1, 'Title 1', u'Second'),
+            (1, 'Subtitle 2', u'Second – body'),
+            (2, 'Title 1', u'First'),
+            (2, 'Subtitle 2', u'First – body'),
+        ]
+        assert_that(items, is_(equal_to(expected)))
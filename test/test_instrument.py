@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+# test_instrument.py
+#
+# This module is part of python-pptx and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""Test suite for pptx.instrument module."""
+
+import logging
+import os
+
+from io import BytesIO
+
+from hamcrest import assert_that, equal_to, has_entries, is_, same_instance
+from mock import Mock
+
+import pptx.instrument
+
+from pptx import Presentation
+from pptx.instrument import (
+    add_listener, disable_tracing, enable_tracing, listening, phase,
+    PhaseStats, remove_listener
+)
+
+from testing import TestCase
+
+
+thisdir = os.path.split(__file__)[0]
+test_pptx_path = os.path.join(thisdir, 'test_files', 'test.pptx')
+
+
+class Test_phase(TestCase):
+    """Test phase()"""
+    def test_phase_does_nothing_without_listener(self):
+        """phase() returns shared null context manager with no listener"""
+        # exercise ---------------------
+        with phase('foo', bar=1) as ph:
+            ph.set(baz=2)
+        # verify -----------------------
+        assert_that(ph, is_(same_instance(pptx.instrument._null_phase)))
+
+    def test_phase_reports_event_to_listeners(self):
+        """phase() reports elapsed time and detail to each listener"""
+        # setup ------------------------
+        listener1, listener2 = Mock(name='listener1'), Mock(name='listener2')
+        # exercise ---------------------
+        with listening(listener1):
+            with listening(listener2):
+                with phase('foo', bar=1) as ph:
+                    ph.set(baz=2)
+            with phase('foo'):
+                pass
+        with phase('foo'):
+            pass
+        # verify -----------------------
+        assert_that(listener1.call_count, is_(equal_to(2)))
+        assert_that(listener2.call_count, is_(equal_to(1)))
+        event = listener2.call_args[0][0]
+        assert_that(event.name, is_(equal_to('foo')))
+        assert_that(event.detail, is_(equal_to({'bar': 1, 'baz': 2})))
+        assert_that(event.elapsed >= 0.0, is_(True))
+
+    def test_phase_reports_event_on_exception(self):
+        """phase() reports the phase when it raises"""
+        # setup ------------------------
+        listener = Mock(name='listener')
+        add_listener(listener)
+        # exercise ---------------------
+        try:
+            with phase('foo'):
+                raise KeyError('bar')
+        except KeyError:
+            pass
+        finally:
+            remove_listener(listener)
+        # verify -----------------------
+        assert_that(listener.call_count, is_(equal_to(1)))
+
+    def test_remove_listener_raises_on_unknown_listener(self):
+        """remove_listener() raises on listener not registered"""
+        with self.assertRaises(ValueError):
+            remove_listener(Mock(name='listener'))
+
+
+class TestPhaseStats(TestCase):
+    """Test PhaseStats"""
+    def test_open_and_save_report_phases(self):
+        """Presentation open and save report each instrumented phase"""
+        # setup ------------------------
+        stats = PhaseStats()
+        # exercise ---------------------
+        with listening(stats):
+            prs = Presentation(test_pptx_path)
+            prs.save(BytesIO())
+        # verify -----------------------
+        summary = stats.summary
+        for name in ('open', 'open.zip_read', 'open.xml_parse',
+                     'open.model_build', 'save', 'save.marshal',
+                     'save.serialize', 'save.content_types',
+                     'save.compress'):
+            assert_that(name in summary, is_(True), name)
+        assert_that(summary['open'], has_entries({'count': 1}))
+        part_count = len(prs._Presentation__package._parts)
+        assert_that(summary['save.serialize']['count'],
+                    is_(equal_to(part_count)))
+        open_stats = summary['open']
+        assert_that(open_stats['total'], is_(equal_to(open_stats['max'])))
+
+
+class _RecordingHandler(logging.Handler):
+    """Logging handler keeping the records it's given"""
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestTracing(TestCase):
+    """Test enable_tracing() and disable_tracing()"""
+    def setUp(self):
+        self.handler = _RecordingHandler()
+        self.trace_log = logging.getLogger('pptx.trace')
+        self.trace_log.addHandler(self.handler)
+        self.trace_log.setLevel(logging.DEBUG)
+
+    def tearDown(self):
+        disable_tracing()
+        self.trace_log.removeHandler(self.handler)
+        self.trace_log.setLevel(logging.NOTSET)
+
+    def test_library_logger_has_only_null_handler(self):
+        """pptx logger has a NullHandler and no level of its own"""
+        logger = logging.getLogger('pptx')
+        assert_that([type(h) for h in logger.handlers],
+                    is_(equal_to([logging.NullHandler])))
+        assert_that(logger.level, is_(equal_to(logging.NOTSET)))
+
+    def test_enable_tracing_logs_phases(self):
+        """enable_tracing() logs each phase with its event attached"""
+        # exercise ---------------------
+        enable_tracing()
+        enable_tracing()
+        with phase('foo', bar=1):
+            pass
+        disable_tracing()
+        with phase('foo'):
+            pass
+        # verify -----------------------
+        records = self.handler.records
+        self.assertLength(records, 1)
+        assert_that(records[0].pptx_event.name, is_(equal_to('foo')))
+        assert_that(records[0].getMessage().startswith('foo '), is_(True))
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# test_memory.py
+#
+# This module is part of python-pptx and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""Test suite for pptx.memory module."""
+
+import os
+
+from hamcrest import assert_that, equal_to, greater_than, is_
+
+from pptx import Presentation
+from pptx.memory import ATTRIBUTE_BYTES, NODE_BYTES, tree_bytes
+from pptx.oxml import oxml_fromstring
+
+from testing import TestCase
+
+
+thisdir = os.path.split(__file__)[0]
+test_file_dir = os.path.join(thisdir, 'test_files')
+images_pptx_path = os.path.join(test_file_dir, 'with_images.pptx')
+test_slides_path = os.path.join(test_file_dir, 'test_slides.pptx')
+
+
+class Test_memory_report(TestCase):
+    """Test memory_report()"""
+    def test_reports_each_part(self):
+        """memory_report() reports blob and tree size of each part"""
+        # setup ------------------------
+        prs = Presentation(images_pptx_path)
+        # exercise ---------------------
+        report = prs.memory_report()
+        # verify -----------------------
+        parts = dict((part['partname'], part) for part in report['parts'])
+        image = parts['/ppt/media/image4.jpeg']
+        assert_that(image['blob_bytes'], greater_than(0))
+        assert_that(image['blob_bytes'], is_(equal_to(image['source_bytes'])))
+        assert_that(image['tree_bytes'], is_(equal_to(0)))
+        slide = parts['/ppt/slides/slide1.xml']
+        assert_that(slide['blob_bytes'], is_(equal_to(0)))
+        assert_that(slide['source_bytes'], greater_than(0))
+        assert_that(slide['tree_bytes'], greater_than(0))
+        assert_that(slide['relationships'], greater_than(0))
+        assert_that(report['live_packages'], greater_than(0))
+
+    def test_totals_sum_parts(self):
+        """memory_report() totals are sums over parts"""
+        # exercise ---------------------
+        report = Presentation(test_slides_path).memory_report()
+        # verify -----------------------
+        for key in ('source_bytes', 'blob_bytes', 'tree_bytes', 'elements',
+                    'deferred_points', 'deferred_bytes', 'relationships',
+                    'observers'):
+            expected = sum([part[key] for part in report['parts']])
+            assert_that(report['totals'][key], is_(equal_to(expected)))
+
+    def test_new_part_has_no_source_bytes(self):
+        """memory_report() reports no source bytes for part added"""
+        # setup ------------------------
+        prs = Presentation()
+        prs.slides.add_slide(prs.slidelayouts[6])
+        # exercise ---------------------
+        report = prs.memory_report()
+        # verify -----------------------
+        parts = dict((part['partname'], part) for part in report['parts'])
+        assert_that(parts['/ppt/slides/slide1.xml']['source_bytes'],
+                    is_(equal_to(0)))
+
+    def test_reports_deferred_chart_data(self):
+        """memory_report() reports data a new chart holds until saved"""
+        # setup ------------------------
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slidelayouts[6])
+        values = [float(idx) for idx in range(1000)]
+        slide.shapes.add_chart(0, 0, 100, 100, [range(1000), values],
+                               ['Cat', 'S1'])
+        # exercise ---------------------
+        report = prs.memory_report()
+        # verify -----------------------
+        parts = dict((part['partname'], part) for part in report['parts'])
+        chart = parts['/ppt/charts/chart1.xml']
+        slide = parts['/ppt/slides/slide1.xml']
+        assert_that(chart['deferred_points'], is_(equal_to(2000)))
+        assert_that(chart['deferred_bytes'], greater_than(2000 * 8))
+        assert_that(slide['deferred_points'], is_(equal_to(0)))
+        assert_that(report['totals']['deferred_points'], is_(equal_to(2000)))
+
+    def test_counts_proxies_held_by_package(self):
+        """memory_report() counts the python-pptx objects a package holds"""
+        # exercise ---------------------
+        report = Presentation(test_slides_path).memory_report()
+        # verify -----------------------
+        proxies = report['proxies']
+        assert_that(proxies['_Slide'], is_(equal_to(1)))
+        assert_that(proxies['_Picture'], is_(equal_to(2)))
+        assert_that(proxies['_Relationship'],
+                    greater_than(report['totals']['relationships'] - 1))
+        assert_that('Presentation' in proxies, is_(True))
+
+
+class Test_tree_bytes(TestCase):
+    """Test tree_bytes()"""
+    def test_estimates_from_nodes_and_values(self):
+        """tree_bytes() counts nodes, attributes and value lengths"""
+        # setup ------------------------
+        element = oxml_fromstring('<a x="12"><b>text</b><c/></a>')
+        # exercise ---------------------
+        estimate, nodes = tree_bytes(element)
+        # verify -----------------------
+        assert_that(nodes, is_(equal_to(4)))
+        expected = 5 * NODE_BYTES + ATTRIBUTE_BYTES + len('12text')
+        assert_that(estimate, is_(equal_to(expected)))
+
+    def test_skips_comments(self):
+        """tree_bytes() doesn't count comments as nodes"""
+        # setup ------------------------
+        element = oxml_fromstring('<a><b/><!--pts 0--></a>')
+        # exercise ---------------------
+        estimate, nodes = tree_bytes(element)
+        # verify -----------------------
+        assert_that(nodes, is_(equal_to(2)))
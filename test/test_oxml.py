@@ -9,17 +9,30 @@
 
 """Test suite for pptx.oxml module."""
 
-from datetime import datetime
+from array import array
+from datetime import date, datetime
+from io import BytesIO
 
-from hamcrest import assert_that, equal_to, instance_of, is_, none
+from hamcrest import (
+    assert_that, equal_to, instance_of, is_, is_not, none, same_instance
+)
+from lxml import etree
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 from pptx.constants import (
-    TEXT_ALIGN_TYPE as TAT, TEXT_ANCHORING_TYPE as TANC
+    TEXT_ALIGN_TYPE as TAT, TEXT_ANCHORING_TYPE as TANC, XL_CHART_TYPE as XL
 )
 from pptx.oxml import (
-    CT_CoreProperties, CT_GraphicalObjectFrame, CT_Picture,
-    CT_PresetGeometry2D, CT_Shape, CT_Table, nsdecls, qn
+    _ChartTemplate, CT_Chart_Container, CT_ChartCell, CT_CoreProperties,
+    CT_GraphicalObjectFrame, CT_Picture, CT_PresetGeometry2D, CT_Shape,
+    CT_Table, DATE_FORMAT_CODE, _Element, _iter_pts_xml, nsdecls,
+    _OxmlElement, oxml_fromstring, qn, _xpath
 )
+from pptx.spec import chart_types
 from pptx.spec import (
     PH_ORIENT_HORZ, PH_ORIENT_VERT, PH_SZ_FULL, PH_SZ_HALF, PH_SZ_QUARTER,
     PH_TYPE_CTRTITLE, PH_TYPE_DT, PH_TYPE_FTR, PH_TYPE_OBJ, PH_TYPE_SLDNUM,
@@ -34,6 +47,277 @@ from testing import TestCase
 # from unittest2 import skip
 
 
+class TestCT_Chart_Container(TestCase):
+    """Test CT_Chart_Container"""
+    def test_new_chart_handles_1000_series(self):
+        """CT_Chart_Container.new_chart() references columns beyond Z"""
+        # setup ------------------------
+        series_count = 1000
+        headings = ['Category'] + ['S%d' % idx for idx in range(series_count)]
+        data = [['a', 'b', 'c']] + [[idx, idx, idx]
+                                    for idx in range(series_count)]
+        # exercise ---------------------
+        chartSpace = CT_Chart_Container.new_chart(data, headings, 'rId1')
+        # verify -----------------------
+        sers = chartSpace.findall('.//%s' % qn('c:ser'))
+        f = sers[-1].find('%s/%s/%s' % (
+            qn('c:val'), qn('c:numRef'), qn('c:f')))
+        tx_f = sers[26].find('%s/%s/%s' % (
+            qn('c:tx'), qn('c:strRef'), qn('c:f')))
+        self.assertLength(sers, series_count)
+        assert_that(f.text, is_(equal_to('Sheet1!$ALM$2:$ALM$4')))
+        assert_that(tx_f.text, is_(equal_to('Sheet1!$AB$1')))
+
+    def test_write_chart_fills_deferred_caches(self):
+        """CT_Chart_Container.write_chart() writes deferred cache points"""
+        # setup ------------------------
+        values = array('d', [idx / 7.0 for idx in range(5000)])
+        data = [['a&%d' % idx for idx in range(5000)], values, values]
+        headings = ['Category', 'S1', 'S2']
+        sources = []
+        chartSpace = CT_Chart_Container.new_chart(
+            data, headings, 'rId1', sources=sources)
+        stream = BytesIO()
+        # exercise ---------------------
+        CT_Chart_Container.write_chart(chartSpace, sources, stream)
+        # verify -----------------------
+        expected = CT_Chart_Container.new_chart(data, headings, 'rId1')
+        actual = oxml_fromstring(stream.getvalue())
+        self.assertLength(chartSpace.findall('.//%s' % qn('c:pt')), 2)
+        # namespace declarations can come out in another order
+        assert_that(etree.tostring(actual, method='c14n'),
+                    is_(equal_to(etree.tostring(expected, method='c14n'))))
+
+    def test_write_chart_leaves_comments_outside_caches(self):
+        """CT_Chart_Container.write_chart() only fills cache placeholders"""
+        # setup ------------------------
+        data = [['a', 'b'], [1.0, 2.0]]
+        sources = []
+        chartSpace = CT_Chart_Container.new_chart(
+            data, ['Category', 'S1'], 'rId1', sources=sources)
+        chartSpace.append(etree.Comment('pts 0'))
+        stream = BytesIO()
+        # exercise ---------------------
+        CT_Chart_Container.write_chart(chartSpace, sources, stream)
+        # verify -----------------------
+        xml = stream.getvalue()
+        assert_that(xml.count('<!--pts 0-->'), is_(equal_to(1)))
+        assert_that(xml.count('<c:pt '), is_(equal_to(5)))
+
+    def test_iter_pts_xml_generates_chunks(self):
+        """_iter_pts_xml() generates pts a chunk at a time"""
+        cases = [([1.5, 2, 3, 4, 5], '5')]
+        if numpy is not None:
+            cases.append((numpy.array([1.5, 2, 3, 4, 5]), '5.0'))
+        for series, last_text in cases:
+            # exercise -----------------
+            chunks = list(_iter_pts_xml(series, False, chunk_size=2))
+            # verify -------------------
+            self.assertLength(chunks, 3)
+            assert_that(chunks[-1], is_(equal_to(
+                '<c:pt idx="4"><c:v>%s</c:v></c:pt>' % last_text)))
+
+
+    def test_new_chart_plot_element_for_each_chart_type(self):
+        """CT_Chart_Container.new_chart() adds plot for chart type"""
+        # setup ------------------------
+        data = [[1, 2], [3, 4]]
+        headings = ['Category', 'Series 1']
+        cases = (
+            (XL.AREA, 'c:areaChart', ['c:catAx', 'c:valAx']),
+            (XL.BAR_CLUSTERED, 'c:barChart', ['c:catAx', 'c:valAx']),
+            (XL.COLUMN_CLUSTERED, 'c:barChart', ['c:catAx', 'c:valAx']),
+            (XL.LINE, 'c:lineChart', ['c:catAx', 'c:valAx']),
+            (XL.PIE, 'c:pieChart', []),
+            (XL.XY_SCATTER, 'c:scatterChart', ['c:valAx', 'c:valAx']),
+        )
+        for chart_type, plot_tag, axis_tags in cases:
+            # exercise -----------------
+            chartSpace = CT_Chart_Container.new_chart(
+                data, headings, 'rId1', chart_type)
+            # verify -------------------
+            plotArea = chartSpace.find('%s/%s' % (
+                qn('c:chart'), qn('c:plotArea')))
+            tags = [child.tag for child in plotArea.iterchildren()]
+            expected = [qn(tag) for tag in ['c:layout', plot_tag]+axis_tags]
+            assert_that(tags, is_(equal_to(expected)))
+            assert_that(chart_type in chart_types, is_(True))
+        self.assertLength(chart_types, len(cases))
+
+    def test_new_chart_sets_axis_ids(self):
+        """CT_Chart_Container.new_chart() cross-references axis ids"""
+        # exercise ---------------------
+        chartSpace = CT_Chart_Container.new_chart(
+            [['a'], [1]], ['Category', 'Series 1'], 'rId1', XL.BAR_CLUSTERED)
+        # verify -----------------------
+        plotArea = chartSpace.find('%s/%s' % (
+            qn('c:chart'), qn('c:plotArea')))
+        barChart = plotArea.find(qn('c:barChart'))
+        catAx = plotArea.find(qn('c:catAx'))
+        valAx = plotArea.find(qn('c:valAx'))
+        axIds = [axId.get('val') for axId in barChart.findall(qn('c:axId'))]
+        assert_that(len(set(axIds)), is_(equal_to(2)))
+        assert_that(catAx.find(qn('c:axId')).get('val'),
+                    is_(equal_to(axIds[0])))
+        assert_that(catAx.find(qn('c:crossAx')).get('val'),
+                    is_(equal_to(axIds[1])))
+        assert_that(valAx.find(qn('c:crossAx')).get('val'),
+                    is_(equal_to(axIds[0])))
+        assert_that(catAx.find(qn('c:axPos')).get('val'), is_(equal_to('l')))
+
+    def test_new_chart_gives_date_categories_a_date_axis(self):
+        """CT_Chart_Container.new_chart() adds date axis for dates"""
+        # setup ------------------------
+        categories = [date(2024, 1, 1), datetime(2024, 1, 2, 12)]
+        # exercise ---------------------
+        chartSpace = CT_Chart_Container.new_chart(
+            [categories, [1, 2]], ['Date', 'Series 1'], 'rId1')
+        # verify -----------------------
+        plotArea = chartSpace.find('%s/%s' % (
+            qn('c:chart'), qn('c:plotArea')))
+        numCache = plotArea.find('%s/%s/%s/%s/%s' % (
+            qn('c:lineChart'), qn('c:ser'), qn('c:cat'), qn('c:numRef'),
+            qn('c:numCache')))
+        values = [v.text for v in numCache.iter(qn('c:v'))]
+        formatCode = numCache.find(qn('c:formatCode')).text
+        assert_that(plotArea.find(qn('c:dateAx')) is not None, is_(True))
+        assert_that(plotArea.find(qn('c:catAx')), is_(none()))
+        assert_that(values, is_(equal_to(['45292', '45293.5'])))
+        assert_that(formatCode, is_(equal_to(DATE_FORMAT_CODE)))
+
+    def test_new_chart_raises_on_text_scatter_x_values(self):
+        """CT_Chart_Container.new_chart() raises on text x values"""
+        for sources in (None, []):
+            with self.assertRaises(ValueError):
+                CT_Chart_Container.new_chart(
+                    [['a', 'b'], [1, 2]], ['x', 'y'], 'rId1', XL.XY_SCATTER,
+                    sources)
+
+    def test_new_chart_raises_on_unknown_chart_type(self):
+        """CT_Chart_Container.new_chart() raises on unknown chart type"""
+        with self.assertRaises(KeyError):
+            CT_Chart_Container.new_chart([[1], [2]], ['a', 'b'], 'rId1', 999)
+
+    def test_new_chart_wrapper_clones_skeleton(self):
+        """CT_Chart_Container.new_chart_wrapper() returns distinct trees"""
+        # exercise ---------------------
+        chartSpace1 = CT_Chart_Container.new_chart_wrapper('rId1')
+        chartSpace2 = CT_Chart_Container.new_chart_wrapper('rId2')
+        # verify -----------------------
+        expected = oxml_fromstring(CT_Chart_Container._chart_tmpl % 'rId1')
+        assert_that(etree.tostring(chartSpace1),
+                    is_(equal_to(etree.tostring(expected))))
+        externalData = chartSpace2.find(qn('c:externalData'))
+        assert_that(externalData.get(qn('r:id')), is_(equal_to('rId2')))
+        assert_that(chartSpace1, is_not(same_instance(chartSpace2)))
+
+
+class Test_ChartTemplate(TestCase):
+    """Test _ChartTemplate"""
+    def test_get_returns_cached_template(self):
+        """_ChartTemplate.get() compiles each chart type just once"""
+        # exercise ---------------------
+        template = _ChartTemplate.get(XL.PIE)
+        # verify -----------------------
+        assert_that(_ChartTemplate.get(XL.PIE), is_(same_instance(template)))
+        assert_that(_ChartTemplate.get(XL.PIE, True),
+                    is_not(same_instance(template)))
+
+
+class TestCT_ChartCell(TestCase):
+    """Test CT_ChartCell"""
+    def test_numRef_node_generates_unannotated_xml(self):
+        """CT_ChartCell.numRef_node() XML needs no deannotate before save"""
+        # setup ------------------------
+        expected_xml = (
+            '<c:numRef %s><c:f>Sheet1!$B$2:$B$3</c:f><c:numCache><c:formatCo'
+            'de>General</c:formatCode><c:ptCount val="2"/><c:pt idx="0"><c:v>'
+            '1</c:v></c:pt><c:pt idx="1"><c:v>2.5</c:v></c:pt></c:numCache><'
+            '/c:numRef>' % nsdecls('c')
+        )
+        # exercise ---------------------
+        numRef = CT_ChartCell.numRef_node([1, 2.5], 'Sheet1!$B$2:$B$3')
+        # verify -----------------------
+        assert_that(etree.tostring(numRef), is_(equal_to(expected_xml)))
+
+    def test_numRef_node_accepts_buffer_sequence(self):
+        """CT_ChartCell.numRef_node() accepts array.array series"""
+        # setup ------------------------
+        series = array('d', [1.5, 2.25, 3.0])
+        # exercise ---------------------
+        numRef = CT_ChartCell.numRef_node(series, 'Sheet1!$B$2:$B$4')
+        # verify -----------------------
+        values = [v.text for v in numRef.iter(qn('c:v'))]
+        ptCount = numRef.find('%s/%s' % (qn('c:numCache'), qn('c:ptCount')))
+        assert_that(values, is_(equal_to(['1.5', '2.25', '3.0'])))
+        assert_that(ptCount.get('val'), is_(equal_to('3')))
+
+    def test_numRef_node_skips_missing_values_and_converts_bools(self):
+        """CT_ChartCell.numRef_node() leaves NaN out, writes bools as 0/1"""
+        # setup ------------------------
+        nan = float('nan')
+        cases = [([1.5, nan, None, True, False], [1.5, nan, True, False])]
+        if numpy is not None:
+            cases.append((numpy.array([1.5, nan, numpy.nan, 1.0, 0.0]),
+                          numpy.array([True, False])))
+        for values, more_values in cases:
+            # exercise -----------------
+            numRef = CT_ChartCell.numRef_node(values, 'Sheet1!$B$2:$B$6')
+            more_numRef = CT_ChartCell.numRef_node(
+                more_values, 'Sheet1!$C$2:$C$5')
+            chunks = list(_iter_pts_xml(values, False))
+            # verify -------------------
+            pts = [(pt.get('idx'), pt.find(qn('c:v')).text)
+                   for pt in numRef.iter(qn('c:pt'))]
+            ptCount = numRef.find('%s/%s' % (
+                qn('c:numCache'), qn('c:ptCount')))
+            more_texts = [v.text for v in more_numRef.iter(qn('c:v'))]
+            assert_that([idx for idx, text in pts],
+                        is_(equal_to(['0', '3', '4'])))
+            assert_that(pts[0][1], is_(equal_to('1.5')))
+            assert_that(ptCount.get('val'), is_(equal_to('5')))
+            assert_that(more_texts[-2:], is_(equal_to(['1', '0'])))
+            assert_that('nan' in ''.join(chunks), is_(False))
+
+    def test_strRef_node_escapes_values(self):
+        """CT_ChartCell.strRef_node() escapes XML special characters"""
+        # exercise ---------------------
+        strRef = CT_ChartCell.strRef_node(['a&b', '<c>'], 'Sheet1!$A$2:$A$3')
+        # verify -----------------------
+        values = [v.text for v in strRef.iter(qn('c:v'))]
+        assert_that(values, is_(equal_to(['a&b', '<c>'])))
+
+    def test_replace_cache_keeps_formula_and_format_code(self):
+        """CT_ChartCell.replace_cache() rewrites only the cache"""
+        # setup ------------------------
+        numRef = CT_ChartCell.numRef_node(
+            [45292, 45293], 'Sheet1!$A$2:$A$3', DATE_FORMAT_CODE)
+        # exercise ---------------------
+        CT_ChartCell.replace_cache(numRef, [45300, 45301, 45302])
+        # verify -----------------------
+        numCache = numRef.find(qn('c:numCache'))
+        values = [v.text for v in numRef.iter(qn('c:v'))]
+        assert_that(numRef.find(qn('c:f')).text,
+                    is_(equal_to('Sheet1!$A$2:$A$3')))
+        assert_that(numCache.find(qn('c:formatCode')).text,
+                    is_(equal_to(DATE_FORMAT_CODE)))
+        assert_that(numCache.find(qn('c:ptCount')).get('val'),
+                    is_(equal_to('3')))
+        assert_that(values, is_(equal_to(['45300', '45301', '45302'])))
+        self.assertLength(numRef.findall(qn('c:numCache')), 1)
+
+    def test_replace_cache_replaces_str_cache(self):
+        """CT_ChartCell.replace_cache() replaces a strCache"""
+        # setup ------------------------
+        strRef = CT_ChartCell.strRef_node(['a', 'b'], 'Sheet1!$A$2:$A$3')
+        # exercise ---------------------
+        CT_ChartCell.replace_cache(strRef, ['x & y'])
+        # verify -----------------------
+        values = [v.text for v in strRef.iter(qn('c:v'))]
+        assert_that(values, is_(equal_to(['x & y'])))
+        self.assertLength(strRef.findall(qn('c:strCache')), 1)
+
+
 class TestCT_CoreProperties(TestCase):
     """Test CT_CoreProperties"""
     _cases = (
@@ -156,6 +440,17 @@ class TestCT_CoreProperties(TestCase):
                 propname, '2013-06-16T12:34:56Z').xml
             self.assertEqualLineByLine(expected_xml, coreProperties)
 
+    def test_setters_do_not_annotate(self):
+        """Assignment to CT_CoreProperties property adds no py:pytype attr"""
+        # setup ------------------------
+        coreProperties = a_coreProperties().element
+        # exercise ---------------------
+        coreProperties.title = 'Title'
+        coreProperties.revision = 9
+        coreProperties.modified = datetime(2013, 6, 15, 12, 34, 56)
+        # verify -----------------------
+        assert_that('pytype' in etree.tostring(coreProperties), is_(False))
+
     def test_date_setter_raises_on_not_datetime(self):
         """Raises on assign non-datetime to CT_CoreProperties date prop"""
         # setup ------------------------
@@ -225,7 +520,8 @@ class TestCT_GraphicalObjectFrame(TestCase):
         chart_uri = 'http://schemas.openxmlformats.org/drawingml/2006/chart'
         graphicFrame = CT_GraphicalObjectFrame.new_graphicFrame(
             id_, name, left, top, width, height)
-        graphicData = graphicFrame[qn('a:graphic')].graphicData
+        graphicData = graphicFrame.find(
+            '%s/%s' % (qn('a:graphic'), qn('a:graphicData')))
         # verify -----------------------
         graphicData.set('uri', tbl_uri)
         assert_that(graphicFrame.has_table, is_(equal_to(True)))
@@ -299,6 +595,63 @@ class TestCT_GraphicalObjectFrame(TestCase):
         self.assertEqualLineByLine(xml, graphicFrame)
 
 
+class Test_Element(TestCase):
+    """Test _Element()"""
+    def test_declares_only_namespace_of_tag_by_default(self):
+        """_Element() declares only the namespace of its tag by default"""
+        # exercise ---------------------
+        pPr = _Element('a:pPr')
+        # verify -----------------------
+        expected_xml = '<a:pPr %s/>' % nsdecls('a')
+        assert_that(etree.tostring(pPr), is_(equal_to(expected_xml)))
+
+
+class Test_OxmlElement(TestCase):
+    """Test _OxmlElement, base element class of the 'etree' backend"""
+    def test_setText_sets_element_text(self):
+        """_OxmlElement._setText() sets element text without annotation"""
+        # setup ------------------------
+        lookup = etree.ElementDefaultClassLookup(element=_OxmlElement)
+        parser = etree.XMLParser()
+        parser.set_element_class_lookup(lookup)
+        t = etree.fromstring('<a:t %s/>' % nsdecls('a'), parser)
+        # exercise ---------------------
+        t._setText('foobar')
+        # verify -----------------------
+        expected_xml = '<a:t %s>foobar</a:t>' % nsdecls('a')
+        assert_that(t, is_(instance_of(_OxmlElement)))
+        assert_that(etree.tostring(t), is_(equal_to(expected_xml)))
+
+
+class Test_qn(TestCase):
+    """Test qn()"""
+    def test_returns_memoized_clark_name(self):
+        """qn() returns the same Clark name object on each call"""
+        # exercise ---------------------
+        clark_name = qn('p:cSld')
+        # verify -----------------------
+        expected = '{http://schemas.openxmlformats.org/presentationml/2006/m'\
+                   'ain}cSld'
+        assert_that(clark_name, is_(equal_to(expected)))
+        assert_that(qn('p:cSld'), is_(same_instance(clark_name)))
+
+
+class Test_xpath(TestCase):
+    """Test _xpath()"""
+    def test_returns_cached_compiled_xpath(self):
+        """_xpath() returns one compiled XPath object per expression"""
+        # setup ------------------------
+        p = _Element('a:p')
+        for idx in range(3):
+            p.append(_Element('a:r'))
+        # exercise ---------------------
+        xpath = _xpath('./a:r')
+        # verify -----------------------
+        assert_that(xpath, is_(instance_of(etree.XPath)))
+        assert_that(_xpath('./a:r'), is_(same_instance(xpath)))
+        assert_that(len(xpath(p)), is_(equal_to(3)))
+
+
 class TestCT_Picture(TestCase):
     """Test CT_Picture"""
     def test_new_pic_generates_correct_xml(self):
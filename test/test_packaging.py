@@ -14,7 +14,7 @@ import os
 from collections import namedtuple
 from hamcrest import assert_that, is_
 from lxml import etree
-from mock import Mock
+from mock import Mock, patch
 from StringIO import StringIO
 from zipfile import BadZipfile, ZipFile, is_zipfile
 
@@ -28,7 +28,7 @@ from pptx.exceptions import (
 
 from pptx.packaging import (
     _ContentTypesItem, DirectoryFileSystem, FileSystem, Package, Part,
-    PartTypeSpec, ZipFileSystem)
+    PartTypeSpec, ZIP_DATE_TIME, ZipFileSystem)
 
 from pptx.spec import PTS_CARDINALITY_TUPLE, PTS_HASRELS_ALWAYS
 
@@ -425,6 +425,32 @@ class TestPackage(TestCase):
         msg = "no zipfile at %s" % (save_path)
         self.assertTrue(actual, msg)
 
+    def test_save_writes_spooled_part_from_disk(self):
+        """Package.save() writes spooled part from disk then removes it"""
+        # setup -----------------------
+        model_pkg = pptx.presentation._Package()
+        presentation = model_pkg.presentation
+        slide = presentation.slides.add_slide(
+            presentation.slidemasters[0].slidelayouts[6])
+        slide.shapes.add_chart(0, 0, 100, 100, [['a', 'b'], [1, 2]],
+                               ['Cat', 'S1'])
+        chart_xml = model_pkg._charts[0]._serialize(False)
+        with patch('pptx.presentation.CHART_SPOOL_POINTS', 0):
+            self.pkg.marshal(model_pkg, pretty_print=False)
+        chart_part = [part for part in self.pkg.parts
+                      if part.partname == '/ppt/charts/chart1.xml'][0]
+        blob_path = chart_part.blob_path
+        stream = StringIO()
+        # exercise --------------------
+        self.pkg.save(stream, pretty_print=False)
+        # verify ----------------------
+        assert_that(chart_part.blob, is_(None))
+        assert_that(os.path.exists(blob_path), is_(False))
+        assert_that(chart_part.blob_path, is_(None))
+        zip = ZipFile(stream)
+        assert_that(zip.read('ppt/charts/chart1.xml'), is_(chart_xml))
+        zip.close()
+
     def test_save_member_count(self):
         """Package.save() produces expected zip member count"""
         # setup -----------------------
@@ -439,6 +465,21 @@ class TestPackage(TestCase):
         partnames = [name for name in names if not name.endswith('/')]
         self.assertLength(partnames, 38)
 
+    def test_save_is_deterministic(self):
+        """Package.save() writes same bytes, fixed timestamps, each time"""
+        # setup -----------------------
+        self.pkg.open(dir_pkg_path)
+        stream1, stream2 = StringIO(), StringIO()
+        # exercise --------------------
+        self.pkg.save(stream1)
+        self.pkg.save(stream2)
+        # verify ----------------------
+        assert_that(stream1.getvalue() == stream2.getvalue(), is_(True))
+        zip = ZipFile(stream1)
+        date_times = set([info.date_time for info in zip.infolist()])
+        zip.close()
+        assert_that(date_times, is_(set([ZIP_DATE_TIME])))
+
 
 class TestPart(TestCase):
     """Test Part"""
@@ -702,6 +743,23 @@ class TestZipFileSystem(TestCase):
         msg = "expected \n%s\n, got\n%s" % (expected, actual)
         self.assertEqual(expected, actual, msg)
 
+    def test_write_element_writes_compact_xml_when_not_pretty(self):
+        """ZipFileSystem.write_element() writes compact XML on request"""
+        # setup -----------------------
+        elm = etree.fromstring(self.xml_in)
+        itemURI = '/ppt/test.xml'
+        zipfs = ZipFileSystem(test_save_pptx_path, 'w')
+        # exercise --------------------
+        zipfs.write_element(elm, itemURI, pretty_print=False)
+        # verify ----------------------
+        stream = zipfs.getstream(itemURI)
+        xml_out = stream.read()
+        stream.close()
+        expected = etree.tostring(elm, encoding='UTF-8', standalone=True)
+        actual = xml_out
+        msg = "expected \n%s\n, got\n%s" % (expected, actual)
+        self.assertEqual(expected, actual, msg)
+
     def test_write_element_raises_on_dup_itemuri(self):
         """ZipFileSystem.write_element() raises on duplicate itemURI"""
         # setup -----------------------
@@ -11,8 +11,16 @@
 
 import gc
 import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import weakref
+import zipfile
 
 from datetime import datetime, timedelta
+from multiprocessing.pool import ThreadPool
 from StringIO import StringIO
 
 from hamcrest import (
@@ -23,25 +31,26 @@ from mock import Mock, patch, PropertyMock
 
 import pptx.presentation
 
+from pptx.constants import MSO_AUTO_SHAPE_TYPE as MAST, XL_CHART_TYPE as XL
 from pptx.exceptions import InvalidPackageError
 from pptx.oxml import (
     CT_CoreProperties, oxml_fromstring, oxml_parse, oxml_tostring
 )
-from pptx.packaging import prettify_nsdecls
+from pptx.packaging import PartTypeSpec, prettify_nsdecls
 from pptx.presentation import (
     _BasePart, _BaseSlide, _CoreProperties, _Image, _Package, _Part,
     _PartCollection, Presentation, _Relationship, _RelationshipCollection,
-    _Slide, _SlideCollection, _SlideLayout, _SlideMaster
+    _Slide, _SlideCollection, _SlideLayout, _SlideMaster, _xlsxCollection
 )
-from pptx.shapes import _ShapeCollection
+from pptx.shapes import _AutoShapeType, _ShapeCollection
 from pptx.spec import namespaces, qtag
 from pptx.spec import (
     CT_CORE_PROPS, CT_PRESENTATION, CT_SLIDE, CT_SLIDE_LAYOUT,
     CT_SLIDE_MASTER
 )
 from pptx.spec import (
-    RT_CORE_PROPS, RT_IMAGE, RT_OFFICE_DOCUMENT, RT_PRES_PROPS, RT_SLIDE,
-    RT_SLIDE_LAYOUT, RT_SLIDE_MASTER
+    RT_CORE_PROPS, RT_EXCEL_XLSX, RT_IMAGE, RT_OFFICE_DOCUMENT, RT_PRES_PROPS,
+    RT_SLIDE, RT_SLIDE_LAYOUT, RT_SLIDE_MASTER
 )
 from pptx.util import Px
 from testing import TestCase
@@ -221,6 +230,21 @@ class Test_BasePart(TestCase):
         msg = "expected: \n'%s'\n, got \n'%s'" % (expected, actual)
         self.assertEqual(expected, actual, msg)
 
+    def test__serialize_value_for_xml_part_when_not_pretty(self):
+        """_BasePart._serialize() omits indentation when not pretty"""
+        # setup ------------------------
+        elm = oxml_fromstring('<root><elm1 attr="one"/></root>')
+        self.basepart._element = elm
+        self.basepart.partname = '/ppt/presentation.xml'
+        # exercise ---------------------
+        retval = self.basepart._serialize(pretty_print=False)
+        # verify -----------------------
+        expected = "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>"\
+                   '\n<root><elm1 attr="one"/></root>'
+        actual = retval
+        msg = "expected: \n'%s'\n, got \n'%s'" % (expected, actual)
+        self.assertEqual(expected, actual, msg)
+
     def test__load_sets__element_for_xml_part(self):
         """_BasePart._load() sets _element for xml part"""
         # setup ------------------------
@@ -318,6 +342,271 @@ class Test_BaseSlide(TestCase):
         assert_that(retval_rel, is_(rel))
 
 
+class Test_Chart(TestCase):
+    """Test _Chart"""
+    def setUp(self):
+        pkg = _Package()
+        slide = pkg.presentation.slides.add_slide(
+            pkg.presentation.slidemasters[0].slidelayouts[6])
+        data = [['a', 'b', 'c'], [1, 2, 3], [4.5, 5, 6]]
+        slide.shapes.add_chart(Px(0), Px(0), Px(600), Px(400), data,
+                               ['Cat', 'S1', 'S2'])
+        stream = StringIO()
+        pkg.save(stream)
+        self.pkg = _Package(stream)
+        self.chart = self.pkg._charts[0]
+
+    def test_new_chart_writes_cache_points_when_serialized(self):
+        """_Chart of new chart writes cache points only when serialized"""
+        # setup ------------------------
+        pkg = _Package()
+        slide = pkg.presentation.slides.add_slide(
+            pkg.presentation.slidemasters[0].slidelayouts[6])
+        slide.shapes.add_chart(Px(0), Px(0), Px(600), Px(400),
+                               [['a', 'b'], [1, 2]], ['Cat', 'S1'])
+        chart = pkg._charts[0]
+        # exercise ---------------------
+        chart_xml = chart._serialize()
+        small_chart_spool_path = chart._spool()
+        with patch('pptx.presentation.CHART_SPOOL_POINTS', 0):
+            spool_path = chart._spool()
+        # verify -----------------------
+        assert_that(small_chart_spool_path, is_(None))
+        try:
+            with open(spool_path, 'rb') as f:
+                assert_that(f.read(), is_(equal_to(chart_xml)))
+        finally:
+            os.remove(spool_path)
+        pts = chart._element.findall('.//' + qtag('c:pt'))
+        self.assertLength(pts, 1)  # just the series name
+        self.assertLength(oxml_fromstring(chart_xml).findall(
+            './/' + qtag('c:pt')), 5)
+
+    def test_failed_save_leaves_no_spool_files(self):
+        """_Package.save() removes chart spool files when save fails"""
+        # setup ------------------------
+        slide = self.pkg.presentation.slides.add_slide(
+            self.pkg.presentation.slidemasters[0].slidelayouts[6])
+        slide.shapes.add_chart(Px(0), Px(0), Px(600), Px(400),
+                               [['a', 'b'], [1, 2]], ['Cat', 'S1'])
+        spool_dir = tempfile.mkdtemp()
+        bad_path = os.path.join(spool_dir, 'no-such-dir', 'out.pptx')
+        # exercise ---------------------
+        try:
+            with patch('pptx.presentation.CHART_SPOOL_POINTS', 0):
+                with patch('tempfile.tempdir', spool_dir):
+                    with self.assertRaises(IOError):
+                        self.pkg.save(bad_path)
+            leftover = os.listdir(spool_dir)
+        finally:
+            shutil.rmtree(spool_dir)
+        # verify -----------------------
+        assert_that(leftover, is_(equal_to([])))
+
+    def test_add_chart_writes_nothing_to_stdout(self):
+        """Adding a chart writes nothing to stdout"""
+        # setup ------------------------
+        slide = self.pkg.presentation.slides.add_slide(
+            self.pkg.presentation.slidemasters[0].slidelayouts[6])
+        stdout = StringIO()
+        # exercise ---------------------
+        with patch('sys.stdout', stdout):
+            slide.shapes.add_chart(Px(0), Px(0), Px(600), Px(400),
+                                   [['a', 'b'], [1, 2]], ['Cat', 'S1'])
+        # verify -----------------------
+        assert_that(stdout.getvalue(), is_(equal_to('')))
+
+    def test_loaded_chart_is_not_spooled(self):
+        """_Chart loaded from a package has nothing to spool"""
+        assert_that(self.chart._spool(), is_(None))
+
+    def test_replace_data_rewrites_caches_and_formulas(self):
+        """_Chart.replace_data() rewrites chart caches and formulas"""
+        # exercise ---------------------
+        self.chart.replace_data(['w', 'x', 'y', 'z'],
+                                [[10, 20, 30, 40], [1.5, 2.5, 3.5, 4.5]])
+        # verify -----------------------
+        sers = self.chart._element.xpath(
+            './/c:ser', namespaces=namespaces('c'))
+        cat_values = [v.text for v in sers[0].find(qtag('c:cat')).iter(
+            qtag('c:v'))]
+        val_values = [v.text for v in sers[1].find(qtag('c:val')).iter(
+            qtag('c:v'))]
+        formulas = [f.text for f in self.chart._element.iter(qtag('c:f'))]
+        assert_that(cat_values, is_(equal_to(['w', 'x', 'y', 'z'])))
+        assert_that(val_values, is_(equal_to(['1.5', '2.5', '3.5', '4.5'])))
+        assert_that(formulas, is_(equal_to([
+            'Sheet1!$B$1', 'Sheet1!$A$2:$A$5', 'Sheet1!$B$2:$B$5',
+            'Sheet1!$C$1', 'Sheet1!$A$2:$A$5', 'Sheet1!$C$2:$C$5'])))
+
+    def test_replace_data_patches_embedded_worksheet(self):
+        """_Chart.replace_data() patches embedded worksheet after save"""
+        # setup ------------------------
+        self.chart.replace_data(['w', 'x'], [[10, 20], [1.5, 2.5]])
+        stream = StringIO()
+        # exercise ---------------------
+        self.pkg.save(stream)
+        # verify -----------------------
+        pkg = _Package(stream)
+        xlsx_blob = pkg._xlsx[0]._blob
+        sheet_xml = zipfile.ZipFile(StringIO(xlsx_blob)).read(
+            'xl/worksheets/sheet1.xml')
+        sheet = oxml_fromstring(sheet_xml)
+        x = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+        cells = dict((c.get('r'), ''.join(c.itertext()))
+                     for c in sheet.iter(x + 'c'))
+        assert_that(cells['A3'], is_(equal_to('x')))
+        assert_that(cells['C3'], is_(equal_to('2.5')))
+        assert_that('A4' in cells, is_(False))
+        self.assertLength(pkg._charts[0]._element.findall(
+            './/' + qtag('c:numCache')), 2)
+
+    def test_replace_data_leaves_nan_worksheet_cells_out(self):
+        """_Chart.replace_data() writes no worksheet cell for NaN"""
+        # setup ------------------------
+        self.chart.replace_data(['a', 'b', 'c'],
+                                [[1.0, float('nan'), None], [4, 5, 6]])
+        stream = StringIO()
+        # exercise ---------------------
+        self.pkg.save(stream)
+        # verify -----------------------
+        xlsx_blob = _Package(stream)._xlsx[0]._blob
+        sheet_xml = zipfile.ZipFile(StringIO(xlsx_blob)).read(
+            'xl/worksheets/sheet1.xml')
+        assert_that('nan' in sheet_xml, is_(False))
+        assert_that('r="B3"' in sheet_xml, is_(False))
+        assert_that('r="B4"' in sheet_xml, is_(False))
+        assert_that('r="C3"' in sheet_xml, is_(True))
+
+    def test_charts_of_same_data_share_workbook(self):
+        """Charts of the same data share one embedded workbook part"""
+        # setup ------------------------
+        pkg = _Package()
+        slide = pkg.presentation.slides.add_slide(
+            pkg.presentation.slidemasters[0].slidelayouts[6])
+        data = [['a', 'b'], [1, 2]]
+        # exercise ---------------------
+        for idx in range(3):
+            slide.shapes.add_chart(Px(0), Px(0), Px(600), Px(400), data,
+                                   ['Cat', 'S1'])
+        # verify -----------------------
+        self.assertLength(pkg._charts, 3)
+        self.assertLength(pkg._xlsx, 1)
+
+    def test_replace_data_leaves_shared_workbook_unchanged(self):
+        """_Chart.replace_data() copies a workbook other charts share"""
+        # setup ------------------------
+        pkg = _Package()
+        slide = pkg.presentation.slides.add_slide(
+            pkg.presentation.slidemasters[0].slidelayouts[6])
+        for idx in range(2):
+            slide.shapes.add_chart(Px(0), Px(0), Px(600), Px(400),
+                                   [['a', 'b'], [1, 2]], ['Cat', 'S1'])
+        chart_1, chart_2 = pkg._charts
+        shared_xlsx = pkg._xlsx[0]
+        shared_blob = shared_xlsx._blob
+        # exercise ---------------------
+        chart_1.replace_data(['x', 'y', 'z'], [[7, 8, 9]])
+        # verify -----------------------
+        rel_1 = chart_1._relationships.rels_of_reltype(RT_EXCEL_XLSX)[0]
+        rel_2 = chart_2._relationships.rels_of_reltype(RT_EXCEL_XLSX)[0]
+        assert_that(rel_1._target, is_not(same_instance(shared_xlsx)))
+        assert_that(rel_2._target, is_(same_instance(shared_xlsx)))
+        assert_that(shared_xlsx._blob, is_(equal_to(shared_blob)))
+
+    def test_replace_data_drops_unreferenced_workbook(self):
+        """_Chart.replace_data() drops workbook no chart embeds any longer"""
+        # setup ------------------------
+        old_xlsx = self.pkg._xlsx[0]
+        # exercise ---------------------
+        self.chart.replace_data(['w', 'x'], [[10, 20], [1.5, 2.5]])
+        # verify -----------------------
+        rel = self.chart._relationships.rels_of_reltype(RT_EXCEL_XLSX)[0]
+        self.assertLength(self.pkg._xlsx, 1)
+        assert_that(self.pkg._xlsx[0], is_(same_instance(rel._target)))
+        assert_that(rel._target, is_not(same_instance(old_xlsx)))
+
+    def test_replace_data_leaves_chart_unchanged_on_error(self):
+        """_Chart.replace_data() changes nothing if workbook edit fails"""
+        # setup ------------------------
+        chart_xml = oxml_tostring(self.chart._element)
+        rel = self.chart._relationships.rels_of_reltype(RT_EXCEL_XLSX)[0]
+        old_xlsx = rel._target
+        replace_columns = Mock(side_effect=ValueError)
+        # exercise ---------------------
+        with patch('pptx.presentation.replace_columns', replace_columns):
+            with self.assertRaises(ValueError):
+                self.chart.replace_data(['w', 'x'], [[10, 20], [1.5, 2.5]])
+        # verify -----------------------
+        assert_that(oxml_tostring(self.chart._element),
+                    is_(equal_to(chart_xml)))
+        assert_that(rel._target, is_(same_instance(old_xlsx)))
+        self.assertLength(self.pkg._xlsx, 1)
+
+    def test_add_scatter_chart_raises_on_text_x_values(self):
+        """Adding scatter chart of text x values raises, adds no parts"""
+        # setup ------------------------
+        slide = self.pkg.presentation.slides.add_slide(
+            self.pkg.presentation.slidemasters[0].slidelayouts[6])
+        chart_count = len(self.pkg._charts)
+        # exercise ---------------------
+        with self.assertRaises(ValueError):
+            slide.shapes.add_chart(Px(0), Px(0), Px(600), Px(400),
+                                   [['a', 'b'], [1, 2]], ['x', 'y'],
+                                   XL.XY_SCATTER)
+        # verify -----------------------
+        self.assertLength(self.pkg._charts, chart_count)
+        self.assertLength(self.pkg._xlsx, 1)
+
+    def test_replace_data_raises_on_series_count_mismatch(self):
+        """_Chart.replace_data() raises on wrong number of series"""
+        with self.assertRaises(ValueError):
+            self.chart.replace_data(['w'], [[1]])
+
+
+class TestConcurrentGeneration(TestCase):
+    """Test building presentations on concurrent threads"""
+    def _build_deck(self, idx):
+        """
+        Return the saved bytes of a deck having one of each kind of shape.
+        """
+        pkg = _Package()
+        prs = pkg.presentation
+        slide = prs.slides.add_slide(prs.slidemasters[0].slidelayouts[6])
+        shapes = slide.shapes
+        shapes.add_textbox(Px(0), Px(0), Px(300), Px(50)).textframe.text = (
+            'Deck text')
+        shapes.add_picture(test_image_path, Px(0), Px(60))
+        shapes.add_shape(MAST.ROUNDED_RECTANGLE, Px(300), Px(0), Px(100),
+                         Px(50))
+        table = shapes.add_table(3, 3, Px(0), Px(200), Px(300), Px(100))
+        table.cell(0, 0).text = 'Cell text'
+        data = [['a', 'b', 'c'], [1, 2, 3], [4.5, 5, 6]]
+        shapes.add_chart(Px(300), Px(200), Px(300), Px(200), data,
+                         ['Cat', 'S1', 'S2'])
+        stream = StringIO()
+        pkg.save(stream)
+        return stream.getvalue()
+
+    def test_decks_built_on_threads_match_serial_build(self):
+        """Decks built concurrently are identical to one built serially"""
+        # setup ------------------------
+        expected = self._build_deck(-1)
+        # threads race to create the shared flyweights afresh
+        PartTypeSpec._PartTypeSpec__instances.clear()
+        _AutoShapeType._AutoShapeType__instances.clear()
+        pool = ThreadPool(8)
+        # exercise ---------------------
+        try:
+            blobs = pool.map(self._build_deck, range(16))
+        finally:
+            pool.close()
+            pool.join()
+        # verify -----------------------
+        for blob in blobs:
+            assert_that(blob == expected, is_(True))
+
+
 class Test_CoreProperties(TestCase):
     """Test _CoreProperties"""
     def test_default_constructs_default_core_props(self):
@@ -339,6 +628,22 @@ class Test_CoreProperties(TestCase):
         assert_that(modified_timedelta, less_than(max_expected_timedelta))
 
 
+class TestImportCost(TestCase):
+    """Test cost of importing pptx"""
+    def test_import_defers_slow_optional_modules(self):
+        """import pptx leaves PIL, xlsxwriter and NumPy unimported"""
+        # setup ------------------------
+        script = (
+            "import sys; import pptx; "
+            "print [m for m in ('PIL', 'Image', 'xlsxwriter', 'numpy') "
+            "if m in sys.modules]")
+        # exercise ---------------------
+        output = subprocess.check_output(
+            [sys.executable, '-c', script], cwd=absjoin(thisdir, '..'))
+        # verify -----------------------
+        assert_that(output.strip(), is_(equal_to('[]')))
+
+
 class Test_Image(TestCase):
     """Test _Image"""
     def test_construction_from_file(self):
@@ -462,6 +767,42 @@ class Test_Package(TestCase):
         if os.path.isfile(self.test_pptx_path):
             os.remove(self.test_pptx_path)
 
+    def test_close_frees_parts_without_garbage_collection(self):
+        """_Package.close() lets parts be freed by reference counting"""
+        # setup ------------------------
+        pkg = _Package(images_pptx_path)
+        slide = pkg.presentation.slides.add_slide(
+            pkg.presentation.slidemasters[0].slidelayouts[6])
+        slide.shapes.add_chart(Px(0), Px(0), Px(600), Px(400),
+                               [['a', 'b'], [1, 2]], ['Cat', 'S1'])
+        wkrefs = [weakref.ref(pkg)]
+        wkrefs.extend(weakref.ref(part) for part in pkg._parts)
+        del slide
+        gc.collect()
+        gc.disable()
+        # exercise ---------------------
+        try:
+            pkg.close()
+            del pkg
+            alive = [wkref for wkref in wkrefs if wkref() is not None]
+        finally:
+            gc.enable()
+        # verify -----------------------
+        self.assertLength(alive, 0)
+
+    def test_close_unregisters_instance(self):
+        """_Package.close() removes package from instances()"""
+        # setup ------------------------
+        pkg = _Package()
+        # exercise ---------------------
+        pkg.close()
+        pkg.close()
+        # verify -----------------------
+        assert_that(pkg.closed, is_(True))
+        assert_that(pkg in _Package.instances(), is_(False))
+        with self.assertRaises(ValueError):
+            pkg.save(StringIO())
+
     def test_construction_with_no_path_loads_default_template(self):
         """_Package() call with no path loads default template"""
         prs = _Package().presentation
@@ -563,6 +904,24 @@ class Test_Package(TestCase):
         assert_that(len(slidelayouts), is_(11))
 
 
+    def test_compact_save_writes_unindented_xml(self):
+        """_Package.save(compact=True) writes smaller, unindented XML"""
+        # setup ------------------------
+        pretty_pkg, compact_pkg = _Package(), _Package()
+        pretty_pkg.save(self.test_pptx_path)
+        pretty_size = os.path.getsize(self.test_pptx_path)
+        # exercise ---------------------
+        compact_pkg.save(self.test_pptx_path, compact=True)
+        # verify -----------------------
+        zipf = zipfile.ZipFile(self.test_pptx_path)
+        xml = zipf.read('ppt/presentation.xml')
+        zipf.close()
+        assert_that(len(xml.splitlines()), is_(2))
+        assert_that(os.path.getsize(self.test_pptx_path),
+                    is_(less_than(pretty_size)))
+        prs = _Package(self.test_pptx_path).presentation
+        assert_that(len(prs.slidemasters[0].slidelayouts), is_(11))
+
 class Test_Part(TestCase):
     """Test _Part"""
     def test_constructs_presentation_for_rt_officedocument(self):
@@ -1186,3 +1545,85 @@ class Test_SlideMaster(TestCase):
         slidelayouts = slidemaster.slidelayouts
         # verify -----------------------
         self.assertLength(slidelayouts, 11)
+
+
+class Test_xlsxCollection(TestCase):
+    """Test _xlsxCollection"""
+    def setUp(self):
+        self.xlsx_blob = 'PK\x03\x04 workbook bytes'
+
+    def _xlsx_stream(self, num):
+        """Return a stream containing workbook blob number *num*"""
+        return StringIO('%s %d' % (self.xlsx_blob, num))
+
+    def test_add_xlsx_names_workbooks_per_collection(self):
+        """_xlsxCollection.add_xlsx() numbers workbooks per collection"""
+        # setup ------------------------
+        tmpl = '/ppt/embeddings/Microsoft_Excel_Worksheet%d.xlsx'
+        xlsx_collection_1 = _xlsxCollection(None)
+        xlsx_collection_2 = _xlsxCollection(None)
+        # exercise ---------------------
+        xlsx_1 = xlsx_collection_1.add_xlsx(self._xlsx_stream(1))
+        xlsx_2 = xlsx_collection_1.add_xlsx(self._xlsx_stream(2))
+        xlsx_3 = xlsx_collection_2.add_xlsx(self._xlsx_stream(1))
+        # verify -----------------------
+        assert_that(xlsx_1.partname, is_(equal_to(tmpl % 1)))
+        assert_that(xlsx_2.partname, is_(equal_to(tmpl % 2)))
+        assert_that(xlsx_3.partname, is_(equal_to(tmpl % 1)))
+        assert_that(xlsx_2._blob, is_(equal_to(self.xlsx_blob + ' 2')))
+
+    def test_add_xlsx_reuses_matching_workbook(self):
+        """_xlsxCollection.add_xlsx() returns existing identical workbook"""
+        # setup ------------------------
+        xlsx_collection = _xlsxCollection(None)
+        loaded = _BasePart(partname=(
+            '/ppt/embeddings/Microsoft_Excel_Worksheet1.xlsx'))
+        loaded._load_blob = 'PK\x03\x04 loaded bytes'
+        xlsx_collection._loadpart(loaded)
+        # exercise ---------------------
+        xlsx_1 = xlsx_collection.add_xlsx(StringIO(self.xlsx_blob))
+        xlsx_2 = xlsx_collection.add_xlsx(StringIO(self.xlsx_blob))
+        xlsx_3 = xlsx_collection.add_xlsx(StringIO(loaded._load_blob))
+        # verify -----------------------
+        assert_that(xlsx_2, is_(same_instance(xlsx_1)))
+        assert_that(xlsx_3, is_(same_instance(loaded)))
+        self.assertLength(xlsx_collection, 2)
+
+    def test_add_xlsx_numbers_after_loaded_workbooks(self):
+        """_xlsxCollection.add_xlsx() numbers after loaded workbooks"""
+        # setup ------------------------
+        xlsx_collection = _xlsxCollection(None)
+        loaded = _BasePart(partname=(
+            '/ppt/embeddings/Microsoft_Excel_Worksheet7.xlsx'))
+        loaded._load_blob = 'PK\x03\x04 loaded bytes'
+        xlsx_collection._loadpart(loaded)
+        # exercise ---------------------
+        xlsx = xlsx_collection.add_xlsx(StringIO(self.xlsx_blob))
+        # verify -----------------------
+        expected = '/ppt/embeddings/Microsoft_Excel_Worksheet8.xlsx'
+        assert_that(xlsx.partname, is_(equal_to(expected)))
+        self.assertLength(xlsx_collection, 2)
+
+    def test_add_xlsx_names_are_unique_across_threads(self):
+        """_xlsxCollection.add_xlsx() names unique when called on threads"""
+        # setup ------------------------
+        thread_count, add_count = 8, 50
+        xlsx_collection = _xlsxCollection(None)
+
+        def add_workbooks(thread_idx):
+            for idx in range(add_count):
+                num = thread_idx * add_count + idx
+                xlsx_collection.add_xlsx(self._xlsx_stream(num))
+                # every thread also adds the same shared workbook
+                xlsx_collection.add_xlsx(self._xlsx_stream(-1))
+        threads = [threading.Thread(target=add_workbooks, args=(idx,))
+                   for idx in range(thread_count)]
+        # exercise ---------------------
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # verify -----------------------
+        partnames = set([xlsx.partname for xlsx in xlsx_collection])
+        self.assertLength(xlsx_collection, thread_count * add_count + 1)
+        self.assertLength(partnames, thread_count * add_count + 1)
@@ -10,12 +10,15 @@
 """Test suite for pptx.shapes module."""
 
 import os
+import zipfile
 
 from hamcrest import assert_that, equal_to, is_, is_not, same_instance
 from mock import MagicMock, Mock, patch, PropertyMock
 # from unittest2 import skip
 
-from pptx.constants import MSO_AUTO_SHAPE_TYPE as MAST, MSO, PP
+from pptx.constants import (
+    MSO_AUTO_SHAPE_TYPE as MAST, MSO, PP, XL_CHART_TYPE as XL
+)
 from pptx.oxml import (
     _SubElement, nsdecls, oxml_fromstring, oxml_parse, oxml_tostring
 )
@@ -26,7 +29,7 @@ from pptx.shapes import (
     _Placeholder, _Row, _RowCollection, _Run, _Shape, _ShapeCollection,
     _TextFrame, _to_unicode
 )
-from pptx.spec import namespaces
+from pptx.spec import autoshape_types, namespaces
 from pptx.spec import (
     PH_TYPE_CTRTITLE, PH_TYPE_DT, PH_TYPE_FTR, PH_TYPE_OBJ, PH_TYPE_SLDNUM,
     PH_TYPE_SUBTITLE, PH_TYPE_TBL, PH_TYPE_TITLE, PH_ORIENT_HORZ,
@@ -293,6 +296,21 @@ class Test_AutoShapeType(TestCase):
         # verify -----------------------
         assert_that(retval, is_(equal_to(autoshape_type_id)))
 
+    def test__lookup_id_by_prst_matches_spec_table_for_every_prst(self):
+        """_AutoShapeType._lookup_id_by_prst() agrees with spec table scan"""
+        for autoshape_type_id, attribs in autoshape_types.iteritems():
+            prst = attribs['prst']
+            # exercise -----------------
+            retval = _AutoShapeType._lookup_id_by_prst(prst)
+            # verify -------------------
+            # first id in iteration order wins where a prst is shared
+            first_id = [id_ for id_, a in autoshape_types.iteritems()
+                        if a['prst'] == prst][0]
+            assert_that(retval, is_(equal_to(first_id)))
+            def_adj_vals = _AutoShapeType.default_adjustment_values(prst)
+            expected = autoshape_types[first_id]['avLst']
+            assert_that(def_adj_vals, is_(equal_to(expected)))
+
     def test__lookup_id_raises_on_bad_prst(self):
         """_AutoShapeType._lookup_id_by_prst() raises on bad prst"""
         # setup ------------------------
@@ -1254,6 +1272,35 @@ class Test_ShapeCollection(TestCase):
         __shapes.append.assert_called_once_with(picture)
         assert_that(retval, is_(equal_to(picture)))
 
+    @patch('pptx.shapes.CT_GraphicalObjectFrame')
+    @patch('pptx.shapes._ShapeCollection._ShapeCollection__chart_workbook')
+    @patch('pptx.shapes._ShapeCollection._ShapeCollection__next_shape_id',
+           new_callable=PropertyMock)
+    def test_add_chart_decimates_data(
+            self, __next_shape_id, __chart_workbook, CT_GraphicalObjectFrame):
+        """_ShapeCollection.add_chart() charts decimated data"""
+        # setup mockery ---------------
+        __next_shape_id.return_value = 9
+        xlsx_stream = Mock(name='xlsx_stream')
+        __chart_workbook.return_value = xlsx_stream
+        __slide = Mock(name='__slide')
+        __slide._add_chart.return_value = (Mock(), Mock(name='rel'))
+        shapes = test_shapes.empty_shape_collection
+        shapes._ShapeCollection__slide = __slide
+        shapes._ShapeCollection__spTree = Mock(name='__spTree')
+        data = [range(100), [idx % 7 for idx in range(100)]]
+        headings = ['x', 'y']
+        # exercise ---------------------
+        shapes.add_chart(0, 0, 10, 10, data, headings, XL.LINE,
+                         decimation='stride', max_points=10,
+                         keep_full_data=True)
+        # verify -----------------------
+        expected = [[0, 11, 22, 33, 44, 55, 66, 77, 88, 99],
+                    [0, 4, 1, 5, 2, 6, 3, 0, 4, 1]]
+        __chart_workbook.assert_called_once_with(expected, headings, data)
+        __slide._add_chart.assert_called_once_with(
+            expected, headings, xlsx_stream, XL.LINE)
+
     @patch('pptx.shapes._Table')
     @patch('pptx.shapes.CT_GraphicalObjectFrame')
     @patch('pptx.shapes._ShapeCollection._ShapeCollection__next_shape_id',
@@ -1316,6 +1363,81 @@ class Test_ShapeCollection(TestCase):
         assert_that(shapes._ShapeCollection__shapes[0], is_(equal_to(shape)))
         assert_that(retval, is_(equal_to(shape)))
 
+    def test_chart_workbook_is_built_in_memory(self):
+        """_ShapeCollection.__chart_workbook() returns in-memory xlsx"""
+        # setup ------------------------
+        data = [['a', 'b'], [1, 2]]
+        headings_xlsx = ['Cat', 'S1']
+        chart_workbook = _ShapeCollection._ShapeCollection__chart_workbook
+        # exercise ---------------------
+        stream = chart_workbook(data, headings_xlsx)
+        # verify -----------------------
+        stream.seek(0)
+        zipf = zipfile.ZipFile(stream)
+        sheet_xml = zipf.read('xl/worksheets/sheet1.xml')
+        assert_that('<c r="A1"' in sheet_xml, is_(True))
+        assert_that('<c r="B3"' in sheet_xml, is_(True))
+        assert_that(os.path.exists('temp/Worksheet.xlsx'), is_(False))
+
+    @patch('pptx.shapes._IN_MEMORY_WORKBOOK_POINTS', 2)
+    def test_chart_workbook_of_large_chart_built_in_constant_memory(self):
+        """_ShapeCollection.__chart_workbook() row-wise for large chart"""
+        # setup ------------------------
+        data = [['a', 'b', 'c'], [1, 2, 3], [4, 5]]
+        headings_xlsx = ['Cat', 'S1', 'S2']
+        chart_workbook = _ShapeCollection._ShapeCollection__chart_workbook
+        # exercise ---------------------
+        stream = chart_workbook(data, headings_xlsx)
+        # verify -----------------------
+        sheet_xml = zipfile.ZipFile(stream).read('xl/worksheets/sheet1.xml')
+        assert_that('<is><t>c</t></is>' in sheet_xml, is_(True))
+        assert_that('<c r="C3"><v>5</v></c>' in sheet_xml, is_(True))
+        assert_that('<c r="C4"' in sheet_xml, is_(False))
+        assert_that(sheet_xml.index('<row r="2"') <
+                    sheet_xml.index('<row r="4"'), is_(True))
+
+    def test_chart_workbook_adds_full_data_sheet(self):
+        """_ShapeCollection.__chart_workbook() writes full data sheet"""
+        # setup ------------------------
+        chart_workbook = _ShapeCollection._ShapeCollection__chart_workbook
+        # exercise ---------------------
+        stream = chart_workbook([['a', 'c'], [1, 3]], ['Cat', 'S1'],
+                                [['a', 'b', 'c'], [1, 2, 3]])
+        # verify -----------------------
+        zipf = zipfile.ZipFile(stream)
+        workbook_xml = zipf.read('xl/workbook.xml')
+        sheet_xml = zipf.read('xl/worksheets/sheet2.xml')
+        assert_that('<sheet name="Sheet1"' in workbook_xml, is_(True))
+        assert_that('<sheet name="Full data"' in workbook_xml, is_(True))
+        assert_that('<c r="B4"><v>3</v></c>' in sheet_xml, is_(True))
+
+    def test_chart_workbook_leaves_nan_cells_blank(self):
+        """_ShapeCollection.__chart_workbook() writes no cell for NaN"""
+        # setup ------------------------
+        data = [['a', 'b', 'c'], [1.5, float('nan'), 3.5]]
+        chart_workbook = _ShapeCollection._ShapeCollection__chart_workbook
+        # exercise ---------------------
+        stream = chart_workbook(data, ['Cat', 'S1'])
+        # verify -----------------------
+        sheet_xml = zipfile.ZipFile(stream).read('xl/worksheets/sheet1.xml')
+        assert_that('<c r="B2"><v>1.5</v></c>' in sheet_xml, is_(True))
+        assert_that('<c r="B3"' in sheet_xml, is_(False))
+        assert_that('<c r="B4"><v>3.5</v></c>' in sheet_xml, is_(True))
+
+    def test_chart_workbook_is_reproducible(self):
+        """_ShapeCollection.__chart_workbook() bytes depend only on data"""
+        # setup ------------------------
+        data = [['a', 'b'], [1, 2]]
+        headings_xlsx = ['Cat', 'S1']
+        chart_workbook = _ShapeCollection._ShapeCollection__chart_workbook
+        # exercise ---------------------
+        stream = chart_workbook(data, headings_xlsx)
+        # verify -----------------------
+        core_xml = zipfile.ZipFile(stream).read('docProps/core.xml')
+        assert_that('>1980-01-01T00:00:00Z<' in core_xml, is_(True))
+        assert_that(chart_workbook(data, headings_xlsx).getvalue(),
+                    is_(equal_to(stream.getvalue())))
+
     def test_title_value(self):
         """_ShapeCollection.title value is ref to correct shape"""
         # exercise ---------------------
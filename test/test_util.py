@@ -12,7 +12,8 @@
 import platform
 
 from pptx.util import (
-    _BaseLength, Cm, Collection, Emu, Inches, Mm, Partname, Px)
+    _BaseLength, Cm, Collection, column_letters, Emu, Inches, Mm, Partname,
+    Px)
 
 from testing import TestCase
 
@@ -67,6 +68,26 @@ class TestCollection(TestCase):
         self.assertIsSizedProperty(self.collection, '_values', 0)
 
 
+class Test_column_letters(TestCase):
+    """Test column_letters()"""
+    def test_column_letters_return_value(self):
+        """column_letters() returns A1-style letters through XFD"""
+        # exercise ---------------------
+        columns = column_letters(16384)
+        # verify -----------------------
+        expected = [
+            (0, 'A'), (25, 'Z'), (26, 'AA'), (27, 'AB'), (701, 'ZZ'),
+            (702, 'AAA'), (16383, 'XFD')]
+        actual = [(idx, columns[idx]) for idx, letters in expected]
+        self.assertEqual(expected, actual)
+        self.assertLength(columns, 16384)
+
+    def test_column_letters_raises_past_last_column(self):
+        """column_letters() raises on more columns than a worksheet has"""
+        with self.assertRaises(ValueError):
+            column_letters(16385)
+
+
 class TestLengthClasses(TestCase):
     """Test _BaseLength, Inches, Cm, Mm, Px, and Emu classes"""
     def test_base_method_values(self):
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+#
+# test_workbook.py
+#
+# This module is part of python-pptx and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""Test suite for pptx.workbook module."""
+
+import zipfile
+
+from io import BytesIO
+
+import xlsxwriter
+
+from hamcrest import assert_that, equal_to, is_, none
+from lxml import etree
+
+from pptx.workbook import CellRange, replace_columns
+
+from testing import TestCase
+
+
+_x = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+
+def _workbook_blob(sheet_name='Sheet1'):
+    """
+    Return an xlsx blob with a second worksheet named *sheet_name* holding
+    categories in column A and a series in column B.
+    """
+    stream = BytesIO()
+    workbook = xlsxwriter.Workbook(stream, {'in_memory': True})
+    workbook.add_worksheet('Other').write(0, 0, 'untouched')
+    worksheet = workbook.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, ['Cat', 'S1'])
+    worksheet.write_column(1, 0, ['a', 'b', 'c'])
+    worksheet.write_column(1, 1, [1, 2, 3])
+    workbook.close()
+    return stream.getvalue()
+
+
+def _edited_blob(blob, member, edit_fn):
+    """
+    Return a copy of workbook *blob* in which the XML of *member* is
+    replaced by the string *edit_fn* returns when called with it.
+    """
+    src = zipfile.ZipFile(BytesIO(blob))
+    stream = BytesIO()
+    dst = zipfile.ZipFile(stream, 'w')
+    for item in src.infolist():
+        member_blob = src.read(item.filename)
+        if item.filename == member:
+            member_blob = edit_fn(member_blob)
+        dst.writestr(item, member_blob)
+    dst.close()
+    return stream.getvalue()
+
+
+def _without_positions(sheet_xml):
+    """
+    Return worksheet *sheet_xml* with the optional ``r`` attribute of its
+    rows and cells removed.
+    """
+    worksheet = etree.fromstring(sheet_xml)
+    for elm in worksheet.iter(_x + 'row', _x + 'c'):
+        del elm.attrib['r']
+    return etree.tostring(worksheet)
+
+
+def _cells(blob, member='xl/worksheets/sheet2.xml'):
+    """
+    Return a dict mapping each cell reference in worksheet *member* of
+    workbook *blob* to the cell's value text.
+    """
+    worksheet = etree.fromstring(zipfile.ZipFile(BytesIO(blob)).read(member))
+    cells = {}
+    for c in worksheet.iter(_x + 'c'):
+        text = ''.join(c.itertext())
+        cells[c.get('r')] = text
+    return cells
+
+
+class TestCellRange(TestCase):
+    """Test CellRange"""
+    def test_parse_returns_range(self):
+        """CellRange.parse() parses a single-column range formula"""
+        # exercise ---------------------
+        cell_range = CellRange.parse('Sheet1!$AB$2:$AB$13')
+        # verify -----------------------
+        assert_that(cell_range.sheet, is_(equal_to('Sheet1')))
+        assert_that(cell_range.column, is_(equal_to('AB')))
+        assert_that(cell_range.first_row, is_(equal_to(2)))
+        assert_that(cell_range.last_row, is_(equal_to(13)))
+
+    def test_parse_handles_quoted_sheet_name(self):
+        """CellRange.parse() unquotes a quoted sheet name"""
+        # exercise ---------------------
+        cell_range = CellRange.parse("'Q1 ''data'''!$B$1")
+        # verify -----------------------
+        assert_that(cell_range.sheet, is_(equal_to("Q1 'data'")))
+        assert_that(cell_range.last_row, is_(equal_to(1)))
+
+    def test_parse_returns_none_for_other_formulas(self):
+        """CellRange.parse() returns None for non-range formulas"""
+        for formula in ('Sheet1!$A$2:$B$5', 'Sheet1!A2:A5', 'SUM(A1)', None):
+            assert_that(CellRange.parse(formula), is_(none()))
+
+    def test_resized_keeps_sheet_quoting(self):
+        """CellRange.resized() formula keeps start cell and sheet quoting"""
+        # setup ------------------------
+        cell_range = CellRange.parse("'My Sheet'!$C$2:$C$4")
+        # exercise ---------------------
+        formulas = [cell_range.resized(count).formula for count in (6, 1)]
+        # verify -----------------------
+        assert_that(formulas, is_(equal_to(
+            ["'My Sheet'!$C$2:$C$7", "'My Sheet'!$C$2"])))
+
+
+class Test_replace_columns(TestCase):
+    """Test replace_columns()"""
+    def test_replace_columns_grows_range(self):
+        """replace_columns() writes values beyond the old range"""
+        # setup ------------------------
+        blob = _workbook_blob()
+        edits = [
+            (CellRange.parse('Sheet1!$A$2:$A$4'), ['w', 'x', 'y', 'z&']),
+            (CellRange.parse('Sheet1!$B$2:$B$4'), [10, 20.5, 30, 40]),
+        ]
+        # exercise ---------------------
+        new_blob = replace_columns(blob, edits)
+        # verify -----------------------
+        cells = _cells(new_blob)
+        assert_that(cells['A5'], is_(equal_to('z&')))
+        assert_that(cells['B3'], is_(equal_to('20.5')))
+        assert_that(cells['B5'], is_(equal_to('40')))
+        worksheet = etree.fromstring(zipfile.ZipFile(BytesIO(
+            new_blob)).read('xl/worksheets/sheet2.xml'))
+        dimension = worksheet.find(_x + 'dimension')
+        assert_that(dimension.get('ref'), is_(equal_to('A1:B5')))
+
+    def test_replace_columns_removes_cells_past_new_range(self):
+        """replace_columns() removes cells and rows past the new values"""
+        # setup ------------------------
+        blob = _workbook_blob()
+        edits = [(CellRange.parse('Sheet1!$B$2:$B$4'), [7])]
+        # exercise ---------------------
+        cells = _cells(replace_columns(blob, edits))
+        # verify -----------------------
+        assert_that(cells['B2'], is_(equal_to('7')))
+        assert_that('B3' in cells, is_(False))
+        assert_that('A3' in cells, is_(True))
+
+    def test_replace_columns_copies_other_members(self):
+        """replace_columns() copies unedited workbook members unchanged"""
+        # setup ------------------------
+        blob = _workbook_blob("Q1 'data' x")
+        edits = [(CellRange.parse("'Q1 ''data'' x'!$B$2:$B$4"), [4, 5, 6])]
+        # exercise ---------------------
+        new_blob = replace_columns(blob, edits)
+        # verify -----------------------
+        old_zip = zipfile.ZipFile(BytesIO(blob))
+        new_zip = zipfile.ZipFile(BytesIO(new_blob))
+        assert_that(new_zip.namelist(), is_(equal_to(old_zip.namelist())))
+        for name in old_zip.namelist():
+            if name == 'xl/worksheets/sheet2.xml':
+                continue
+            assert_that(new_zip.read(name),
+                        is_(equal_to(old_zip.read(name))))
+        assert_that(_cells(new_blob)['B4'], is_(equal_to('6')))
+
+    def test_replace_columns_positions_rows_and_cells_by_order(self):
+        """replace_columns() handles rows and cells without references"""
+        # setup ------------------------
+        blob = _edited_blob(_workbook_blob(), 'xl/worksheets/sheet2.xml',
+                            _without_positions)
+        edits = [(CellRange.parse('Sheet1!$B$2:$B$4'), [7, 8, 9, 10])]
+        # exercise ---------------------
+        cells = _cells(replace_columns(blob, edits))
+        # verify -----------------------
+        assert_that(sorted(cells), is_(equal_to([
+            'A1', 'A2', 'A3', 'A4', 'B1', 'B2', 'B3', 'B4', 'B5'])))
+        values = [cells['B%d' % row] for row in range(2, 6)]
+        assert_that(values, is_(equal_to(['7', '8', '9', '10'])))
+
+    def test_replace_columns_raises_on_malformed_worksheet(self):
+        """replace_columns() raises ValueError on rows out of order"""
+        # setup ------------------------
+        def reverse_rows(sheet_xml):
+            worksheet = etree.fromstring(sheet_xml)
+            sheetData = worksheet.find(_x + 'sheetData')
+            sheetData[:] = reversed(sheetData)
+            return etree.tostring(worksheet)
+        blob = _edited_blob(_workbook_blob(), 'xl/worksheets/sheet2.xml',
+                            reverse_rows)
+        edits = [(CellRange.parse('Sheet1!$B$2:$B$4'), [1])]
+        # verify -----------------------
+        with self.assertRaises(ValueError):
+            replace_columns(blob, edits)
+
+    def test_replace_columns_raises_on_missing_workbook_part(self):
+        """replace_columns() raises ValueError without officeDocument rel"""
+        # setup ------------------------
+        def drop_office_document(rels_xml):
+            rels = etree.fromstring(rels_xml)
+            for rel in list(rels):
+                if rel.get('Type').endswith('/officeDocument'):
+                    rels.remove(rel)
+            return etree.tostring(rels)
+        blob = _edited_blob(_workbook_blob(), '_rels/.rels',
+                            drop_office_document)
+        edits = [(CellRange.parse('Sheet1!$B$2:$B$4'), [1])]
+        # verify -----------------------
+        with self.assertRaises(ValueError):
+            replace_columns(blob, edits)
+
+    def test_replace_columns_raises_on_infinite_value(self):
+        """replace_columns() raises ValueError on an infinite float"""
+        # setup ------------------------
+        edits = [(CellRange.parse('Sheet1!$B$2:$B$4'), [float('inf')])]
+        # verify -----------------------
+        with self.assertRaises(ValueError):
+            replace_columns(_workbook_blob(), edits)
+
+    def test_replace_columns_raises_on_missing_sheet(self):
+        """replace_columns() raises KeyError on unknown worksheet"""
+        # setup ------------------------
+        edits = [(CellRange.parse('Nope!$B$2:$B$4'), [1])]
+        # verify -----------------------
+        with self.assertRaises(KeyError):
+            replace_columns(_workbook_blob(), edits)